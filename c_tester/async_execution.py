@@ -0,0 +1,68 @@
+"""Asyncio-based execution pool: many queued runs on one event loop thread instead of a thread per child."""
+
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import threading
+
+
+EXECUTION_ENGINES = ("threads", "asyncio")
+
+
+class AsyncExecutionPool:
+    """Run coroutine functions on a private event loop, with at most `max_children` running at once.
+
+    `submit(coroutine_function, *args)` mirrors `Executor.submit` and returns a
+    `concurrent.futures.Future`, so callers can mix this pool with thread pools.
+    Queued runs only cost a pending task, not a thread.
+    """
+
+    def __init__(self, max_children: int):
+        self.max_children = max_children
+        self._loop = asyncio.new_event_loop()
+        self._semaphore = None
+        self._ready = threading.Event()
+        self._thread = threading.Thread(target=self._run_loop, name="execute-asyncio", daemon=True)
+        self._thread.start()
+        self._ready.wait()
+        self._closed = False
+        self._lock = threading.Lock()
+
+    def _run_loop(self):
+        asyncio.set_event_loop(self._loop)
+        # Created on the loop thread so it binds to this loop.
+        self._semaphore = asyncio.Semaphore(self.max_children)
+        self._ready.set()
+        self._loop.run_forever()
+
+    async def _bounded(self, coroutine_function, args, kwargs):
+        async with self._semaphore:
+            return await coroutine_function(*args, **kwargs)
+
+    def submit(self, coroutine_function, *args, **kwargs) -> concurrent.futures.Future:
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("cannot schedule new runs after shutdown")
+            return asyncio.run_coroutine_threadsafe(self._bounded(coroutine_function, args, kwargs), self._loop)
+
+    def shutdown(self, wait: bool = True, cancel_futures: bool = False) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        self._loop.call_soon_threadsafe(self._stop, cancel_futures)
+        if wait:
+            self._thread.join()
+            self._loop.close()
+
+    def _stop(self, cancel_futures):
+        pending = [task for task in asyncio.all_tasks(self._loop) if not task.done()]
+        if cancel_futures:
+            for task in pending:
+                task.cancel()
+        if pending:
+            gathered = asyncio.gather(*pending, return_exceptions=True)
+            gathered.add_done_callback(lambda _result: self._loop.stop())
+        else:
+            self._loop.stop()
@@ -1,6 +1,10 @@
 import os
 import glob
 import shutil
+from .ground_truth_cache import CACHE_DIR_NAME
+from .run_manifest import MANIFEST_FILENAME
+from .run_metrics import METRICS_FOLDER_NAME
+from .submission_dedupe import DUPLICATE_REPORT_FILENAME
 from .utils import log # Import the log function
 
 def clear_folder_contents(folder_path):
@@ -36,12 +40,23 @@ def clear_folder_tree(folder_path):
     except Exception as e:
         log(f"Failed to delete folder tree {folder_path}. Reason: {e}", level="error")
 
+def clear_run_manifest(q_folder):
+    """Deletes the incremental-run manifest so the next run regrades every student."""
+    manifest_path = os.path.join(q_folder, MANIFEST_FILENAME)
+    if os.path.exists(manifest_path):
+        try:
+            os.remove(manifest_path)
+            log(f"Deleted run manifest: {manifest_path}", level="info")
+        except Exception as e:
+            log(f"Failed to delete {manifest_path}. Reason: {e}", level="error")
+
 def clear_grades(questions):
-    """Clears the contents of the 'grade' folder for each question."""
+    """Clears the contents of the 'grade' folder and the run manifest for each question."""
     log("Clearing grade folders...", level="info") # Use log
     for q_folder in questions:
         grades_path = os.path.join(q_folder, 'grade')
         clear_folder_contents(grades_path)
+        clear_run_manifest(q_folder)
     log("Finished clearing grade folders.", level="success") # Use log with success level
 
 def clear_output(questions):
@@ -62,6 +77,17 @@ def clear_output(questions):
         # Clear contents of the output subfolder
         output_path = os.path.join(q_folder, 'output')
         clear_folder_contents(output_path)
+        clear_run_manifest(q_folder)
+        # Per-student runtime/memory sidecars describe the same runs as output/.
+        clear_folder_tree(os.path.join(q_folder, METRICS_FOLDER_NAME))
+
+        duplicate_report = os.path.join(q_folder, DUPLICATE_REPORT_FILENAME)
+        if os.path.exists(duplicate_report):
+            try:
+                os.remove(duplicate_report)
+                log(f"Deleted duplicate submission report: {duplicate_report}", level="info")
+            except Exception as e:
+                log(f"Failed to delete {duplicate_report}. Reason: {e}", level="error")
 
         # Clear outputs produced by LLM compile repair.
         repair_output_path = os.path.join(q_folder, 'llm_fixed_output')
@@ -76,6 +102,14 @@ def clear_output(questions):
             except Exception as e:
                 log(f"Failed to delete {original_output_file}. Reason: {e}", level="error")
         # else: File didn't exist, nothing to delete
+
+        reference_fields_file = os.path.join(q_folder, "original_sol_fields.json")
+        if os.path.exists(reference_fields_file):
+            try:
+                os.remove(reference_fields_file)
+                log(f"Deleted reference field values: {reference_fields_file}", level="info")
+            except Exception as e:
+                log(f"Failed to delete {reference_fields_file}. Reason: {e}", level="error")
             
     log("Finished clearing output folders, original_sol_output.txt files, and submit_error.txt.", level="success")
 
@@ -142,8 +176,17 @@ def clear_build_files():
     else:
          log(f"Finished deleting build files attempt. Deleted: {deleted_count}, Errors: {errors}", level="warning")
 
+def clear_cache():
+    """Deletes the on-disk ground-truth and compiled-executable caches in the current directory."""
+    log("Clearing cache folder...", level="info")
+    if os.path.isdir(CACHE_DIR_NAME):
+        clear_folder_tree(CACHE_DIR_NAME)
+    else:
+        log("No cache folder found.", level="info")
+    log("Finished clearing cache folder.", level="success")
+
 def clear_all(questions):
-    """Runs clear_grades, clear_output, clear_excels, and clear_build_files."""
+    """Runs clear_grades, clear_output, clear_excels, clear_build_files, and clear_cache."""
     log("Starting clear all operation...", level="info")
     clear_grades(questions)
     clear_output(questions)  # This will now also delete submit_error.txt
@@ -151,4 +194,5 @@ def clear_all(questions):
     clear_review_files(questions)
     clear_excels()
     clear_build_files()
+    clear_cache()
     log("Finished clear all operation.", level="success") 
\ No newline at end of file
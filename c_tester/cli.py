@@ -3,9 +3,12 @@ import os
 import sys # Import sys for sys.exit
 import zipfile
 import subprocess
-from .process import run_tests
+from .async_execution import EXECUTION_ENGINES
+from .toolchain import TOOLCHAINS, get_toolchain
+from .process import ExecutionOptions, run_tests
 from .create_excel import create_excels
-from .clear_utils import clear_grades, clear_output, clear_excels, clear_c_files, clear_all, clear_build_files, clear_repair_files, clear_review_files
+from .rescore import rescore_all_questions
+from .clear_utils import clear_grades, clear_output, clear_excels, clear_c_files, clear_all, clear_build_files, clear_repair_files, clear_review_files, clear_cache
 from .utils import log
 from .preprocess import preprocess_submissions
 from . import configuration
@@ -24,6 +27,25 @@ from .configuration import (
     llm_compile_repair_max_attempts,
     llm_compile_repair_provider,
     llm_compile_repair_model,
+    timeout_multiplier,
+    timeout_floor,
+    timeout_ceiling,
+    max_consecutive_timeouts,
+    timeout_budget_seconds,
+    ground_truth_cache_enabled,
+    incremental_grading,
+    deduplicate_submissions,
+    compile_cache_enabled,
+    compile_cache_max_mb,
+    max_workers,
+    execution_engine,
+    max_output_mb,
+    resource_limits,
+    memory_limit_mb,
+    toolchain,
+    syntax_precheck,
+    build_root,
+    comparison_memo_size,
 )
 from .checker_assistant import FakeLLMProvider, GeminiProvider
 
@@ -120,30 +142,45 @@ def run_grading(
     compile_repair_max_attempts=llm_compile_repair_max_attempts,
     compile_repair_provider_name=llm_compile_repair_provider,
     compile_repair_model=llm_compile_repair_model,
+    execution_options=None,
+    rescore=False,
 ):
-    """Runs the test and creates the Excel files."""
-    # Validate Visual Studio path before grading
-    if not validate_vs_path(vs_path):
-        log("Cannot proceed with grading due to invalid Visual Studio environment path.", "error")
-        sys.exit(1)
-        
-    log("Starting grading process...", level="info")
-    compile_repair_provider = make_compile_repair_provider(
-        compile_repair_enabled,
-        compile_repair_provider_name,
-        compile_repair_model,
-    )
-    # Pass the globally imported questions list from configuration
-    run_tests(
-        questions_to_run,
-        scoring_mode=scoring_mode,
-        deduction_per_error=deduction_per_error,
-        llm_compile_repair_enabled=compile_repair_enabled,
-        llm_compile_repair_provider=compile_repair_provider,
-        llm_compile_repair_penalty=compile_repair_penalty,
-        llm_compile_repair_max_attempts=compile_repair_max_attempts,
-        vs_path_override=vs_path,
-    )
+    """Runs the test and creates the Excel files.
+
+    With `rescore`, stored outputs are regraded instead and nothing is compiled or executed.
+    """
+    if rescore:
+        log("Rescoring stored outputs (no compile or execute)...", level="info")
+        rescore_all_questions(questions_to_run, scoring_mode=scoring_mode, deduction_per_error=deduction_per_error)
+    else:
+        selected_toolchain = get_toolchain((execution_options or ExecutionOptions.from_configuration()).toolchain)
+        if selected_toolchain.uses_visual_studio:
+            # Validate Visual Studio path before grading
+            if not validate_vs_path(vs_path):
+                log("Cannot proceed with grading due to invalid Visual Studio environment path.", "error")
+                sys.exit(1)
+        elif not selected_toolchain.is_available():
+            log(f"Cannot proceed with grading: '{selected_toolchain.compiler}' was not found on PATH.", "error")
+            sys.exit(1)
+
+        log("Starting grading process...", level="info")
+        compile_repair_provider = make_compile_repair_provider(
+            compile_repair_enabled,
+            compile_repair_provider_name,
+            compile_repair_model,
+        )
+        # Pass the globally imported questions list from configuration
+        run_tests(
+            questions_to_run,
+            scoring_mode=scoring_mode,
+            deduction_per_error=deduction_per_error,
+            llm_compile_repair_enabled=compile_repair_enabled,
+            llm_compile_repair_provider=compile_repair_provider,
+            llm_compile_repair_penalty=compile_repair_penalty,
+            llm_compile_repair_max_attempts=compile_repair_max_attempts,
+            vs_path_override=vs_path,
+            execution_options=execution_options,
+        )
     
     # Use provided per_error_penalty_mode directly (no longer uses config default)
     # The default is now explicitly False (single penalty mode)
@@ -156,7 +193,7 @@ def run_grading(
         + (f" ({deduction_per_error:g} point(s) per failed test)" if scoring_mode == "per_error_deduction" else ""),
         level="info",
     )
-    if compile_repair_enabled:
+    if compile_repair_enabled and not rescore:
         log(
             f"Using LLM compile repair: {compile_repair_provider_name}, "
             f"max attempts {compile_repair_max_attempts}, penalty {compile_repair_penalty:g}",
@@ -218,6 +255,49 @@ def main():
                           help='Provider used for compile repair.')
     parser_run.add_argument('--llm-compile-repair-model', default=llm_compile_repair_model,
                           help='Gemini model override for compile repair.')
+    parser_run.add_argument('--timeout-multiplier', type=float, default=timeout_multiplier,
+                          help='Student timeout per input as a multiple of the reference solution runtime.')
+    parser_run.add_argument('--timeout-floor', type=float, default=timeout_floor,
+                          help='Minimum student timeout per input, in seconds.')
+    parser_run.add_argument('--timeout-ceiling', type=float, default=timeout_ceiling,
+                          help='Maximum student timeout per input and the reference solution timeout, in seconds.')
+    parser_run.add_argument('--max-consecutive-timeouts', type=int, default=max_consecutive_timeouts,
+                          help='Skip a student\'s remaining inputs after this many consecutive timeouts (0 disables).')
+    parser_run.add_argument('--timeout-budget-seconds', type=float, default=timeout_budget_seconds,
+                          help='Skip a student\'s remaining inputs after this much total run time (0 disables).')
+    parser_run.add_argument('--rescore', action='store_true',
+                          help='Regrade the stored Q*/output files with the current checker and scoring settings '
+                               'without compiling or executing anything, then rebuild the Excel files.')
+    parser_run.add_argument('--incremental', action='store_true', default=incremental_grading,
+                          help='Only compile and run new or changed submissions; keep grades of unchanged ones '
+                               '(tracked in Q*/run_manifest.json).')
+    parser_run.add_argument('--no-dedupe', dest='deduplicate', action='store_false', default=deduplicate_submissions,
+                          help='Compile and run every submission even when it is identical (modulo whitespace) to another.')
+    parser_run.add_argument('--no-compile-cache', dest='compile_cache', action='store_false', default=compile_cache_enabled,
+                          help='Always invoke the compiler instead of reusing cached executables.')
+    parser_run.add_argument('--compile-cache-max-mb', type=float, default=compile_cache_max_mb,
+                          help='Size cap of the executable cache; least recently used entries are evicted beyond it.')
+    parser_run.add_argument('--max-workers', type=int, default=max_workers,
+                          help='Concurrent compile/execute workers shared by all questions (0 uses the CPU count).')
+    parser_run.add_argument('--execution-engine', choices=EXECUTION_ENGINES, default=execution_engine,
+                          help='Run student programs on worker threads (default) or on one asyncio event loop.')
+    parser_run.add_argument('--max-output-mb', type=float, default=max_output_mb,
+                          help='Kill a student run after it writes this many MB and grade it as "Output limit exceeded" (0 disables).')
+    parser_run.add_argument('--resource-limits', action='store_true', default=resource_limits,
+                          help='POSIX only: apply CPU-time/memory rlimits and judge timeouts on CPU time (wall clock is a safety net).')
+    parser_run.add_argument('--memory-limit-mb', type=float, default=memory_limit_mb,
+                          help='Address-space limit per student run with --resource-limits (0 = unlimited).')
+    parser_run.add_argument('--toolchain', choices=TOOLCHAINS, default=toolchain,
+                          help='Compiler backend: msvc (cl via the Visual Studio path), gcc or clang from PATH.')
+    parser_run.add_argument('--no-syntax-precheck', dest='syntax_precheck', action='store_false', default=syntax_precheck,
+                          help='With --llm-compile-repair, skip the syntax-only pass that queues broken files for repair early.')
+    parser_run.add_argument('--build-root', default=build_root,
+                          help='Folder for the per-run build directory (default: the system temp directory; e.g. /dev/shm for tmpfs).')
+    parser_run.add_argument('--comparison-memo-size', type=int, default=comparison_memo_size,
+                          help='Reuse comparison results for identical student outputs, keeping at most this many (0 disables).')
+    parser_run.add_argument('--no-ground-truth-cache', dest='ground_truth_cache', action='store_false',
+                          default=ground_truth_cache_enabled,
+                          help='Always recompile and rerun original_sol.c instead of reusing cached reference outputs.')
     # Removed the --single-penalty option since it's now the default
 
     # Preprocess command
@@ -236,7 +316,8 @@ def main():
     clear_subparsers.add_parser('build', help='Delete all build files (*.exe, *.obj).')
     clear_subparsers.add_parser('repair', help='Clear generated LLM compile-repair files.')
     clear_subparsers.add_parser('reviews', help='Clear generated post-scoring LLM review files.')
-    clear_subparsers.add_parser('all', help='Clear grades, output, repair, reviews, excel, and build files.')
+    clear_subparsers.add_parser('cache', help='Delete cached reference outputs and compiled executables (.c_tester_cache).')
+    clear_subparsers.add_parser('all', help='Clear grades, output, repair, reviews, excel, build, and cache files.')
 
     args = parser.parse_args()
 
@@ -254,6 +335,27 @@ def main():
         if args.llm_compile_repair_max_attempts < 1:
             log("Error: --llm-compile-repair-max-attempts must be at least 1.", level="error")
             sys.exit(1)
+        if args.timeout_multiplier <= 0 or args.timeout_floor <= 0:
+            log("Error: --timeout-multiplier and --timeout-floor must be positive.", level="error")
+            sys.exit(1)
+        if args.timeout_ceiling < args.timeout_floor:
+            log("Error: --timeout-ceiling cannot be lower than --timeout-floor.", level="error")
+            sys.exit(1)
+        if args.max_consecutive_timeouts < 0 or args.timeout_budget_seconds < 0:
+            log("Error: timeout budget limits cannot be negative.", level="error")
+            sys.exit(1)
+        if args.memory_limit_mb < 0:
+            log("Error: --memory-limit-mb cannot be negative.", level="error")
+            sys.exit(1)
+        if args.max_output_mb < 0:
+            log("Error: --max-output-mb cannot be negative.", level="error")
+            sys.exit(1)
+        if args.max_workers < 0:
+            log("Error: --max-workers cannot be negative.", level="error")
+            sys.exit(1)
+        if args.compile_cache_max_mb < 0:
+            log("Error: --compile-cache-max-mb cannot be negative.", level="error")
+            sys.exit(1)
 
         # Pass the imported config to run_grading
         run_grading(
@@ -267,6 +369,28 @@ def main():
             compile_repair_max_attempts=args.llm_compile_repair_max_attempts,
             compile_repair_provider_name=args.llm_compile_repair_provider,
             compile_repair_model=args.llm_compile_repair_model,
+            execution_options=ExecutionOptions(
+                timeout_multiplier=args.timeout_multiplier,
+                timeout_floor=args.timeout_floor,
+                timeout_ceiling=args.timeout_ceiling,
+                max_consecutive_timeouts=args.max_consecutive_timeouts,
+                timeout_budget_seconds=args.timeout_budget_seconds,
+                ground_truth_cache=args.ground_truth_cache,
+                incremental=args.incremental,
+                deduplicate=args.deduplicate,
+                compile_cache=args.compile_cache,
+                compile_cache_max_mb=args.compile_cache_max_mb,
+                max_workers=args.max_workers,
+                execution_engine=args.execution_engine,
+                max_output_mb=args.max_output_mb,
+                resource_limits=args.resource_limits,
+                memory_limit_mb=args.memory_limit_mb,
+                toolchain=args.toolchain,
+                syntax_precheck=args.syntax_precheck,
+                build_root=args.build_root,
+                comparison_memo_size=args.comparison_memo_size,
+            ),
+            rescore=args.rescore,
         )
     elif args.command == 'preprocess':
         # Check if zip path exists
@@ -300,6 +424,8 @@ def main():
             clear_repair_files(questions)
         elif args.clear_command == 'reviews':
             clear_review_files(questions)
+        elif args.clear_command == 'cache':
+            clear_cache()
         elif args.clear_command == 'all':
             clear_all(questions)
     # No need for else: parser.print_help() because 'command' is required
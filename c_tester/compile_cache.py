@@ -0,0 +1,140 @@
+"""Size-bounded LRU cache of compiled executables, shared across runs and questions."""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import shutil
+import stat
+import threading
+
+from .ground_truth_cache import CACHE_DIR_NAME
+
+
+COMPILE_CACHE_SUBDIR = "executables"
+ENTRY_SUFFIX = ".bin"
+# Eviction trims the cache to this fraction of its cap, so a full cache is not rescanned on every store.
+EVICTION_TARGET = 0.9
+
+
+def compile_cache_dir(question_folder: str) -> str:
+    """Return the executable cache shared by all questions under the same grading root."""
+    grading_root = os.path.dirname(os.path.abspath(question_folder))
+    return os.path.join(grading_root, CACHE_DIR_NAME, COMPILE_CACHE_SUBDIR)
+
+
+class CompileCache:
+    """ccache-style store of executables keyed by source bytes, compile flags and toolchain identity.
+
+    Hits are copied to the executable path the caller asks for (inside the run's
+    build directory), keeping their execute permission. Entry mtimes track recency; least recently used
+    entries are evicted once the cache grows past `max_bytes`. The directory is
+    scanned once for its size, which stores then keep up to date; it is only
+    scanned again when an eviction is due.
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int = 512 * 1024 * 1024):
+        self.cache_dir = os.path.abspath(cache_dir)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._total_bytes: int | None = None
+
+    def key(self, source_path: str, compile_flags: str, toolchain: str) -> str | None:
+        try:
+            with open(source_path, "rb") as source_file:
+                source_bytes = source_file.read()
+        except OSError:
+            return None
+        digest = hashlib.sha256()
+        for part in (source_bytes, compile_flags.encode("utf-8"), toolchain.encode("utf-8")):
+            digest.update(len(part).to_bytes(8, "big"))
+            digest.update(part)
+        return digest.hexdigest()
+
+    def restore(self, key: str, executable: str) -> bool:
+        """Copy a cached executable to `executable`; returns False on a miss."""
+        entry = self._entry_path(key)
+        try:
+            shutil.copyfile(entry, executable)
+            _make_executable(executable)
+            os.utime(entry)
+        except OSError:
+            with self._lock:
+                self.misses += 1
+            return False
+        with self._lock:
+            self.hits += 1
+        return True
+
+    def store(self, key: str, executable: str) -> None:
+        entry = self._entry_path(key)
+        temp_path = f"{entry}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            shutil.copyfile(executable, temp_path)
+            _make_executable(temp_path)
+            size = os.path.getsize(temp_path)
+            try:
+                replaced = os.path.getsize(entry)
+            except OSError:
+                replaced = 0
+            os.replace(temp_path, entry)
+        except OSError:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            return
+        with self._lock:
+            if self._total_bytes is None:
+                # The new entry is already on disk, so the first scan counts it.
+                self._total_bytes = self._scan_total()
+            else:
+                self._total_bytes += size - replaced
+            over_cap = self._total_bytes > self.max_bytes
+        if over_cap:
+            self.evict()
+
+    def evict(self) -> None:
+        """Rescan the directory (other processes may share it) and drop least recently used entries."""
+        with self._lock:
+            entries = self._scan()
+            total = sum(size for _, size, _ in entries)
+            target = self.max_bytes * EVICTION_TARGET if total > self.max_bytes else self.max_bytes
+            for _, size, path in sorted(entries):
+                if total <= target:
+                    break
+                try:
+                    os.remove(path)
+                    total -= size
+                except OSError:
+                    # Another process may still be copying this entry; try again next time.
+                    continue
+            self._total_bytes = total
+
+    def _scan(self) -> list:
+        entries = []
+        for name in os.listdir(self.cache_dir) if os.path.isdir(self.cache_dir) else []:
+            if not name.endswith(ENTRY_SUFFIX):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                entry_stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((entry_stat.st_mtime, entry_stat.st_size, path))
+        return entries
+
+    def _scan_total(self) -> int:
+        return sum(size for _, size, _ in self._scan())
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}{ENTRY_SUFFIX}")
+
+
+def _make_executable(path: str) -> None:
+    # copyfile copies bytes only; POSIX toolchains need the execute bit to run a hit.
+    mode = os.stat(path).st_mode
+    os.chmod(path, mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
@@ -413,6 +413,18 @@ def build_too_bad_challenge_error(current_compile_error: str, attempts: list[Com
     )
 
 
+def load_repair_report(repair_dir: str) -> CompileRepairResult | None:
+    """Load a repair_report.json written by write_repair_report, or None when missing/invalid."""
+    report_path = os.path.join(repair_dir, "repair_report.json")
+    try:
+        with open(report_path, "r", encoding="utf-8") as report_file:
+            payload = json.load(report_file)
+        history = tuple(CompileRepairAttempt(**attempt) for attempt in payload.pop("attempts_history", []))
+        return CompileRepairResult(**payload, attempts_history=history)
+    except (OSError, json.JSONDecodeError, AttributeError, TypeError):
+        return None
+
+
 def write_repair_report(repair_dir: str, result: CompileRepairResult):
     os.makedirs(repair_dir, exist_ok=True)
     report_path = os.path.join(repair_dir, "repair_report.json")
@@ -0,0 +1,196 @@
+"""Empirical complexity profiling: fit runtimes on growing inputs to a growth class."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+import math
+import os
+from typing import Any
+
+
+MIN_MEASURED_SECONDS = 1e-4
+DEFAULT_PROFILE_TIMEOUT = 10
+# A higher class must fit this much better before it is preferred over a simpler one.
+SIMPLER_CLASS_TOLERANCE = 1.1
+
+GROWTH_CLASSES = (
+    ("O(1)", lambda n: 1.0),
+    ("O(log n)", lambda n: math.log2(max(n, 2))),
+    ("O(n)", lambda n: float(n)),
+    ("O(n log n)", lambda n: n * math.log2(max(n, 2))),
+    ("O(n^2)", lambda n: float(n) ** 2),
+    ("O(n^3)", lambda n: float(n) ** 3),
+    ("O(2^n)", lambda n: 2.0 ** n),
+)
+CLASS_RANK = {name: rank for rank, (name, _) in enumerate(GROWTH_CLASSES)}
+
+
+@dataclass(frozen=True)
+class ComplexityCheckResult:
+    checked: bool
+    passed: bool
+    penalty: float = 0
+    reason: str = ""
+    fitted_class: str = ""
+    reference_class: str = ""
+    slowdown: float | None = None
+
+
+@dataclass(frozen=True)
+class ComplexityProfile:
+    """A question's profile inputs with the reference solution's measured times."""
+
+    config: dict
+    sizes: list
+    inputs: list
+    reference_times: list
+    timeout: float = DEFAULT_PROFILE_TIMEOUT
+    repeats: int = 1
+
+
+def profile_config(checker_config: dict | None) -> dict | None:
+    config = (checker_config or {}).get("complexity_profile")
+    if not isinstance(config, dict) or not config.get("enabled"):
+        return None
+    return config
+
+
+def complexity_profile_errors(question_config: dict | None) -> list[str]:
+    config = profile_config(question_config)
+    if config is None:
+        return []
+    errors = []
+    entries = config.get("inputs")
+    if not isinstance(entries, list) or len(entries) < 3:
+        errors.append("Complexity profiling needs at least three 'complexity_profile.inputs' of growing size.")
+    else:
+        sizes = []
+        for entry in entries:
+            if not isinstance(entry, dict) or not isinstance(entry.get("size"), (int, float)):
+                errors.append("Each complexity profile input needs a numeric 'size' and an 'input' or 'file'.")
+                break
+            if not isinstance(entry.get("input", entry.get("file")), str):
+                errors.append("Each complexity profile input needs a numeric 'size' and an 'input' or 'file'.")
+                break
+            sizes.append(entry["size"])
+        if sizes and sizes != sorted(set(sizes)):
+            errors.append("Complexity profile input sizes must be strictly increasing.")
+    if config.get("max_class") is not None and config.get("max_class") not in CLASS_RANK:
+        errors.append(f"'complexity_profile.max_class' must be one of: {', '.join(CLASS_RANK)}.")
+    if not _is_number(config.get("deduction", config.get("penalty"))):
+        errors.append(
+            "Complexity profiling is enabled, but 'complexity_profile.deduction' is missing or not numeric. "
+            "Fill this mandatory deduction before saving."
+        )
+    return errors
+
+
+def load_profile_inputs(folder_name: str, config: dict) -> tuple[list, list]:
+    """Return (sizes, input strings); `file` entries are read relative to the question folder."""
+    sizes = []
+    inputs = []
+    for entry in config.get("inputs") or []:
+        if "input" in entry:
+            input_value = str(entry["input"])
+        else:
+            with open(os.path.join(folder_name, entry["file"]), "r", encoding="utf-8") as input_file:
+                input_value = input_file.read()
+        sizes.append(entry["size"])
+        inputs.append(input_value)
+    return sizes, inputs
+
+
+def fit_growth_class(sizes: list, times: list) -> str:
+    """Pick the growth class whose `a + b*f(n)` fit (a, b >= 0) has the smallest relative error.
+
+    The intercept absorbs process start-up, which dominates at small sizes.
+    """
+    times = [max(time_value, MIN_MEASURED_SECONDS) for time_value in times]
+    scores = []
+    for name, growth in GROWTH_CLASSES:
+        try:
+            values = [growth(size) for size in sizes]
+        except OverflowError:
+            continue
+        if not all(math.isfinite(value) for value in values):
+            continue
+        scores.append((name, _relative_residual(values, times)))
+    best = min(score for _, score in scores)
+    for name, score in scores:
+        if score <= best * SIMPLER_CLASS_TOLERANCE + 1e-12:
+            return name
+    return scores[-1][0]
+
+
+def _relative_residual(values: list, times: list) -> float:
+    weights = [1 / (time_value * time_value) for time_value in times]
+    total = sum(weights)
+    sum_f = sum(w * f for w, f in zip(weights, values))
+    sum_ff = sum(w * f * f for w, f in zip(weights, values))
+    sum_t = sum(w * t for w, t in zip(weights, times))
+    sum_ft = sum(w * f * t for w, f, t in zip(weights, values, times))
+    determinant = total * sum_ff - sum_f * sum_f
+    if determinant <= 1e-12 * max(total * sum_ff, 1e-300):
+        intercept, slope = sum_t / total, 0.0
+    else:
+        intercept = (sum_t * sum_ff - sum_f * sum_ft) / determinant
+        slope = (total * sum_ft - sum_f * sum_t) / determinant
+        if slope < 0:
+            intercept, slope = sum_t / total, 0.0
+        elif intercept < 0:
+            intercept, slope = 0.0, sum_ft / sum_ff
+    return sum(w * (t - intercept - slope * f) ** 2 for w, f, t in zip(weights, values, times))
+
+
+def evaluate_complexity(config: dict, sizes: list, times: list, reference_times: list) -> ComplexityCheckResult:
+    """Compare a student's profile times with the reference and the configured limits."""
+    deduction = _deduction(config)
+    reference_class = fit_growth_class(sizes, reference_times)
+    unfinished = [size for size, time_value in zip(sizes, times) if time_value is None]
+    if unfinished or len(times) != len(sizes):
+        first = unfinished[0] if unfinished else sizes[len(times)]
+        return ComplexityCheckResult(
+            True,
+            False,
+            deduction,
+            f"Complexity check failed: the program did not finish cleanly for n={_format_size(first)}.",
+            reference_class=reference_class,
+        )
+
+    fitted_class = fit_growth_class(sizes, times)
+    slowdown = round(max(times[-1], MIN_MEASURED_SECONDS) / max(reference_times[-1], MIN_MEASURED_SECONDS), 2)
+    limit_class = config.get("max_class") or reference_class
+    failures = []
+    if CLASS_RANK[fitted_class] > CLASS_RANK[limit_class]:
+        failures.append(f"runtime grows like {fitted_class}, expected at most {limit_class}")
+    max_slowdown = config.get("max_slowdown")
+    if _is_number(max_slowdown) and slowdown > float(max_slowdown):
+        failures.append(
+            f"{slowdown:g}x slower than the reference at n={_format_size(sizes[-1])} (limit {float(max_slowdown):g}x)"
+        )
+    if failures:
+        reason = "Complexity check failed: " + "; ".join(failures) + "."
+        return ComplexityCheckResult(True, False, deduction, reason, fitted_class, reference_class, slowdown)
+    return ComplexityCheckResult(True, True, 0, "Complexity requirements satisfied.", fitted_class, reference_class, slowdown)
+
+
+def _format_size(size) -> str:
+    return f"{size:g}" if isinstance(size, float) else str(size)
+
+
+def _is_number(value: Any) -> bool:
+    if value is None or isinstance(value, bool):
+        return False
+    try:
+        float(value)
+    except (TypeError, ValueError):
+        return False
+    return True
+
+
+def _deduction(config: dict) -> float:
+    value = config.get("deduction", config.get("penalty", 0))
+    try:
+        return max(0, float(value))
+    except (TypeError, ValueError):
+        return 0
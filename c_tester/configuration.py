@@ -4,6 +4,9 @@ import json
 import os # Needed for validate_config
 import re
 
+from .toolchain import TOOLCHAINS
+from .utils import log
+
 # Flag to control file naming pattern
 # When True: expects files named as "hw[0-9].c" and treats them as "hw[0-9]_q1.c"
 # When False: expects files named as "hw[0-9]_q[0-9].c" (default)
@@ -30,6 +33,74 @@ llm_compile_repair_max_attempts = 3
 llm_compile_repair_provider = "Gemini"
 llm_compile_repair_model = ""
 
+# Adaptive execution timeouts.
+# The reference solution runs with `timeout_ceiling` seconds per input and its
+# wall time is measured. Each student run then gets
+#   clamp(reference_seconds * timeout_multiplier, timeout_floor, timeout_ceiling)
+# seconds for that input.
+timeout_multiplier = 10
+timeout_floor = 0.5
+timeout_ceiling = 5
+
+# Fail-fast timeout budget per student (0 disables a rule).
+# Once a student hits `max_consecutive_timeouts` timeouts in a row, or has spent
+# `timeout_budget_seconds` running, the remaining inputs are marked Timeout without running.
+max_consecutive_timeouts = 0
+timeout_budget_seconds = 0
+
+# Reuse reference solution outputs from .c_tester_cache/ground_truth when
+# original_sol.c, input.txt, the compile command and the compiler are unchanged.
+ground_truth_cache_enabled = True
+
+# Keep the output/grade files of students whose source, inputs, reference output,
+# checker config and scoring settings match QN/run_manifest.json; only changed
+# submissions are compiled and executed.
+incremental_grading = False
+
+# Compile and run one representative per group of identical (modulo whitespace)
+# submissions and copy its results to every member; see QN/duplicate_groups.json.
+deduplicate_submissions = True
+
+# Keep compiled executables in .c_tester_cache/executables keyed by source hash,
+# compiler flags and toolchain, evicting least recently used entries past the size cap.
+compile_cache_enabled = True
+compile_cache_max_mb = 512
+
+# Shared concurrency limit for compile and execution workers across all
+# questions (0 uses os.cpu_count()).
+max_workers = 0
+
+# How student programs are run: "threads" (one thread per running child) or
+# "asyncio" (one event loop; live children bounded by max_workers).
+execution_engine = "threads"
+
+# Per-run cap on captured stdout (and stderr), in MB. A student program that
+# writes more is killed and graded as "Output limit exceeded" (0 disables).
+max_output_mb = 16
+
+# POSIX only: run student programs under CPU-time and address-space rlimits and
+# judge timeouts on CPU time, so results do not depend on machine load.
+# memory_limit_mb caps the address space (0 = unlimited).
+resource_limits = False
+memory_limit_mb = 0
+
+# Compiler backend: "msvc" (cl.exe via vs_path), "gcc" or "clang" (from PATH,
+# e.g. on Linux build machines).
+toolchain = "msvc"
+
+# With LLM compile repair enabled, run a fast syntax-only pass first so broken
+# submissions reach the repair worker while the optimized builds continue.
+syntax_precheck = True
+
+# Each grading run builds executables and objects in a fresh scratch directory
+# under this folder ("" = the system temp directory; e.g. /dev/shm for tmpfs)
+# and deletes it when the run ends.
+build_root = ""
+
+# Per-run memo of comparison results, keyed by checker, input and a hash of the
+# student's output, so identical outputs are judged once (entries; 0 disables).
+comparison_memo_size = 100000
+
 DEFAULT_GUI_CONFIG_FILENAME = "gui_config.json"
 
 # Flag to enable RAR file extraction support
@@ -154,6 +225,14 @@ def _saved_value(saved_config, key, current_value, expected_type):
     return value if isinstance(value, expected_type) else current_value
 
 
+def _saved_choice(saved_config, key, current_value, choices):
+    value = saved_config.get(key, current_value)
+    if value in choices:
+        return value
+    log(f"Ignoring saved {key} {value!r}; expected one of: {', '.join(choices)}. Using '{current_value}'.", "warning")
+    return current_value
+
+
 def _saved_non_empty_string(saved_config, key, current_value):
     value = saved_config.get(key)
     return value if isinstance(value, str) and value else current_value
@@ -197,6 +276,51 @@ isRarSupportActive = _saved_value(_saved_gui_config, "rar_support", isRarSupport
 use_simple_naming = _saved_value(_saved_gui_config, "simple_naming", use_simple_naming, bool)
 vs_path = _saved_non_empty_string(_saved_gui_config, "vs_path", vs_path)
 winrar_path = _saved_non_empty_string(_saved_gui_config, "winrar_path", winrar_path)
+timeout_multiplier = _saved_value(_saved_gui_config, "timeout_multiplier", timeout_multiplier, (int, float))
+timeout_floor = _saved_value(_saved_gui_config, "timeout_floor", timeout_floor, (int, float))
+timeout_ceiling = _saved_value(_saved_gui_config, "timeout_ceiling", timeout_ceiling, (int, float))
+max_consecutive_timeouts = _saved_value(_saved_gui_config, "max_consecutive_timeouts", max_consecutive_timeouts, int)
+timeout_budget_seconds = _saved_value(_saved_gui_config, "timeout_budget_seconds", timeout_budget_seconds, (int, float))
+ground_truth_cache_enabled = _saved_value(_saved_gui_config, "ground_truth_cache", ground_truth_cache_enabled, bool)
+incremental_grading = _saved_value(_saved_gui_config, "incremental_grading", incremental_grading, bool)
+deduplicate_submissions = _saved_value(_saved_gui_config, "deduplicate_submissions", deduplicate_submissions, bool)
+compile_cache_enabled = _saved_value(_saved_gui_config, "compile_cache", compile_cache_enabled, bool)
+compile_cache_max_mb = _saved_value(_saved_gui_config, "compile_cache_max_mb", compile_cache_max_mb, (int, float))
+max_workers = _saved_value(_saved_gui_config, "max_workers", max_workers, int)
+execution_engine = _saved_value(_saved_gui_config, "execution_engine", execution_engine, str)
+max_output_mb = _saved_value(_saved_gui_config, "max_output_mb", max_output_mb, (int, float))
+resource_limits = _saved_value(_saved_gui_config, "resource_limits", resource_limits, bool)
+memory_limit_mb = _saved_value(_saved_gui_config, "memory_limit_mb", memory_limit_mb, (int, float))
+toolchain = _saved_choice(_saved_gui_config, "toolchain", toolchain, TOOLCHAINS)
+syntax_precheck = _saved_value(_saved_gui_config, "syntax_precheck", syntax_precheck, bool)
+build_root = _saved_value(_saved_gui_config, "build_root", build_root, str)
+comparison_memo_size = _saved_value(_saved_gui_config, "comparison_memo_size", comparison_memo_size, int)
+
+
+def execution_config():
+    """Return execution settings that have no GUI control but are persisted in gui_config.json."""
+    return {
+        "timeout_multiplier": timeout_multiplier,
+        "timeout_floor": timeout_floor,
+        "timeout_ceiling": timeout_ceiling,
+        "max_consecutive_timeouts": max_consecutive_timeouts,
+        "timeout_budget_seconds": timeout_budget_seconds,
+        "ground_truth_cache": ground_truth_cache_enabled,
+        "incremental_grading": incremental_grading,
+        "deduplicate_submissions": deduplicate_submissions,
+        "compile_cache": compile_cache_enabled,
+        "compile_cache_max_mb": compile_cache_max_mb,
+        "max_workers": max_workers,
+        "execution_engine": execution_engine,
+        "max_output_mb": max_output_mb,
+        "resource_limits": resource_limits,
+        "memory_limit_mb": memory_limit_mb,
+        "toolchain": toolchain,
+        "syntax_precheck": syntax_precheck,
+        "build_root": build_root,
+        "comparison_memo_size": comparison_memo_size,
+    }
+
 
 def validate_config(questions_list, weights_dict):
     """Validates the questions list, weights dict, and folder structure.
@@ -4,6 +4,7 @@ import re
 import pandas as pd
 from .utils import log
 from .configuration import penalty
+from .run_metrics import METRICS_FOLDER_NAME, load_metrics_summary
 
 ID_COLUMN = "ID_number"
 NAME_COLUMN = "Name"
@@ -104,6 +105,34 @@ def extract_structural_notes(text):
     return None
 
 
+def extract_complexity_check_status(text):
+    match = re.search(r'^Complexity Check:\s*(.*)$', text, re.MULTILINE)
+    if match:
+        return match.group(1).strip()
+    return None
+
+
+def extract_complexity_class(text):
+    match = re.search(r'^Complexity Class:\s*(.*)$', text, re.MULTILINE)
+    if match:
+        return match.group(1).strip()
+    return None
+
+
+def extract_complexity_penalty(text):
+    match = re.search(r'^Complexity Penalty:\s*-?(\d+(?:\.\d+)?)', text, re.MULTILINE)
+    if match:
+        return float(match.group(1))
+    return 0
+
+
+def extract_complexity_notes(text):
+    match = re.search(r'^Complexity Notes:\s*(.*)$', text, re.MULTILINE)
+    if match:
+        return match.group(1).strip()
+    return None
+
+
 def extract_timeouts(text):
     """
     Extracts the number of timeouts from the text.
@@ -116,6 +145,30 @@ def extract_timeouts(text):
     return 0
 
 
+def extract_timeout_budget_skipped(text):
+    """
+    Extracts how many inputs were skipped by the fail-fast timeout budget.
+    Looks for a pattern like 'Timeout Budget Skipped: X/Y' and returns X as an integer.
+    Returns 0 if the budget was not hit.
+    """
+    match = re.search(r'^Timeout Budget Skipped:\s*(\d+)/\d+', text, re.MULTILINE)
+    if match:
+        return int(match.group(1))
+    return 0
+
+
+def extract_output_limit_exceeded(text):
+    """
+    Extracts how many runs were killed for writing too much output.
+    Looks for a pattern like 'Output Limit Exceeded: X/Y' and returns X as an integer.
+    Returns 0 if no run hit the limit.
+    """
+    match = re.search(r'^Output Limit Exceeded:\s*(\d+)/\d+', text, re.MULTILINE)
+    if match:
+        return int(match.group(1))
+    return 0
+
+
 def extract_wrong_inputs(text):
     """Extracts the list of wrong inputs from the text.
     Looks for a pattern like 'Wrong Inputs: input1, input2, ...'
@@ -232,6 +285,7 @@ def build_grade_calculation_comment(
     structural_penalty_columns,
     weighted_subtotal,
     final_grade,
+    complexity_penalty_columns=(),
 ):
     lines = ["Grade Calculation:"]
     for grade_column in grade_columns:
@@ -245,6 +299,7 @@ def build_grade_calculation_comment(
             for note in [
                 repair_calculation_note(row, question_name, repair_penalty_columns),
                 structural_calculation_note(row, question_name, structural_penalty_columns),
+                complexity_calculation_note(row, question_name, complexity_penalty_columns),
             ]
             if note
         ]
@@ -291,6 +346,16 @@ def structural_calculation_note(row, question_name, structural_penalty_columns):
     return f"includes structural penalty -{format_grade_number(structural_penalty_value)}"
 
 
+def complexity_calculation_note(row, question_name, complexity_penalty_columns):
+    penalty_column = f"Complexity_Penalty_{question_name}"
+    if penalty_column not in complexity_penalty_columns:
+        return ""
+    complexity_penalty_value = float(row.get(penalty_column, 0) or 0)
+    if complexity_penalty_value <= 0:
+        return ""
+    return f"includes complexity penalty -{format_grade_number(complexity_penalty_value)}"
+
+
 def parse_submit_errors(error_file="submit_error.txt") -> dict[str, str]:
     """
     Reads the submit_error.txt file and returns a dict mapping student ID to error reason.
@@ -412,6 +477,9 @@ def create_excel_for_grades(parent_folders):
             compilation_error = extract_compilation_error(text)
             original_compilation_error = extract_original_compilation_error(text)
             timeouts = extract_timeouts(text)
+            timeout_budget_skipped = extract_timeout_budget_skipped(text)
+            output_limit_exceeded = extract_output_limit_exceeded(text)
+            metrics_summary = load_metrics_summary(os.path.join(parent, METRICS_FOLDER_NAME), student_id)
             wrong_inputs_str = extract_wrong_inputs(text)
             grade_calculation = extract_grade_calculation(text)
             timeout_inputs_str = extract_timeout_inputs(text)  # Extract the new timeout inputs
@@ -422,6 +490,10 @@ def create_excel_for_grades(parent_folders):
             structural_status = extract_structural_check_status(text)
             structural_penalty = extract_structural_penalty(text)
             structural_notes = extract_structural_notes(text)
+            complexity_status = extract_complexity_check_status(text)
+            complexity_class = extract_complexity_class(text)
+            complexity_penalty = extract_complexity_penalty(text)
+            complexity_notes = extract_complexity_notes(text)
             
             rows.append([
                 student_id,
@@ -439,6 +511,14 @@ def create_excel_for_grades(parent_folders):
                 structural_status,
                 structural_penalty,
                 structural_notes,
+                timeout_budget_skipped,
+                output_limit_exceeded,
+                metrics_summary.get("median_slowdown"),
+                metrics_summary.get("peak_rss_kb"),
+                complexity_status,
+                complexity_class,
+                complexity_penalty,
+                complexity_notes,
             ])
 
         # Create a DataFrame with the new column
@@ -458,6 +538,14 @@ def create_excel_for_grades(parent_folders):
             "Structural_Check_Status",
             "Structural_Penalty",
             "Structural_Notes",
+            "Timeout_Budget_Skipped",
+            "Output_Limit_Exceeded",
+            "Median_Slowdown",
+            "Peak_RSS_KB",
+            "Complexity_Check_Status",
+            "Complexity_Class",
+            "Complexity_Penalty",
+            "Complexity_Notes",
         ])
 
         # Write the per-question Excel
@@ -474,6 +562,9 @@ def create_excel_for_grades(parent_folders):
                 "Compilation_Repair_Note",
                 "Structural_Check_Status",
                 "Structural_Notes",
+                "Complexity_Check_Status",
+                "Complexity_Class",
+                "Complexity_Notes",
             ])
         log(f"Created file: {output_excel} with {len(df)} records.", level="success")
 
@@ -544,6 +635,14 @@ def compute_final_grades(folder_data, folder_weights, penalty: int, slim=True, p
             "Structural_Check_Status": f"Structural_Check_Status_{folder}",
             "Structural_Penalty": f"Structural_Penalty_{folder}",
             "Structural_Notes": f"Structural_Notes_{folder}",
+            "Timeout_Budget_Skipped": f"Timeout_Budget_Skipped_{folder}",
+            "Output_Limit_Exceeded": f"Output_Limit_Exceeded_{folder}",
+            "Median_Slowdown": f"Median_Slowdown_{folder}",
+            "Peak_RSS_KB": f"Peak_RSS_KB_{folder}",
+            "Complexity_Check_Status": f"Complexity_Check_Status_{folder}",
+            "Complexity_Class": f"Complexity_Class_{folder}",
+            "Complexity_Penalty": f"Complexity_Penalty_{folder}",
+            "Complexity_Notes": f"Complexity_Notes_{folder}",
         })
         if final_df is None:
             final_df = df_temp
@@ -565,12 +664,21 @@ def compute_final_grades(folder_data, folder_weights, penalty: int, slim=True, p
     structural_status_columns = [col for col in final_df.columns if col.startswith("Structural_Check_Status_")]
     structural_penalty_columns = [col for col in final_df.columns if col.startswith("Structural_Penalty_")]
     structural_note_columns = [col for col in final_df.columns if col.startswith("Structural_Notes_")]
+    timeout_budget_columns = [col for col in final_df.columns if col.startswith("Timeout_Budget_Skipped_")]
+    output_limit_columns = [col for col in final_df.columns if col.startswith("Output_Limit_Exceeded_")]
+    complexity_status_columns = [col for col in final_df.columns if col.startswith("Complexity_Check_Status_")]
+    complexity_class_columns = [col for col in final_df.columns if col.startswith("Complexity_Class_")]
+    complexity_penalty_columns = [col for col in final_df.columns if col.startswith("Complexity_Penalty_")]
+    complexity_note_columns = [col for col in final_df.columns if col.startswith("Complexity_Notes_")]
 
     final_df[grade_columns] = final_df[grade_columns].fillna(0)
     final_df[timeout_columns] = final_df[timeout_columns].fillna(0)
     final_df[repair_attempt_columns] = final_df[repair_attempt_columns].fillna(0)
     final_df[repair_penalty_columns] = final_df[repair_penalty_columns].fillna(0)
     final_df[structural_penalty_columns] = final_df[structural_penalty_columns].fillna(0)
+    final_df[timeout_budget_columns] = final_df[timeout_budget_columns].fillna(0)
+    final_df[output_limit_columns] = final_df[output_limit_columns].fillna(0)
+    final_df[complexity_penalty_columns] = final_df[complexity_penalty_columns].fillna(0)
     for col in compile_columns:
         final_df[col] = final_df[col].where(final_df[col].notna(), False).astype(bool)
     for col in original_compile_columns:
@@ -585,6 +693,8 @@ def compute_final_grades(folder_data, folder_weights, penalty: int, slim=True, p
         final_df[col] = final_df[col].fillna("")
     for col in structural_status_columns + structural_note_columns:
         final_df[col] = final_df[col].fillna("")
+    for col in complexity_status_columns + complexity_class_columns + complexity_note_columns:
+        final_df[col] = final_df[col].fillna("")
 
     # Calculate initial final weighted grade
     final_df["Final_Grade"] = 0
@@ -662,6 +772,7 @@ def compute_final_grades(folder_data, folder_weights, penalty: int, slim=True, p
                 structural_penalty_columns,
                 row[WEIGHTED_SUBTOTAL_COLUMN],
                 row[FINAL_GRADE_COLUMN],
+                complexity_penalty_columns,
             )
         ]
         
@@ -730,6 +841,22 @@ def compute_final_grades(folder_data, folder_weights, penalty: int, slim=True, p
                     )
         if structural_notes_list:
             comments_parts.append("Non-Recursive Solution Checks: " + "; ".join(structural_notes_list))
+
+        complexity_notes_list = []
+        for col_name in complexity_status_columns:
+            status = row[col_name]
+            if status and status != "passed":
+                q_name_match = re.match(r'Complexity_Check_Status_(Q\d+)', col_name)
+                if q_name_match:
+                    q_name = q_name_match.group(1)
+                    complexity_penalty_value = row.get(f"Complexity_Penalty_{q_name}", 0)
+                    complexity_note = row.get(f"Complexity_Notes_{q_name}", "")
+                    note_text = f": {complexity_note}" if complexity_note else ""
+                    complexity_notes_list.append(
+                        f"{q_name}: {status} (-{complexity_penalty_value:g}){note_text}"
+                    )
+        if complexity_notes_list:
+            comments_parts.append("Complexity Checks: " + "; ".join(complexity_notes_list))
         
         # 2. Add Timeout Cases
         timeout_cases_list = []
@@ -739,7 +866,9 @@ def compute_final_grades(folder_data, folder_weights, penalty: int, slim=True, p
                 q_name_match = re.match(r'Timeout_Inputs_(Q\d+)', col_name)
                 if q_name_match:
                     q_name = q_name_match.group(1)
-                    timeout_cases_list.append(f"{q_name}: {timeout_inputs_str}")
+                    skipped = safe_int(row.get(f"Timeout_Budget_Skipped_{q_name}", 0))
+                    skipped_text = f" ({skipped} skipped by timeout budget)" if skipped else ""
+                    timeout_cases_list.append(f"{q_name}: {timeout_inputs_str}{skipped_text}")
         if timeout_cases_list:
             comments_parts.append("Timeout Cases:\n" + "\n".join(timeout_cases_list))
         
@@ -817,7 +946,14 @@ def build_overall_summary(final_grades_df, folder_data):
         ("LLM compile repairs", sum(count_equal(df, "Compilation_Repair_Status", "fixed") for df in folder_data.values())),
         ("Students with timeouts", count_students_with_any(folder_data, "Timeouts", is_positive)),
         ("Total timeouts", sum(sum_numeric(df, "Timeouts") for df in folder_data.values())),
+        ("Timeout budget hits", sum(count_positive(df, "Timeout_Budget_Skipped") for df in folder_data.values())),
+        ("Inputs skipped by timeout budget", sum(sum_numeric(df, "Timeout_Budget_Skipped") for df in folder_data.values())),
+        ("Students over output limit", count_students_with_any(folder_data, "Output_Limit_Exceeded", is_positive)),
+        ("Output limit kills", sum(sum_numeric(df, "Output_Limit_Exceeded") for df in folder_data.values())),
+        ("Median slowdown vs original_sol", median_of_columns(folder_data, "Median_Slowdown")),
+        ("Max peak RSS (KB)", max_of_columns(folder_data, "Peak_RSS_KB")),
         ("Non-recursive penalties", sum(count_positive(df, "Structural_Penalty") for df in folder_data.values())),
+        ("Complexity penalties", sum(count_positive(df, "Complexity_Penalty") for df in folder_data.values())),
     ]
     return pd.DataFrame(metrics, columns=["Metric", "Value"])
 
@@ -844,6 +980,12 @@ def build_per_question_summary(folder_data, folder_weights, top_wrong_inputs):
             "Students_With_Timeouts": count_positive(df, "Timeouts"),
             "Total_Timeouts": sum_numeric(df, "Timeouts"),
             "Non_Recursive_Penalties": count_positive(df, "Structural_Penalty"),
+            "Complexity_Penalties": count_positive(df, "Complexity_Penalty"),
+            "Timeout_Budget_Hits": count_positive(df, "Timeout_Budget_Skipped"),
+            "Timeout_Budget_Skipped_Inputs": sum_numeric(df, "Timeout_Budget_Skipped"),
+            "Output_Limit_Kills": sum_numeric(df, "Output_Limit_Exceeded"),
+            "Median_Slowdown": median_of_columns({question: df}, "Median_Slowdown"),
+            "Max_Peak_RSS_KB": max_of_columns({question: df}, "Peak_RSS_KB"),
             "Top_Wrong_Inputs": top_wrong_inputs_text(df, limit=top_wrong_inputs),
         })
     return pd.DataFrame(rows)
@@ -980,6 +1122,10 @@ def attention_question_reason(question, row):
         structural_note = row.get("Structural_Notes", "")
         note_text = f": {structural_note}" if structural_note else ""
         details.append(f"non-recursive penalty -{format_grade_number(row.get('Structural_Penalty', 0))}{note_text}")
+    if is_positive(row.get("Complexity_Penalty", 0)):
+        complexity_note = row.get("Complexity_Notes", "")
+        note_text = f": {complexity_note}" if complexity_note else ""
+        details.append(f"complexity penalty -{format_grade_number(row.get('Complexity_Penalty', 0))}{note_text}")
     return f"{question}: {', '.join(details)}" if details else ""
 
 
@@ -1070,6 +1216,21 @@ def sum_numeric(df, column_name):
     return int(pd.to_numeric(df[column_name], errors="coerce").fillna(0).sum())
 
 
+def column_values(folder_data, column_name):
+    values = [df[column_name] for df in folder_data.values() if column_name in df.columns]
+    return numeric_series(pd.concat(values, ignore_index=True)) if values else numeric_series([])
+
+
+def median_of_columns(folder_data, column_name):
+    values = column_values(folder_data, column_name)
+    return round(float(values.median()), 3) if not values.empty else ""
+
+
+def max_of_columns(folder_data, column_name):
+    values = column_values(folder_data, column_name)
+    return int(values.max()) if not values.empty else ""
+
+
 def count_students_with_any(folder_data, column_name, predicate):
     student_ids = set()
     for df in folder_data.values():
@@ -1184,7 +1345,7 @@ def write_summary_dashboard(writer, workbook, summary_tables):
             wrap_format,
         )
 
-    for column_index in range(0, 18):
+    for column_index in range(0, 20):
         worksheet.set_column(column_index, column_index, 18)
     worksheet.set_column(0, 0, 24)
     worksheet.set_column(1, 1, 24)
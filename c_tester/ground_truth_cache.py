@@ -0,0 +1,138 @@
+"""Content-addressed on-disk cache for reference solution outputs."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+import functools
+import hashlib
+import json
+import os
+import subprocess
+
+
+CACHE_FORMAT_VERSION = 2
+CACHE_DIR_NAME = ".c_tester_cache"
+GROUND_TRUTH_CACHE_SUBDIR = "ground_truth"
+
+
+@dataclass(frozen=True)
+class GroundTruthCacheEntry:
+    ground_truth: list
+    runtimes: list
+
+
+def ground_truth_cache_dir(question_folder: str) -> str:
+    """Return the cache folder shared by all questions under the same grading root."""
+    grading_root = os.path.dirname(os.path.abspath(question_folder))
+    return os.path.join(grading_root, CACHE_DIR_NAME, GROUND_TRUTH_CACHE_SUBDIR)
+
+
+def toolchain_identity(banner_command: str = "cl") -> str:
+    """Return the compiler banner for the active environment, e.g. the cl or `gcc --version` line."""
+    return _compiler_banner(os.environ.get("PATH", ""), banner_command)
+
+
+@functools.lru_cache(maxsize=8)
+def _compiler_banner(path_env: str, banner_command: str) -> str:
+    try:
+        result = subprocess.run(banner_command, shell=True, capture_output=True, text=True, timeout=30)
+    except (OSError, subprocess.SubprocessError):
+        return "unavailable"
+    for line in (result.stderr or result.stdout or "").splitlines():
+        if line.strip():
+            return line.strip()
+    return "unavailable"
+
+
+def ground_truth_cache_key(
+    source_path: str,
+    inputs: list,
+    compile_command: str,
+    toolchain: str,
+    timeout: float,
+    resource_limits: bool = False,
+    memory_limit_mb: float = 0,
+    max_output_bytes: int = 0,
+) -> str | None:
+    """Hash everything that can change the reference outputs; None when the source is unreadable.
+
+    The execution limits count too: the CPU-time mode, the address-space limit
+    and the output cap each decide whether a reference run times out, fails or
+    is cut off.
+    """
+    try:
+        with open(source_path, "rb") as source_file:
+            source_bytes = source_file.read()
+    except OSError:
+        return None
+
+    digest = hashlib.sha256()
+    for part in (
+        f"v{CACHE_FORMAT_VERSION}".encode("utf-8"),
+        source_bytes,
+        json.dumps(list(inputs), ensure_ascii=False).encode("utf-8"),
+        compile_command.encode("utf-8"),
+        toolchain.encode("utf-8"),
+        f"{timeout:g}".encode("utf-8"),
+        f"{int(resource_limits)}:{memory_limit_mb:g}:{max_output_bytes}".encode("utf-8"),
+    ):
+        digest.update(len(part).to_bytes(8, "big"))
+        digest.update(part)
+    return digest.hexdigest()
+
+
+def load_ground_truth(cache_dir: str, key: str) -> GroundTruthCacheEntry | None:
+    try:
+        with open(_entry_path(cache_dir, key), "r", encoding="utf-8") as cache_file:
+            payload = json.load(cache_file)
+    except (OSError, json.JSONDecodeError):
+        return None
+
+    if not isinstance(payload, dict) or payload.get("key") != key:
+        return None
+    ground_truth = payload.get("ground_truth")
+    runtimes = payload.get("runtimes")
+    if not isinstance(ground_truth, list) or not isinstance(runtimes, list) or len(ground_truth) != len(runtimes):
+        return None
+    try:
+        pairs = [(str(input_value), str(output)) for input_value, output in ground_truth]
+        runtimes = [float(runtime) for runtime in runtimes]
+    except (TypeError, ValueError):
+        return None
+    return GroundTruthCacheEntry(pairs, runtimes)
+
+
+def store_ground_truth(cache_dir: str, key: str, ground_truth: list, runtimes: list) -> bool:
+    """Write an entry atomically so a concurrent or interrupted run never sees a partial file."""
+    path = _entry_path(cache_dir, key)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    payload = {
+        "key": key,
+        "ground_truth": [[input_value, output] for input_value, output in ground_truth],
+        "runtimes": list(runtimes),
+    }
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        with open(temp_path, "w", encoding="utf-8") as cache_file:
+            json.dump(payload, cache_file, ensure_ascii=False)
+        os.replace(temp_path, path)
+        return True
+    except OSError:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        return False
+
+
+def is_cacheable(ground_truth: list, expected_count: int) -> bool:
+    """Only complete runs without timeouts, output-limit kills or launch errors are worth reusing."""
+    if len(ground_truth) != expected_count:
+        return False
+    return not any(
+        output in ("Timeout", "Output limit exceeded") or output.startswith("Error:") for _, output in ground_truth
+    )
+
+
+def _entry_path(cache_dir: str, key: str) -> str:
+    return os.path.join(cache_dir, f"{key}.json")
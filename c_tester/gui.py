@@ -134,6 +134,7 @@ from .configuration import validate_config
 from . import configuration
 from .preprocess import detect_submission_naming, preprocess_submissions
 from .process import run_tests, setup_visual_studio_environment, read_inputs_from_file, get_ground_truth, compile_file, run_executable
+from .rescore import rescore_all_questions
 from .create_excel import create_excels
 from .checker_assistant import (
     DEFAULT_CHEAP_GEMINI_MODEL,
@@ -205,6 +206,7 @@ from .verification import (
     strict_confidence_metadata,
 )
 from .structural_analysis import structural_requirements_errors
+from .complexity_analysis import complexity_profile_errors
 from .clear_utils import (
     clear_grades,
     clear_output,
@@ -337,6 +339,7 @@ class App(ctk.CTk):
         self.gui_winrar_path = default_winrar_path  # Initialize WinRAR path
         self.gui_simple_naming = configuration.use_simple_naming  # Initialize simple naming flag
         self.slim_output_var = tk.BooleanVar(value=False)  # Variable for slim checkbox
+        self.rescore_only_var = tk.BooleanVar(value=False)  # Regrade stored outputs without compiling
         self.per_error_penalty_var = tk.BooleanVar(value=default_per_error_penalty)  # Variable for per-error penalty checkbox
         self.test_scoring_mode_var = tk.StringVar(value=default_test_scoring_mode)
         self.llm_compile_repair_var = tk.BooleanVar(value=default_llm_compile_repair_enabled)
@@ -819,6 +822,18 @@ class App(ctk.CTk):
         )
         self.slim_checkbox.pack(side=tk.LEFT)
 
+        self.rescore_checkbox = ctk.CTkCheckBox(
+            self.slim_checkbox_frame,
+            text="Rescore stored outputs only",
+            variable=self.rescore_only_var,
+            onvalue=True,
+            offvalue=False,
+            border_width=2,
+            hover=True,
+            width=250
+        )
+        self.rescore_checkbox.pack(side=tk.LEFT)
+
         self.checker_manager_button = ctk.CTkButton(
             self.grading_frame,
             text="🧪 Checker Manager",
@@ -1681,6 +1696,7 @@ class App(ctk.CTk):
             "simple_naming": self.gui_simple_naming,
             "vs_path": self.gui_vs_path,
             "winrar_path": self.gui_winrar_path,
+            **configuration.execution_config(),
         }
 
     def save_current_gui_config(self):
@@ -1754,19 +1770,29 @@ class App(ctk.CTk):
             self.save_current_gui_config()
 
         # --- Proceed with Grading Task ---
-        compile_repair_provider = self.make_compile_repair_provider()
-        run_tests(
-            self.gui_questions,
-            progress_callback,
-            cancel_event,
-            scoring_mode=self.gui_test_scoring_mode,
-            deduction_per_error=self.gui_test_error_deduction,
-            llm_compile_repair_enabled=self.gui_llm_compile_repair_enabled,
-            llm_compile_repair_provider=compile_repair_provider,
-            llm_compile_repair_penalty=self.gui_llm_compile_repair_penalty,
-            llm_compile_repair_max_attempts=self.gui_llm_compile_repair_max_attempts,
-            vs_path_override=self.gui_vs_path,
-        )
+        if self.rescore_only_var.get():
+            log("Rescoring stored outputs (no compile or execute)...", level="info")
+            rescore_all_questions(
+                self.gui_questions,
+                progress_callback,
+                cancel_event,
+                scoring_mode=self.gui_test_scoring_mode,
+                deduction_per_error=self.gui_test_error_deduction,
+            )
+        else:
+            compile_repair_provider = self.make_compile_repair_provider()
+            run_tests(
+                self.gui_questions,
+                progress_callback,
+                cancel_event,
+                scoring_mode=self.gui_test_scoring_mode,
+                deduction_per_error=self.gui_test_error_deduction,
+                llm_compile_repair_enabled=self.gui_llm_compile_repair_enabled,
+                llm_compile_repair_provider=compile_repair_provider,
+                llm_compile_repair_penalty=self.gui_llm_compile_repair_penalty,
+                llm_compile_repair_max_attempts=self.gui_llm_compile_repair_max_attempts,
+                vs_path_override=self.gui_vs_path,
+            )
         if not (cancel_event and cancel_event.is_set()):
              # Get slim state from checkbox variable
              slim_mode = self.slim_output_var.get()
@@ -4906,6 +4932,11 @@ class CheckerManagerWindow(ctk.CTkToplevel):
             messagebox.showerror("Structural Requirement Needs Input", "\n".join(structural_errors))
             self.set_status("Structural requirement needs a deduction before saving.")
             return
+        complexity_errors = complexity_profile_errors(question_config)
+        if complexity_errors:
+            messagebox.showerror("Complexity Profile Needs Input", "\n".join(complexity_errors))
+            self.set_status("Complexity profile needs correction before saving.")
+            return
         question = self.question_var.get()
         current_hash = checker_config_hash(question_config)
         test_status = (
@@ -5260,7 +5291,11 @@ class CheckerManagerWindow(ctk.CTkToplevel):
             )
             configuration_errors = checker_config_errors(question_config)
             structural_errors = structural_requirements_errors(question_config)
-            current_warnings = list(configuration_errors) + list(structural_errors)
+            current_warnings = (
+                list(configuration_errors)
+                + list(structural_errors)
+                + list(complexity_profile_errors(question_config))
+            )
             if not configuration_errors:
                 rows = run_checker_tests(question_config, expected_outputs)
                 tests_ok, test_warnings = self.evaluate_checker_test_rows(rows)
@@ -2,9 +2,10 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from functools import partial
 import re
-from typing import Any
+from typing import Any, Callable
 
 
 CONTRACT_VERSION = 1
@@ -23,7 +24,8 @@ _POINT_PATTERN = re.compile(
 _INTEGER_PATTERN = re.compile(r"-?\d+")
 _FLOAT_RE = re.compile(_FLOAT_PATTERN)
 # Matches a negation directly after a boolean alias: "is" + "n't"/"nt"/" not".
-_NEGATION_SUFFIX_RE = re.compile(r"^(?:n'?t\b|\s+not\b)")
+_NEGATION_SUFFIX_RE = re.compile(r"(?:n'?t\b|\s+not\b)")
+_PUNCTUATION_RE = re.compile(r"[^\w\s-]")
 
 _NORMALIZERS = {"collapse_whitespace", "lowercase", "strip_punctuation", "normalize_apostrophe"}
 _EXTRACTORS = {"text", "integers", "floats", "labeled_number", "point", "points", "boolean"}
@@ -232,52 +234,171 @@ def validate_contract(contract: dict) -> list[str]:
     return errors
 
 
+@dataclass(frozen=True)
+class FieldPlan:
+    """One compiled field. `mirror` names a reference field with the same extraction spec (actual fields only)."""
+
+    id: str
+    source: str
+    normalize: Callable[[str], str]
+    extract_normalized: Callable[[str], Any]
+    mirror: str | None = None
+
+    def extract(self, raw_text: str) -> Any:
+        return self.extract_normalized(self.normalize(raw_text))
+
+
+@dataclass(frozen=True)
+class CheckPlan:
+    id: str
+    left: Callable[[dict], Any]
+    right: Callable[[dict], Any]
+    apply: Callable[[Any, Any, dict], tuple[bool, Any, Any]]
+    reason: str
+
+
+@dataclass(frozen=True)
+class ReferenceFields:
+    """A plan's stdin- and reference-sourced field values for one input.
+
+    `errors` maps a field id to the (code, message) of its extraction failure;
+    `normalized` keeps the normalized reference text of fields that actual fields mirror.
+    """
+
+    values: dict
+    errors: dict
+    normalized: dict = field(default_factory=dict)
+
+    def to_json(self) -> dict:
+        return {
+            "fields": dict(self.values),
+            "errors": {field_id: {"code": code, "message": message} for field_id, (code, message) in self.errors.items()},
+        }
+
+
+@dataclass(frozen=True)
+class ContractPlan:
+    """A contract validated once and compiled for repeated evaluation.
+
+    Regexes, normalizer chains, selectors and check functions are resolved at
+    compile time, so evaluating a case only runs the extractors and checks.
+    """
+
+    fields: tuple = ()
+    checks: tuple = ()
+    errors: tuple = ()
+
+    def extract_reference_fields(self, input_value: str, reference_output: str) -> ReferenceFields:
+        """Extract every field not sourced from the student's output; they are the same for all students."""
+        sources = {"stdin": str(input_value)[:MAX_OUTPUT_CHARS], "reference": str(reference_output)[:MAX_OUTPUT_CHARS]}
+        mirrored = {plan.mirror for plan in self.fields if plan.mirror}
+        values = {}
+        errors = {}
+        normalized = {}
+        for plan in self.fields:
+            if plan.source == "actual":
+                continue
+            text = plan.normalize(sources[plan.source])
+            if plan.id in mirrored:
+                normalized[plan.id] = text
+            try:
+                values[plan.id] = plan.extract_normalized(text)
+            except ContractExtractionError as exc:
+                errors[plan.id] = (exc.code, str(exc))
+        return ReferenceFields(values, errors, normalized)
+
+    def evaluate(
+        self,
+        input_value: str,
+        reference_output: str,
+        actual_output: str,
+        reference_fields: ReferenceFields | None = None,
+    ) -> ContractResult:
+        """Evaluate one case; `reference_fields` (from extract_reference_fields) skips re-extracting them."""
+        if self.errors:
+            return ContractResult(False, f"invalid checker contract: {'; '.join(self.errors)}")
+
+        sources = {
+            "stdin": str(input_value)[:MAX_OUTPUT_CHARS],
+            "reference": str(reference_output)[:MAX_OUTPUT_CHARS],
+            "actual": str(actual_output)[:MAX_OUTPUT_CHARS],
+        }
+        actual_clean = " ".join(sources["actual"].split())
+        if (
+            not actual_clean
+            or actual_clean.lower() in ("timeout", "output limit exceeded")
+            or actual_clean.lower().startswith(("runtime error:", "error:"))
+        ):
+            return ContractResult(False, "runtime, timeout, output limit, or empty output")
+
+        values: dict[str, Any] = {}
+        field_sources: dict[str, str] = {}
+        normalized = reference_fields.normalized if reference_fields is not None else {}
+        for field in self.fields:
+            try:
+                if field.source != "actual" and reference_fields is not None:
+                    if field.id in reference_fields.errors:
+                        code, message = reference_fields.errors[field.id]
+                        raise ContractExtractionError(message, code=code)
+                    values[field.id] = reference_fields.values[field.id]
+                else:
+                    text = field.normalize(sources[field.source])
+                    if field.mirror in values and normalized.get(field.mirror) == text:
+                        # Same spec on the same normalized text: the mirrored reference value is
+                        # exactly what extraction would return, so the extractors are skipped.
+                        values[field.id] = values[field.mirror]
+                    else:
+                        if reference_fields is None and field.source == "reference":
+                            normalized[field.id] = text
+                        values[field.id] = field.extract_normalized(text)
+                field_sources[field.id] = field.source
+            except ContractExtractionError as exc:
+                expected = {key: value for key, value in values.items() if field_sources.get(key) != "actual"}
+                actual = {key: value for key, value in values.items() if field_sources.get(key) == "actual"}
+                return ContractResult(False, f"field {field.id} [{exc.code}]: {exc}", expected, actual)
+
+        for check in self.checks:
+            passed, compared_left, compared_right = check.apply(check.left(values), check.right(values), values)
+            if not passed:
+                return ContractResult(
+                    False,
+                    f"{check.id}: {check.reason}",
+                    {"check": check.id, "value": compared_right},
+                    {"check": check.id, "value": compared_left},
+                )
+
+        expected = {key: value for key, value in values.items() if field_sources.get(key) != "actual"}
+        actual = {key: value for key, value in values.items() if field_sources.get(key) == "actual"}
+        return ContractResult(True, "all declarative checker assertions passed", expected, actual)
+
+
+def compile_contract(contract: dict) -> ContractPlan:
+    """Validate `contract` and compile it; an invalid contract yields a plan that fails every case."""
+    errors = validate_contract(contract)
+    if errors:
+        return ContractPlan(errors=tuple(errors))
+    return ContractPlan(
+        tuple(_field_plan(field, _mirror_field(field, contract["fields"])) for field in contract["fields"]),
+        tuple(
+            CheckPlan(
+                check["id"],
+                _value_resolver(check["left"]),
+                _value_resolver(check["right"]),
+                partial(_apply_check, check),
+                check.get("message") or f"check {check['id']} failed",
+            )
+            for check in contract["checks"]
+        ),
+    )
+
+
 def evaluate_contract(
     contract: dict,
     input_value: str,
     reference_output: str,
     actual_output: str,
 ) -> ContractResult:
-    errors = validate_contract(contract)
-    if errors:
-        return ContractResult(False, f"invalid checker contract: {'; '.join(errors)}")
-
-    sources = {
-        "stdin": str(input_value)[:MAX_OUTPUT_CHARS],
-        "reference": str(reference_output)[:MAX_OUTPUT_CHARS],
-        "actual": str(actual_output)[:MAX_OUTPUT_CHARS],
-    }
-    actual_clean = " ".join(sources["actual"].split())
-    if not actual_clean or actual_clean.lower() == "timeout" or actual_clean.lower().startswith(("runtime error:", "error:")):
-        return ContractResult(False, "runtime, timeout, or empty output")
-
-    values: dict[str, Any] = {}
-    field_sources: dict[str, str] = {}
-    for field in contract["fields"]:
-        try:
-            values[field["id"]] = _extract_field(field, sources[field["source"]])
-            field_sources[field["id"]] = field["source"]
-        except ContractExtractionError as exc:
-            expected = {key: value for key, value in values.items() if field_sources.get(key) != "actual"}
-            actual = {key: value for key, value in values.items() if field_sources.get(key) == "actual"}
-            return ContractResult(False, f"field {field['id']} [{exc.code}]: {exc}", expected, actual)
-
-    for check in contract["checks"]:
-        left = _resolve_value(check["left"], values)
-        right = _resolve_value(check["right"], values)
-        passed, compared_left, compared_right = _apply_check(check, left, right, values)
-        if not passed:
-            reason = check.get("message") or f"check {check['id']} failed"
-            return ContractResult(
-                False,
-                f"{check['id']}: {reason}",
-                {"check": check["id"], "value": compared_right},
-                {"check": check["id"], "value": compared_left},
-            )
-
-    expected = {key: value for key, value in values.items() if field_sources.get(key) != "actual"}
-    actual = {key: value for key, value in values.items() if field_sources.get(key) == "actual"}
-    return ContractResult(True, "all declarative checker assertions passed", expected, actual)
+    return compile_contract(contract).evaluate(input_value, reference_output, actual_output)
 
 
 def compile_preset(checker_name: str, config: dict | None = None) -> dict:
@@ -414,101 +535,169 @@ def extract_contract_field(field: dict, raw_text: str) -> Any:
 
 
 def _extract_field(field: dict, raw_text: str) -> Any:
-    text = _normalize(raw_text, field.get("normalize", []))
-    scoped = _scope_text(text, field)
+    return _field_extractor(field)(raw_text)
+
+
+def _field_extractor(field: dict) -> Callable[[str], Any]:
+    """Compile one field into a function from raw source text to its extracted value."""
+    return _field_plan(field).extract
+
+
+def _field_plan(field: dict, mirror: str | None = None) -> FieldPlan:
+    scope = _text_scope(field)
+    extract = _value_extractor(field)
+
+    def extract_normalized(text: str) -> Any:
+        return extract(scope(text))
+
+    return FieldPlan(field["id"], field["source"], _normalizer_chain(field.get("normalize", [])), extract_normalized, mirror)
+
+
+def _mirror_field(field: dict, fields: list) -> str | None:
+    """Return the id of a reference field extracted exactly like this actual field, if any."""
+    if field["source"] != "actual":
+        return None
+    spec = {key: value for key, value in field.items() if key not in ("id", "source")}
+    for candidate in fields:
+        if candidate["source"] == "reference" and spec == {
+            key: value for key, value in candidate.items() if key not in ("id", "source")
+        }:
+            return candidate["id"]
+    return None
+
+
+def _value_extractor(field: dict) -> Callable[[str], Any]:
     extractor = field["extract"]
     if extractor == "text":
-        return scoped
-    if extractor == "integers":
-        return _select_values(
-            [int(value) for value in _INTEGER_PATTERN.findall(scoped)],
-            field.get("select", "all"),
-            field.get("allow_empty", False),
-        )
-    if extractor == "floats":
-        return _select_values(
-            [float(value) for value in _FLOAT_RE.findall(scoped)],
-            field.get("select", "all"),
-            field.get("allow_empty", False),
-        )
+        return _identity
+    if extractor in {"integers", "floats"}:
+        pattern, convert = (_INTEGER_PATTERN, int) if extractor == "integers" else (_FLOAT_RE, float)
+        selector = field.get("select", "all")
+        allow_empty = field.get("allow_empty", False)
+
+        def extract_numbers(scoped: str) -> Any:
+            return _select_values([convert(value) for value in pattern.findall(scoped)], selector, allow_empty)
+
+        return extract_numbers
     if extractor == "labeled_number":
-        labels = _configured_text_options(field, "label", "labels")
-        number_match = None
-        matched_label = ""
-        for label in labels:
-            number_match = re.search(
-                rf"{re.escape(label)}\s*[:=]?\s*({_FLOAT_PATTERN})",
-                scoped,
-                re.IGNORECASE,
-            )
+        return _labeled_number_extractor(field)
+    if extractor in {"point", "points"}:
+        return _point_extractor(field, extractor)
+    if extractor == "boolean":
+        return _boolean_extractor(field)
+    return _failing_extractor(ContractExtractionError, f"unsupported extractor '{extractor}'")
+
+
+def _labeled_number_extractor(field: dict) -> Callable[[str], Any]:
+    labels = _configured_text_options(field, "label", "labels")
+    patterns = [
+        re.compile(rf"{re.escape(label)}\s*[:=]?\s*({_FLOAT_PATTERN})", re.IGNORECASE)
+        for label in labels
+    ]
+    anchors = _configured_text_options(field, "anchor", "anchors")
+    description = " | ".join(labels or anchors)
+    code = "missing_label" if labels else "missing_anchor"
+    as_integer = field.get("number_type") == "integer"
+
+    def extract_labeled_number(scoped: str) -> Any:
+        numeric_text = None
+        for pattern in patterns:
+            number_match = pattern.search(scoped)
             if number_match:
-                matched_label = label
+                numeric_text = number_match.group(1)
                 break
-        if not labels and _configured_text_options(field, "anchor", "anchors"):
+        if not patterns and anchors:
             number_match = _FLOAT_RE.search(scoped)
-        if not number_match:
-            expected_labels = labels or _configured_text_options(field, "anchor", "anchors")
-            description = " | ".join(expected_labels)
-            raise ContractExtractionError(
-                f"could not find labeled value '{description}'",
-                code="missing_label" if labels else "missing_anchor",
-            )
-        numeric_text = number_match.group(1) if matched_label else number_match.group(0)
-        return int(float(numeric_text)) if field.get("number_type") == "integer" else float(numeric_text)
-    if extractor in {"point", "points"}:
+            if number_match:
+                numeric_text = number_match.group(0)
+        if numeric_text is None:
+            raise ContractExtractionError(f"could not find labeled value '{description}'", code=code)
+        return int(float(numeric_text)) if as_integer else float(numeric_text)
+
+    return extract_labeled_number
+
+
+def _point_extractor(field: dict, extractor: str) -> Callable[[str], Any]:
+    occurrence = field.get("occurrence", 0)
+    count = field.get("count", 1 if extractor == "point" else 2)
+    if not isinstance(occurrence, int) or not isinstance(count, int) or occurrence < 0 or count < 1 or count > 16:
+        return _failing_extractor(ContractExtractionError, "point occurrence/count is invalid")
+
+    def extract_points(scoped: str) -> Any:
         matches = [(float(x), float(y)) for x, y in _POINT_PATTERN.findall(scoped)]
-        occurrence = field.get("occurrence", 0)
-        count = field.get("count", 1 if extractor == "point" else 2)
-        if not isinstance(occurrence, int) or not isinstance(count, int) or occurrence < 0 or count < 1 or count > 16:
-            raise ContractExtractionError("point occurrence/count is invalid")
         selected = matches[occurrence:occurrence + count]
         if len(selected) != count:
             raise ContractExtractionError("required point value was not found", code="missing_semantic_value")
         return selected[0] if extractor == "point" else selected
-    if extractor == "boolean":
-        true_aliases = field.get("true_aliases", [])
-        false_aliases = field.get("false_aliases", [])
-        candidates = []
+
+    return extract_points
+
+
+def _boolean_extractor(field: dict) -> Callable[[str], Any]:
+    aliases = [
+        (alias.replace("\u2019", "'").lower(), value)
+        for value, configured in ((True, field.get("true_aliases", [])), (False, field.get("false_aliases", [])))
+        for alias in configured
+    ]
+
+    def extract_boolean(scoped: str) -> Any:
         lowered = scoped.replace("\u2019", "'").lower()
-        for value, aliases in ((True, true_aliases), (False, false_aliases)):
-            for alias in aliases:
-                normalized_alias = alias.replace("\u2019", "'").lower()
-                position = lowered.find(normalized_alias)
-                if position >= 0:
-                    candidates.append((position, -len(normalized_alias), value, position + len(normalized_alias)))
-        if not candidates:
+        best = None
+        for alias, value in aliases:
+            position = lowered.find(alias)
+            if position >= 0:
+                candidate = (position, -len(alias), value, position + len(alias))
+                if best is None or candidate < best:
+                    best = candidate
+        if best is None:
             raise ContractExtractionError(
                 "none of the configured boolean aliases were found",
                 code="missing_semantic_value",
             )
-        _, _, value, match_end = min(candidates)
+        _, _, value, match_end = best
         # An alias immediately followed by a negation states the opposite of the
         # bare alias ("is not", "isn't", "has not"), even when that phrasing is
         # missing from the configured aliases. Longer configured aliases still
         # win at the same position, so explicit negated aliases stay authoritative.
-        if _NEGATION_SUFFIX_RE.match(lowered[match_end:]):
+        if _NEGATION_SUFFIX_RE.match(lowered, match_end):
             return not value
         return value
-    raise ContractExtractionError(f"unsupported extractor '{extractor}'")
 
+    return extract_boolean
+
+
+def _failing_extractor(error_type: type, message: str) -> Callable[[str], Any]:
+    def fail(_: str) -> Any:
+        raise error_type(message)
+
+    return fail
+
+
+def _identity(text: str) -> str:
+    return text
 
-def _scope_text(text: str, field: dict) -> str:
+
+def _text_scope(field: dict) -> Callable[[str], str]:
     anchors = _configured_text_options(field, "anchor", "anchors")
     if not anchors:
-        return text
-    candidates = [
-        (text.lower().find(anchor.lower()), -len(anchor), anchor)
-        for anchor in anchors
-        if text.lower().find(anchor.lower()) >= 0
-    ]
-    if not candidates:
-        raise ContractExtractionError(
-            f"anchor '{' | '.join(anchors)}' was not found",
-            code="missing_anchor",
-        )
-    position, _, anchor = min(candidates)
-    start = position + len(anchor)
-    return text[start:start + field.get("window", MAX_WINDOW)]
+        return _identity
+    lowered_anchors = [(anchor.lower(), len(anchor)) for anchor in anchors]
+    window = field.get("window", MAX_WINDOW)
+    description = " | ".join(anchors)
+
+    def scope(text: str) -> str:
+        lowered = text.lower()
+        best = None
+        for anchor, length in lowered_anchors:
+            position = lowered.find(anchor)
+            if position >= 0 and (best is None or (position, -length) < best):
+                best = (position, -length)
+        if best is None:
+            raise ContractExtractionError(f"anchor '{description}' was not found", code="missing_anchor")
+        start = best[0] - best[1]
+        return text[start:start + window]
+
+    return scope
 
 
 def _configured_text_options(field: dict, singular: str, plural: str) -> list[str]:
@@ -522,19 +711,35 @@ def _configured_text_options(field: dict, singular: str, plural: str) -> list[st
     return values
 
 
-def _normalize(text: str, normalizers: list[str]) -> str:
-    normalized = text
-    for operation in normalizers:
-        if operation == "normalize_apostrophe":
-            normalized = normalized.replace("’", "'")
-        elif operation == "collapse_whitespace":
-            normalized = " ".join(normalized.replace("\r\n", "\n").replace("\r", "\n").split())
-        elif operation == "lowercase":
-            normalized = normalized.lower()
-        elif operation == "strip_punctuation":
-            normalized = re.sub(r"[^\w\s-]", " ", normalized)
-            normalized = " ".join(normalized.split())
-    return normalized
+def _normalizer_chain(normalizers: list[str]) -> Callable[[str], str]:
+    operations = [_NORMALIZER_FUNCTIONS[name] for name in normalizers if name in _NORMALIZER_FUNCTIONS]
+    if not operations:
+        return _identity
+    if len(operations) == 1:
+        return operations[0]
+
+    def normalize(text: str) -> str:
+        for operation in operations:
+            text = operation(text)
+        return text
+
+    return normalize
+
+
+def _collapse_whitespace(text: str) -> str:
+    return " ".join(text.split())
+
+
+def _strip_punctuation(text: str) -> str:
+    return " ".join(_PUNCTUATION_RE.sub(" ", text).split())
+
+
+_NORMALIZER_FUNCTIONS = {
+    "normalize_apostrophe": lambda text: text.replace("’", "'"),
+    "collapse_whitespace": _collapse_whitespace,
+    "lowercase": str.lower,
+    "strip_punctuation": _strip_punctuation,
+}
 
 
 def _select_values(values: list, selector: Any, allow_empty: bool = False) -> Any:
@@ -572,6 +777,14 @@ def _resolve_value(spec: dict, values: dict[str, Any]) -> Any:
     return values[spec["field"]] if "field" in spec else spec["literal"]
 
 
+def _value_resolver(spec: dict) -> Callable[[dict], Any]:
+    if "field" in spec:
+        name = spec["field"]
+        return lambda values: values[name]
+    literal = spec["literal"]
+    return lambda values: literal
+
+
 def _apply_check(check: dict, left: Any, right: Any, values: dict[str, Any]) -> tuple[bool, Any, Any]:
     op = check["op"]
     if op == "equal":
@@ -1,12 +1,29 @@
+import asyncio
+import hashlib
+import json
+import locale
 import os
+import sys
 import math
 import shutil
 import subprocess
+import tempfile
 import time
 import threading # Needed for Event type hint if using Python < 3.9
+import queue
+import re
+import select
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, replace
 from typing import Callable, Optional # For type hinting callbacks/events
 import signal
 
+try:
+    import resource  # POSIX only; used for per-run CPU and memory limits
+except ImportError:
+    resource = None
+
 try:
     from tqdm import tqdm
     TQDM_AVAILABLE = True
@@ -29,13 +46,227 @@ except ImportError:
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from .utils import log
 from .utils import VERBOSITY_LEVEL
+from . import configuration
+from . import rusage_launcher
 from .configuration import vs_path  # Import vs_path from configuration
-from .compile_repair import CompileRepairResult, repair_compilation_failure
-from .semantic_grading import compare_output, get_question_checker_config
+from .async_execution import EXECUTION_ENGINES, AsyncExecutionPool
+from .compile_cache import CompileCache, compile_cache_dir
+from .compile_repair import CompileRepairResult, repair_compilation_failure, write_repair_report
+from .ground_truth_cache import (
+    ground_truth_cache_dir,
+    ground_truth_cache_key,
+    is_cacheable,
+    load_ground_truth,
+    store_ground_truth,
+    toolchain_identity,
+)
+from .submission_dedupe import group_submissions, write_duplicate_report
+from .run_metrics import (
+    METRICS_FOLDER_NAME,
+    build_student_metrics,
+    complexity_measurements,
+    run_outcome,
+    write_student_metrics,
+)
+from .run_manifest import grading_context, load_manifest, save_manifest, student_fingerprint, unchanged_students
+from .semantic_grading import ComparisonMemo, checker_config_snapshot, compile_checker, get_question_checker_config
 from .structural_analysis import StructuralCheckResult, analyze_source_file
+from .toolchain import Toolchain, get_toolchain
+from .complexity_analysis import (
+    ComplexityCheckResult,
+    ComplexityProfile,
+    DEFAULT_PROFILE_TIMEOUT,
+    complexity_profile_errors,
+    evaluate_complexity,
+    load_profile_inputs,
+    profile_config,
+)
 
 
 _ACTIVE_VS_ENV_PATH = None
+_ACTIVE_COMPILE_CACHE: "CompileCache | None" = None
+_ACTIVE_COMPARISON_MEMO: "ComparisonMemo | None" = None
+_ACTIVE_TOOLCHAIN: Toolchain = get_toolchain("msvc")
+# Scratch directory of the current grading run; executables and objects are
+# built there instead of next to the sources (None builds next to the sources).
+_ACTIVE_BUILD_DIR: "str | None" = None
+BUILD_DIR_PREFIX = "c_tester_build_"
+# Compiler start-up dominates for small single-file programs, so sources are
+# compiled in batches of up to this many per compiler invocation.
+COMPILE_BATCH_SIZE = 16
+MIN_COMPILE_BATCH_SIZE = 4
+REFERENCE_OUTPUT_FILENAME = "original_sol_output.txt"
+REFERENCE_FIELDS_FILENAME = "original_sol_fields.json"
+OUTPUT_LIMIT_EXCEEDED = "Output limit exceeded"
+_OUTPUT_LIMIT_BYTES = int(configuration.max_output_mb * 1024 * 1024)
+# With resource limits, timeouts are judged on CPU time; wall-clock only kills
+# runs that stall (e.g. blocked on input) after this multiple of the limit.
+WALL_CLOCK_SAFETY_FACTOR = 3
+_RESOURCE_LIMITS: "ResourceLimits | None" = None
+
+
+@dataclass(frozen=True)
+class ExecutionResult:
+    output: str
+    wall_time: float = 0.0
+    cpu_time: float | None = None
+    peak_rss_kb: int | None = None
+    exit_status: int | None = None
+    skipped: bool = False
+
+
+def measured_runtime(result: ExecutionResult) -> float:
+    """CPU time when runs are resource-limited, otherwise wall time."""
+    if _RESOURCE_LIMITS and result.cpu_time is not None:
+        return result.cpu_time
+    return result.wall_time
+
+
+@dataclass(frozen=True)
+class ResourceLimits:
+    memory_limit_mb: float = 0
+
+
+@dataclass(frozen=True)
+class ExecutionOptions:
+    timeout_multiplier: float = 10
+    timeout_floor: float = 0.5
+    timeout_ceiling: float = 5
+    max_consecutive_timeouts: int = 0
+    timeout_budget_seconds: float = 0
+    ground_truth_cache: bool = True
+    incremental: bool = False
+    deduplicate: bool = True
+    compile_cache: bool = True
+    compile_cache_max_mb: float = 512
+    max_workers: int = 0
+    execution_engine: str = "threads"
+    max_output_mb: float = 16
+    resource_limits: bool = False
+    memory_limit_mb: float = 0
+    toolchain: str = "msvc"
+    syntax_precheck: bool = True
+    build_root: str = ""
+    comparison_memo_size: int = 100000
+
+    @classmethod
+    def from_configuration(cls) -> "ExecutionOptions":
+        return cls(
+            timeout_multiplier=configuration.timeout_multiplier,
+            timeout_floor=configuration.timeout_floor,
+            timeout_ceiling=configuration.timeout_ceiling,
+            max_consecutive_timeouts=configuration.max_consecutive_timeouts,
+            timeout_budget_seconds=configuration.timeout_budget_seconds,
+            ground_truth_cache=configuration.ground_truth_cache_enabled,
+            incremental=configuration.incremental_grading,
+            deduplicate=configuration.deduplicate_submissions,
+            compile_cache=configuration.compile_cache_enabled,
+            compile_cache_max_mb=configuration.compile_cache_max_mb,
+            max_workers=configuration.max_workers,
+            execution_engine=configuration.execution_engine,
+            max_output_mb=configuration.max_output_mb,
+            resource_limits=configuration.resource_limits,
+            memory_limit_mb=configuration.memory_limit_mb,
+            toolchain=configuration.toolchain,
+            syntax_precheck=configuration.syntax_precheck,
+            build_root=configuration.build_root,
+            comparison_memo_size=configuration.comparison_memo_size,
+        )
+
+    def grading_settings(self) -> dict:
+        """Settings that can change a grade; cache, incremental and dedupe switches cannot."""
+        settings = asdict(self)
+        for key in ("ground_truth_cache", "incremental", "deduplicate", "compile_cache", "compile_cache_max_mb", "max_workers", "execution_engine", "syntax_precheck", "build_root", "comparison_memo_size"):
+            settings.pop(key)
+        return settings
+
+    def new_timeout_budget(self) -> "TimeoutBudget":
+        return TimeoutBudget(self.max_consecutive_timeouts, self.timeout_budget_seconds)
+
+    def timeout_for(self, reference_seconds: float) -> float:
+        """Return the student timeout for one input given the reference wall time."""
+        return min(self.timeout_ceiling, max(self.timeout_floor, reference_seconds * self.timeout_multiplier))
+
+    def describe_timeouts(self, timeout_limits: list) -> str:
+        limits_text = format_seconds(min(timeout_limits))
+        if max(timeout_limits) != min(timeout_limits):
+            limits_text += f"-{format_seconds(max(timeout_limits))}"
+        return (
+            f"{limits_text} ({self.timeout_multiplier:g}x reference runtime, "
+            f"min {format_seconds(self.timeout_floor)}, max {format_seconds(self.timeout_ceiling)})"
+        )
+
+
+def format_seconds(value):
+    return f"{round(value, 3):g}s"
+
+
+def format_bytes(value):
+    return f"{round(value / (1024 * 1024), 3):g} MB"
+
+
+class TimeoutBudget:
+    """Per-student fail-fast budget; once spent, the remaining inputs are marked Timeout without running.
+
+    A zero limit disables that rule. Runs may finish out of input order on the
+    shared pool, so "consecutive" counts timeouts in completion order.
+    """
+
+    def __init__(self, max_consecutive_timeouts=0, max_seconds=0):
+        self.max_consecutive_timeouts = max_consecutive_timeouts
+        self.max_seconds = max_seconds
+        self.consecutive_timeouts = 0
+        self.elapsed_seconds = 0.0
+        self.skipped_count = 0
+        self.reason = ""
+        self._lock = threading.Lock()
+
+    def exhausted(self) -> bool:
+        with self._lock:
+            return bool(self.reason)
+
+    def record(self, result: ExecutionResult):
+        with self._lock:
+            self.elapsed_seconds += measured_runtime(result)
+            if result.output == "Timeout":
+                self.consecutive_timeouts += 1
+            else:
+                self.consecutive_timeouts = 0
+            if self.reason:
+                return
+            if self.max_consecutive_timeouts and self.consecutive_timeouts >= self.max_consecutive_timeouts:
+                self.reason = f"{self.consecutive_timeouts} consecutive timeouts"
+            elif self.max_seconds and self.elapsed_seconds >= self.max_seconds:
+                self.reason = f"{format_seconds(self.elapsed_seconds)} total run time"
+
+    def record_skip(self):
+        with self._lock:
+            self.skipped_count += 1
+
+    def describe(self, total) -> str | None:
+        if not self.skipped_count:
+            return None
+        return f"{self.skipped_count}/{total} (after {self.reason})"
+
+
+def run_with_budget(executable, input_value, timeout, budget: TimeoutBudget) -> ExecutionResult:
+    """Run one input unless the student's timeout budget is already spent."""
+    if budget.exhausted():
+        budget.record_skip()
+        return ExecutionResult("Timeout", skipped=True)
+    result = execute_program(executable, input_value, timeout)
+    budget.record(result)
+    return result
+
+
+async def run_with_budget_async(executable, input_value, timeout, budget: TimeoutBudget) -> ExecutionResult:
+    """Asyncio-engine counterpart of run_with_budget."""
+    if budget.exhausted():
+        budget.record_skip()
+        return ExecutionResult("Timeout", skipped=True)
+    result = await execute_program_async(executable, input_value, timeout)
+    budget.record(result)
+    return result
 
 
 def setup_visual_studio_environment(vs_path_override=None):
@@ -65,6 +296,99 @@ def setup_visual_studio_environment(vs_path_override=None):
         return False
 
 
+def configure_toolchain(execution_options: "ExecutionOptions") -> Toolchain:
+    """Select the compiler backend compile_file and execute_program use."""
+    global _ACTIVE_TOOLCHAIN
+    if _ACTIVE_TOOLCHAIN.name != execution_options.toolchain:
+        _ACTIVE_TOOLCHAIN = get_toolchain(execution_options.toolchain)
+    return _ACTIVE_TOOLCHAIN
+
+
+def prepare_toolchain(execution_options: "ExecutionOptions", vs_path_override=None) -> bool:
+    """Select the toolchain and, for MSVC, load the Visual Studio environment."""
+    toolchain = configure_toolchain(execution_options)
+    if toolchain.uses_visual_studio:
+        return setup_visual_studio_environment(vs_path_override)
+    if not toolchain.is_available():
+        log(f"Compiler '{toolchain.compiler}' was not found on PATH.", "error")
+        return False
+    return True
+
+
+@contextmanager
+def run_build_directory(execution_options: "ExecutionOptions"):
+    """Build into one scratch directory for the duration of a run, then remove it in a single step."""
+    global _ACTIVE_BUILD_DIR
+    root = execution_options.build_root or None
+    if root:
+        os.makedirs(root, exist_ok=True)
+    build_dir = tempfile.mkdtemp(prefix=BUILD_DIR_PREFIX, dir=root)
+    previous = _ACTIVE_BUILD_DIR
+    _ACTIVE_BUILD_DIR = build_dir
+    log(f"Build directory: {build_dir}", "info", verbosity=2)
+    try:
+        yield build_dir
+    finally:
+        _ACTIVE_BUILD_DIR = previous
+        shutil.rmtree(build_dir, ignore_errors=True)
+        log(f"Removed build directory: {build_dir}", "success", verbosity=2)
+
+
+def build_path(c_file: str, toolchain: Toolchain | None = None) -> str:
+    """Return where `c_file`'s executable is built.
+
+    Inside a run, sources are grouped per source directory under the build
+    directory, so same-named files of different questions never share a path.
+    """
+    executable = (toolchain or _ACTIVE_TOOLCHAIN).executable_path(c_file)
+    build_dir = _ACTIVE_BUILD_DIR
+    if build_dir is None:
+        return executable
+    source_dir = os.path.dirname(os.path.abspath(c_file))
+    bucket = os.path.join(build_dir, hashlib.sha1(source_dir.encode("utf-8")).hexdigest()[:12])
+    os.makedirs(bucket, exist_ok=True)
+    return os.path.join(bucket, os.path.basename(executable))
+
+
+def configure_compile_cache(execution_options: "ExecutionOptions", question_folder: str):
+    """Select the executable cache compile_file uses, keeping the current one when settings are unchanged.
+
+    Like the ground-truth cache, it lives in the grading root that holds `question_folder`,
+    whatever the current directory is.
+    """
+    global _ACTIVE_COMPILE_CACHE
+    if not execution_options.compile_cache:
+        _ACTIVE_COMPILE_CACHE = None
+        return None
+    max_bytes = int(execution_options.compile_cache_max_mb * 1024 * 1024)
+    cache = CompileCache(compile_cache_dir(question_folder), max_bytes=max_bytes)
+    if (
+        _ACTIVE_COMPILE_CACHE is None
+        or _ACTIVE_COMPILE_CACHE.cache_dir != cache.cache_dir
+        or _ACTIVE_COMPILE_CACHE.max_bytes != max_bytes
+    ):
+        _ACTIVE_COMPILE_CACHE = cache
+    return _ACTIVE_COMPILE_CACHE
+
+
+@contextmanager
+def run_comparison_memo(execution_options: "ExecutionOptions"):
+    """Memoize comparisons for the duration of one run (yields None when disabled).
+
+    The memo is dropped when the run ends, so hits never carry over into a
+    later run or a rescore outside it.
+    """
+    global _ACTIVE_COMPARISON_MEMO
+    size = execution_options.comparison_memo_size
+    memo = ComparisonMemo(size) if size > 0 else None
+    previous = _ACTIVE_COMPARISON_MEMO
+    _ACTIVE_COMPARISON_MEMO = memo
+    try:
+        yield memo
+    finally:
+        _ACTIVE_COMPARISON_MEMO = previous
+
+
 def sanitize_input(input_value):
     return input_value.replace('"', '').replace("'", '').replace(";", '')
 
@@ -81,6 +405,12 @@ def read_inputs_from_file(folder_name):
         return []
 
 
+def write_output_cases(path, cases):
+    """Write (input, output) pairs in the Input:/Output: layout shared by student and reference outputs."""
+    with open(path, "w", encoding="utf-8") as output_file:
+        output_file.writelines(f"Input: {input_value}\nOutput: {output}\n\n" for input_value, output in cases)
+
+
 def ensure_output_folder(folder_name):
     output_folder = os.path.join(folder_name, "output")
     grade_folder = os.path.join(folder_name, "grade")
@@ -90,138 +420,788 @@ def ensure_output_folder(folder_name):
     return output_folder, grade_folder
 
 
+def compile_command(c_file, executable):
+    return _ACTIVE_TOOLCHAIN.compile_command(c_file, executable)
+
+
+def _compile_cache_key(compile_cache: CompileCache, toolchain: Toolchain, c_file: str) -> str | None:
+    return compile_cache.key(
+        c_file,
+        toolchain.compile_command("source.c", toolchain.executable_path("program.c")),
+        toolchain_identity(toolchain.banner_command()),
+    )
+
+
 def compile_file(c_file):
-    executable = c_file.replace(".c", ".exe")
-    compile_cmd = f'cl /TC /EHsc /MP /O2 /Fe"{executable}" "{c_file}"'
+    toolchain = _ACTIVE_TOOLCHAIN
+    executable = build_path(c_file, toolchain)
+    compile_cmd = toolchain.compile_command(c_file, executable)
+    compile_cache = _ACTIVE_COMPILE_CACHE
+    cache_key = None
+    if compile_cache:
+        cache_key = _compile_cache_key(compile_cache, toolchain, c_file)
+        if cache_key and compile_cache.restore(cache_key, executable):
+            log(f"Compilation cache hit: {c_file}", "success", verbosity=2)
+            return executable, None
     try:
         result = subprocess.run(compile_cmd, shell=True, capture_output=True, text=True)
     except OSError as exc:
-        return None, f"Could not start the Visual Studio compiler: {exc}"
+        return None, f"Could not start {toolchain.display_name}: {exc}"
     if result.returncode != 0:
         log(f"Compilation failed: {c_file}", "error", verbosity=1)
-        return None, result.stderr.strip() or result.stdout.strip() or f"cl exited with code {result.returncode}"
+        return None, result.stderr.strip() or result.stdout.strip() or f"{toolchain.compiler} exited with code {result.returncode}"
     log(f"Compilation successful: {c_file}", "success", verbosity=2)
+    if cache_key and os.path.isfile(executable):
+        compile_cache.store(cache_key, executable)
     return executable, None
 
 
-def parallel_compile_files(
-    c_files_dir: str,
-    c_files: list,
-    progress_callback: Optional[Callable[[int, int, str], None]] = None,
-    cancel_event: Optional[threading.Event] = None
-) -> tuple[dict, dict]:
-    compiled = {}
-    compile_errors = {}
-    total_files = len(c_files)
-    processed_count = 0
-    description = "Compiling files"
+def compile_batch_size(file_count: int, workers: int) -> int:
+    """Sources per compiler invocation: spread files over the workers, but skip batching when it saves little."""
+    size = min(COMPILE_BATCH_SIZE, file_count // max(1, workers))
+    return size if size >= MIN_COMPILE_BATCH_SIZE else 1
 
-    # Determine iterator: tqdm if no callback and available, else direct iteration
-    use_tqdm = TQDM_AVAILABLE and progress_callback is None
-    iterator_factory = tqdm if use_tqdm else lambda iterable, **kwargs: iterable
 
-    with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
-        future_map = { executor.submit(compile_file, os.path.join(c_files_dir, f)): f for f in c_files }
+def compile_batches(c_files: list, batch_size: int) -> list:
+    """Chunk `c_files` into batches that each share one source directory, keeping their order."""
+    by_directory = {}
+    for c_file in c_files:
+        by_directory.setdefault(os.path.dirname(c_file), []).append(c_file)
+    return [
+        files[start:start + batch_size]
+        for files in by_directory.values()
+        for start in range(0, len(files), batch_size)
+    ]
 
-        progress_iterator = iterator_factory(
-            as_completed(future_map),
-            total=total_files,
-            desc=description if use_tqdm else None,
-            unit="file",
-            bar_format="\033[94m{l_bar}{bar}{r_bar}\033[0m" if use_tqdm else None
-        )
 
-        for future in progress_iterator:
-            if cancel_event and cancel_event.is_set(): break
-            file = future_map[future]
-            try:
-                exe, error = future.result()
-                if exe:
-                    compiled[file] = exe
-                else:
-                    compile_errors[file] = error
-            except Exception as e:
-                log(f"Error getting compilation result for {file}: {e}", "error")
-                compile_errors[file] = str(e)
-            finally:
-                processed_count += 1
-                if progress_callback:
-                    progress_callback(processed_count, total_files, description)
-
-    # Log summary only if not cancelled
-    if not (cancel_event and cancel_event.is_set()):
-        success_count = len(compiled)
-        if success_count == 0 and total_files > 0:
-            log(f"No files Compiled successfully!", "error")
-        elif success_count != total_files:
-            log(f"Compiled {success_count}/{total_files} files successfully.", "warning")
+def split_diagnostics(output: str, source_names: list) -> tuple[dict, list]:
+    """Split compiler output by the source each line refers to.
+
+    Lines starting with `name(` (cl) or `name:` (gcc/clang) start a diagnostic for
+    that source; continuation lines (notes, carets) stay with the previous one.
+    Lines before any attributed diagnostic are returned separately.
+    """
+    per_source = {name: [] for name in source_names}
+    echoed = set(per_source) | {os.path.basename(name) for name in source_names}
+    shared = []
+    owner = None
+    for line in output.splitlines():
+        stripped = line.strip()
+        if not stripped:
+            continue
+        if stripped in echoed:
+            # cl /MP echoes each source name as it starts compiling it.
+            owner = None
+            continue
+        for name in source_names:
+            if stripped.startswith((f"{name}(", f"{name}:")):
+                owner = name
+                break
+        if owner:
+            per_source[owner].append(line.rstrip())
         else:
-            log(f"All {total_files} files compiled successfully.", "success")
+            shared.append(line.rstrip())
+    return per_source, shared
+
+
+def compile_files(c_files: list) -> dict:
+    """Compile sources from one directory with a single compiler invocation, then link each one.
+
+    Toolchains without `batches_compiles` (gcc/clang) compile each source with
+    compile_file instead.
+
+    Only the compile step is batched. Linking stays one invocation per source
+    because neither `cl` nor the gcc/clang driver can emit several executables
+    from one run, and students cannot share one executable (their global
+    symbols clash). The links run on the worker that compiled the batch:
+    batches already spread over every compile worker, so linking them in
+    parallel would only oversubscribe the pool.
+
+    Returns {c_file: (executable, error)} with the same per-file shape as
+    compile_file; diagnostics are split back to the source they belong to and
+    name it by the same path compile_file's would.
+    """
+    toolchain = _ACTIVE_TOOLCHAIN
+    if len(c_files) == 1 or not toolchain.batches_compiles:
+        return {c_file: compile_file(c_file) for c_file in c_files}
+    compile_cache = _ACTIVE_COMPILE_CACHE
+    results = {}
+    cache_keys = {}
+    pending = []
+    for c_file in c_files:
+        executable = build_path(c_file, toolchain)
+        if compile_cache:
+            cache_keys[c_file] = _compile_cache_key(compile_cache, toolchain, c_file)
+            if cache_keys[c_file] and compile_cache.restore(cache_keys[c_file], executable):
+                log(f"Compilation cache hit: {c_file}", "success", verbosity=2)
+                results[c_file] = (executable, None)
+                continue
+        pending.append(c_file)
+    if len(pending) <= 1:
+        results.update({c_file: compile_file(c_file) for c_file in pending})
+        return results
+
+    # Like compile_file, the compiler runs from the current directory on the paths
+    # as given, so diagnostics name sources identically; objects go to the build directory.
+    executables = {c_file: build_path(c_file, toolchain) for c_file in pending}
+    directory = os.path.dirname(executables[pending[0]]) or "."
+    objects = {
+        c_file: os.path.join(directory, os.path.splitext(os.path.basename(c_file))[0] + toolchain.object_suffix)
+        for c_file in pending
+    }
+    for object_file in objects.values():
+        if os.path.exists(object_file):
+            os.remove(object_file)
+    try:
+        result = subprocess.run(
+            toolchain.batch_compile_command(pending, directory),
+            shell=True,
+            capture_output=True,
+            text=True,
+        )
+    except OSError as exc:
+        error = f"Could not start {toolchain.display_name}: {exc}"
+        results.update({c_file: (None, error) for c_file in pending})
+        return results
+    diagnostics, shared = split_diagnostics(f"{result.stdout}\n{result.stderr}", pending)
+
+    for c_file in pending:
+        object_file = objects[c_file]
+        if not os.path.isfile(object_file):
+            log(f"Compilation failed: {c_file}", "error", verbosity=1)
+            error = "\n".join(diagnostics[c_file] or shared)
+            results[c_file] = (None, error or f"{toolchain.compiler} exited with code {result.returncode}")
+            continue
+        executable = executables[c_file]
+        try:
+            link = subprocess.run(
+                toolchain.link_command(os.path.basename(object_file), os.path.basename(executable)),
+                shell=True,
+                capture_output=True,
+                text=True,
+                cwd=directory,
+            )
+        except OSError as exc:
+            results[c_file] = (None, f"Could not start {toolchain.display_name}: {exc}")
+            continue
+        finally:
+            try:
+                os.remove(object_file)
+            except OSError:
+                pass
+        if link.returncode != 0:
+            log(f"Compilation failed: {c_file}", "error", verbosity=1)
+            results[c_file] = (
+                None,
+                link.stderr.strip() or link.stdout.strip() or f"{toolchain.compiler} exited with code {link.returncode}",
+            )
+            continue
+        log(f"Compilation successful: {c_file}", "success", verbosity=2)
+        if cache_keys.get(c_file) and os.path.isfile(executable):
+            compile_cache.store(cache_keys[c_file], executable)
+        results[c_file] = (executable, None)
+    return results
+
 
-    return compiled, compile_errors
+# "x.c(3): error C2143: ..." (cl) and "x.c:3:5: error: ..." (gcc/clang), including fatal errors.
+SYNTAX_ERROR_PATTERN = re.compile(r"(?:^|[\s:])(?:fatal )?error(?: [A-Z]+\d+)?:")
+
+
+def syntax_check_files(c_files: list) -> dict:
+    """Syntax-only pass over sources of one directory; returns {c_file: error text or None}.
+
+    Only sources with an error diagnostic of their own fail. When the checker
+    cannot run or its output cannot be attributed, every source passes and the
+    optimized compile decides.
+    """
+    toolchain = _ACTIVE_TOOLCHAIN
+    directory = os.path.dirname(c_files[0]) or "."
+    names = [os.path.basename(c_file) for c_file in c_files]
+    try:
+        result = subprocess.run(
+            toolchain.syntax_check_command(names),
+            shell=True,
+            capture_output=True,
+            text=True,
+            cwd=directory,
+        )
+    except OSError as exc:
+        log(f"Syntax precheck could not start {toolchain.display_name}: {exc}", "warning", verbosity=2)
+        return {c_file: None for c_file in c_files}
+    if result.returncode == 0:
+        return {c_file: None for c_file in c_files}
+    diagnostics, _ = split_diagnostics(f"{result.stdout}\n{result.stderr}", names)
+    return {
+        c_file: "\n".join(diagnostics[name])
+        if any(SYNTAX_ERROR_PATTERN.search(line) for line in diagnostics[name])
+        else None
+        for c_file, name in zip(c_files, names)
+    }
 
 
 def run_executable(executable, input_value, timeout=5):
     """Run an executable with the given input and timeout (in seconds)."""
+    return execute_program(executable, input_value, timeout).output
+
+
+class OutputLimitExceeded(Exception):
+    """Raised when a child writes more than the configured output cap."""
+
+
+def configure_output_limit(execution_options: "ExecutionOptions"):
+    """Set the stdout/stderr byte cap execute_program enforces (0 disables it)."""
+    global _OUTPUT_LIMIT_BYTES
+    _OUTPUT_LIMIT_BYTES = int(execution_options.max_output_mb * 1024 * 1024)
+    return _OUTPUT_LIMIT_BYTES
+
+
+def configure_resource_limits(execution_options: "ExecutionOptions"):
+    """Enable the CPU-time/address-space backend for execute_program (POSIX only)."""
+    global _RESOURCE_LIMITS
+    if execution_options.resource_limits and resource is None:
+        log("Resource limits need a POSIX system; using wall-clock timeouts.", "warning", verbosity=1)
+    enabled = execution_options.resource_limits and resource is not None
+    _RESOURCE_LIMITS = ResourceLimits(execution_options.memory_limit_mb) if enabled else None
+    return _RESOURCE_LIMITS
+
+
+def _rlimit_values(limits: ResourceLimits, timeout):
+    # RLIMIT_CPU has one-second granularity, so it is only the hard stop for
+    # runaway loops; the verdict compares the measured CPU time with `timeout`.
+    return max(1, math.ceil(timeout)), int(limits.memory_limit_mb * 1024 * 1024)
+
+
+def _resource_limit_popen_kwargs(limits: ResourceLimits, timeout) -> dict:
+    # Only used when the rusage launcher (which applies the limits itself) is unavailable.
+    cpu_seconds, memory_bytes = _rlimit_values(limits, timeout)
+
+    def apply_limits():
+        resource.setrlimit(resource.RLIMIT_CPU, (cpu_seconds, cpu_seconds + 1))
+        if memory_bytes:
+            resource.setrlimit(resource.RLIMIT_AS, (memory_bytes, memory_bytes))
+
+    # A new session lets a stalled run be killed together with anything it forked.
+    return {"preexec_fn": apply_limits, "start_new_session": True}
+
+
+def _exceeded_cpu_limit(returncode, cpu_time, timeout) -> bool:
+    return returncode == -signal.SIGXCPU or (cpu_time is not None and cpu_time > timeout)
+
+
+def _kill_session(process):
+    try:
+        os.killpg(process.pid, signal.SIGKILL)
+    except OSError:
+        pass
+
+
+def _windows_process_metrics(process):
+    """Return (cpu_time, peak_rss_kb) of an exited child from its still-open process handle."""
+    import ctypes
+    from ctypes import wintypes
+
+    class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+        _fields_ = [
+            ("cb", wintypes.DWORD),
+            ("PageFaultCount", wintypes.DWORD),
+            ("PeakWorkingSetSize", ctypes.c_size_t),
+            ("WorkingSetSize", ctypes.c_size_t),
+            ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+            ("PagefileUsage", ctypes.c_size_t),
+            ("PeakPagefileUsage", ctypes.c_size_t),
+        ]
+
+    kernel32 = ctypes.windll.kernel32
+    # Popen keeps the handle open until the object is collected, so it is valid after wait().
+    handle = wintypes.HANDLE(int(process._handle))
+    creation, exited, kernel, user = (wintypes.FILETIME() for _ in range(4))
+    cpu_time = None
+    if kernel32.GetProcessTimes(handle, ctypes.byref(creation), ctypes.byref(exited), ctypes.byref(kernel), ctypes.byref(user)):
+        # FILETIME counts 100 ns intervals.
+        ticks = sum((time_value.dwHighDateTime << 32) | time_value.dwLowDateTime for time_value in (kernel, user))
+        cpu_time = ticks / 10_000_000
+    counters = PROCESS_MEMORY_COUNTERS()
+    counters.cb = ctypes.sizeof(counters)
+    peak_rss_kb = None
+    if kernel32.K32GetProcessMemoryInfo(handle, ctypes.byref(counters), counters.cb):
+        peak_rss_kb = counters.PeakWorkingSetSize // 1024
+    return cpu_time, peak_rss_kb
+
+
+def _windows_metrics_or_none(process):
+    try:
+        return _windows_process_metrics(process)
+    except Exception:
+        return None, None
+
+
+def _spawn_posix(executable_path, timeout, limits):
+    """Start a POSIX child under the rusage launcher; returns (process, report_fd).
+
+    Without a launcher the program is started directly and report_fd is None,
+    so its CPU time and peak RSS go unrecorded.
+    """
+    streams = {
+        "stdin": subprocess.PIPE,
+        "stdout": subprocess.PIPE,
+        "stderr": subprocess.PIPE,
+        "cwd": os.path.dirname(executable_path) or None,
+    }
+    launcher = rusage_launcher.launcher_path()
+    if launcher is None:
+        kwargs = _resource_limit_popen_kwargs(limits, timeout) if limits else _ACTIVE_TOOLCHAIN.popen_kwargs()
+        return subprocess.Popen([executable_path], **streams, **kwargs), None
+    cpu_seconds, memory_bytes = _rlimit_values(limits, timeout) if limits else (0, 0)
+    report_fd, write_fd = os.pipe()
     try:
-        # Absolute argv avoids WinError 2 when worker threads have a different cwd
-        # or when Windows treats a relative path as a bare command name.
-        executable_path = os.path.abspath(executable)
-        if not os.path.isfile(executable_path):
-            return f"Error: executable not found: {executable_path}"
         process = subprocess.Popen(
-            [executable_path],
-            stdin=subprocess.PIPE,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-            cwd=os.path.dirname(executable_path) or None,
-            creationflags=subprocess.CREATE_NEW_PROCESS_GROUP  # Windows-specific: create new process group
+            rusage_launcher.launch_command(launcher, write_fd, executable_path, cpu_seconds, memory_bytes),
+            pass_fds=(write_fd,),
+            # Own session, so a stalled run can be killed together with anything it forked.
+            start_new_session=True,
+            **streams,
         )
-        
-        # Send input and get output with timeout
+    except BaseException:
+        os.close(report_fd)
+        raise
+    finally:
+        os.close(write_fd)
+    return process, report_fd
+
+
+def _stop_posix(process, report_fd):
+    if report_fd is None:
+        _kill_session(process)
+        return
+    try:
+        # The launcher answers SIGTERM by killing the program's process group; it still reports.
+        os.kill(process.pid, signal.SIGTERM)
+    except OSError:
+        pass
+
+
+def _read_report(report_fd) -> bytes:
+    report = b""
+    while chunk := os.read(report_fd, 256):
+        report += chunk
+    return report
+
+
+def _await_report(process, report_fd, timeout) -> bytes:
+    """Block until the child exits and return the launcher's report; raises subprocess.TimeoutExpired."""
+    if report_fd is None:
+        process.wait(timeout=timeout)
+        return b""
+    poller = select.poll()
+    poller.register(report_fd, select.POLLIN)
+    if not poller.poll(timeout * 1000):
+        raise subprocess.TimeoutExpired(process.args, timeout)
+    report = _read_report(report_fd)
+    # The launcher exits right after closing the report, so this does not wait.
+    process.wait()
+    return report
+
+
+def _kill_and_report(process, report_fd) -> bytes:
+    _stop_posix(process, report_fd)
+    try:
+        return _await_report(process, report_fd, 5)
+    except subprocess.TimeoutExpired:
+        _kill_session(process)
+        process.wait()
+        return b""
+
+
+def _execution_verdict(outcome, stdout, stderr, metrics, timeout, limits) -> ExecutionResult:
+    """Turn a finished run into its ExecutionResult; `metrics` is (wall, cpu, peak RSS, exit status)."""
+    _, cpu_time, _, returncode = metrics
+    if outcome == OUTPUT_LIMIT_EXCEEDED:
+        log(f"Output limit of {format_bytes(_OUTPUT_LIMIT_BYTES)} exceeded", "warning")
+        return ExecutionResult(OUTPUT_LIMIT_EXCEEDED, *metrics)
+    if outcome or (limits and _exceeded_cpu_limit(returncode, cpu_time, timeout)):
+        log(f"Timeout after {format_seconds(timeout)}{' CPU time' if limits else ''}", "warning")
+        return ExecutionResult("Timeout", *metrics)
+    if returncode != 0:
+        return ExecutionResult(f"Runtime Error: {_decode_output(stderr).strip()}", *metrics)
+    return ExecutionResult(_decode_output(stdout).strip(), *metrics)
+
+
+def _execute_posix(executable_path, input_value, timeout, limits) -> ExecutionResult:
+    """POSIX backend: the launcher's single wait4 gives the child's own CPU time and peak RSS.
+
+    With `limits`, CPU-time and address-space rlimits apply, timeouts are judged
+    on CPU time, and the wall clock only stops runs that stall.
+    """
+    started = time.perf_counter()
+    process, report_fd = _spawn_posix(executable_path, timeout, limits)
+    capture = _BoundedCapture(process, _encode_input(input_value), _OUTPUT_LIMIT_BYTES)
+    wall_limit = timeout * WALL_CLOCK_SAFETY_FACTOR if limits else timeout
+    outcome = None
+    try:
+        try:
+            capture.wait_for_streams(wall_limit)
+            report = _await_report(process, report_fd, max(0, wall_limit - (time.perf_counter() - started)))
+        except subprocess.TimeoutExpired:
+            outcome = "Timeout"
+        except OutputLimitExceeded:
+            outcome = OUTPUT_LIMIT_EXCEEDED
+        wall_time = time.perf_counter() - started
+        if outcome:
+            report = _kill_and_report(process, report_fd)
+    finally:
+        if report_fd is not None:
+            os.close(report_fd)
+        capture.close()
+    cpu_time, peak_rss_kb = rusage_launcher.parse_report(report)
+    metrics = (wall_time, cpu_time, peak_rss_kb, process.returncode)
+    return _execution_verdict(outcome, capture.stdout, capture.stderr, metrics, timeout, limits)
+
+
+def _execute_windows(executable_path, input_value, timeout) -> ExecutionResult:
+    toolchain = _ACTIVE_TOOLCHAIN
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [executable_path],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        cwd=os.path.dirname(executable_path) or None,
+        # Own process group, so a timeout stops the whole run.
+        **toolchain.popen_kwargs(),
+    )
+    capture = _BoundedCapture(process, _encode_input(input_value), _OUTPUT_LIMIT_BYTES)
+    outcome = None
+    try:
         try:
-            payload = str(input_value)
-            if payload and not payload.endswith("\n"):
-                payload += "\n"
-            stdout, stderr = process.communicate(input=payload, timeout=timeout)
-            if process.returncode != 0:
-                return f"Runtime Error: {stderr.strip()}"
-            return stdout.strip()
+            capture.wait(timeout)
         except subprocess.TimeoutExpired:
-            # On Windows, we need to be more aggressive with process termination
+            outcome = "Timeout"
+        except OutputLimitExceeded:
+            outcome = OUTPUT_LIMIT_EXCEEDED
+        wall_time = time.perf_counter() - started
+        if outcome == "Timeout":
+            toolchain.terminate(process)
+        elif outcome:
+            toolchain.kill(process)
+        if outcome:
             try:
-                # First try CTRL+BREAK to the process group
-                process.send_signal(signal.CTRL_BREAK_EVENT)
-                time.sleep(0.1)  # Give it a moment to handle the signal
-                
-                # If still running, terminate
-                if process.poll() is None:
-                    process.terminate()
-                    time.sleep(0.1)  # Give it a moment to terminate
-                
-                # If STILL running, kill it forcefully
-                if process.poll() is None:
-                    process.kill()
-                
-                # Clean up any remaining pipes
-                try:
-                    process.communicate(timeout=0.1)
-                except:
-                    pass
-            except:
-                # If any of the termination attempts fail, ensure the process is killed
-                try:
-                    process.kill()
-                except:
-                    pass
-            
-            timeout_msg = f"Timeout after {timeout}s"
-        log(timeout_msg, "warning")
-        return "Timeout"
+                process.wait(timeout=1)
+            except subprocess.TimeoutExpired:
+                toolchain.kill(process)
+    finally:
+        # The helper threads see EOF once the child is gone.
+        capture.close()
+    metrics = (wall_time, *_windows_metrics_or_none(process), process.returncode)
+    return _execution_verdict(outcome, capture.stdout, capture.stderr, metrics, timeout, None)
+
+
+def _encode_input(input_value) -> bytes:
+    payload = str(input_value)
+    if payload and not payload.endswith("\n"):
+        payload += "\n"
+    return payload.encode(locale.getpreferredencoding(False))
+
+
+def _decode_output(data: bytes) -> str:
+    # Match subprocess text mode: locale encoding and universal newlines.
+    text = data.decode(locale.getpreferredencoding(False), errors="replace")
+    return text.replace("\r\n", "\n").replace("\r", "\n")
+
+
+class _BoundedCapture:
+    """Feed stdin and drain stdout/stderr on helper threads, keeping at most `limit` bytes per stream."""
+
+    def __init__(self, process, payload: bytes, limit: int):
+        self.process = process
+        self.limit = limit
+        self.stdout = bytearray()
+        self.stderr = bytearray()
+        self.limit_hit = False
+        self._done = threading.Event()
+        self._open_streams = 2
+        self._lock = threading.Lock()
+        self._threads = [
+            threading.Thread(target=self._feed, args=(payload,), daemon=True),
+            threading.Thread(target=self._drain, args=(process.stdout, self.stdout), daemon=True),
+            threading.Thread(target=self._drain, args=(process.stderr, self.stderr), daemon=True),
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def _feed(self, payload):
+        try:
+            self.process.stdin.write(payload)
+            self.process.stdin.close()
+        except (BrokenPipeError, OSError, ValueError):
+            # The child exited (or was killed) without reading all of its input.
+            pass
+
+    def _drain(self, stream, buffer):
+        try:
+            while True:
+                chunk = stream.read1(64 * 1024)
+                if not chunk:
+                    break
+                if self.limit and len(buffer) + len(chunk) > self.limit:
+                    self.limit_hit = True
+                    break
+                buffer.extend(chunk)
+        except (OSError, ValueError):
+            pass
+        finally:
+            with self._lock:
+                self._open_streams -= 1
+                # Either both pipes are at EOF or one overflowed; the caller decides what happens next.
+                if self._open_streams == 0 or self.limit_hit:
+                    self._done.set()
+
+    def wait_for_streams(self, timeout):
+        """Wait until both pipes close; raises OutputLimitExceeded or subprocess.TimeoutExpired."""
+        if not self._done.wait(timeout):
+            raise subprocess.TimeoutExpired(self.process.args, timeout)
+        if self.limit_hit:
+            raise OutputLimitExceeded()
+
+    def wait(self, timeout):
+        """Return (stdout, stderr) bytes; raises OutputLimitExceeded or subprocess.TimeoutExpired."""
+        deadline = time.monotonic() + timeout
+        self.wait_for_streams(timeout)
+        self.process.wait(timeout=max(0, deadline - time.monotonic()))
+        return bytes(self.stdout), bytes(self.stderr)
+
+    def close(self):
+        for thread in self._threads:
+            thread.join(timeout=1)
+        for stream in (self.process.stdout, self.process.stderr):
+            try:
+                stream.close()
+            except OSError:
+                pass
+
+
+def execute_program(executable, input_value, timeout=5) -> ExecutionResult:
+    """Run an executable and return its output with wall time, CPU time, peak RSS and exit status.
+
+    Output is read incrementally; a child that writes more than the configured
+    cap is killed and reported as "Output limit exceeded". Killed runs keep
+    their metrics.
+    """
+    try:
+        # Absolute argv avoids WinError 2 when worker threads have a different cwd
+        # or when Windows treats a relative path as a bare command name.
+        executable_path = os.path.abspath(executable)
+        if not os.path.isfile(executable_path):
+            return ExecutionResult(f"Error: executable not found: {executable_path}")
+        if os.name == "posix":
+            return _execute_posix(executable_path, input_value, timeout, _RESOURCE_LIMITS)
+        return _execute_windows(executable_path, input_value, timeout)
     except Exception as e:
         log(f"Error running {executable}: {str(e)}", "error")
-        return f"Error: {str(e)}"
+        return ExecutionResult(f"Error: {str(e)}")
+
+
+async def _read_bounded(stream, limit: int) -> bytes:
+    buffer = bytearray()
+    while True:
+        chunk = await stream.read(64 * 1024)
+        if not chunk:
+            return bytes(buffer)
+        if limit and len(buffer) + len(chunk) > limit:
+            raise OutputLimitExceeded()
+        buffer.extend(chunk)
+
+
+async def _feed_stdin(stream, payload: bytes):
+    try:
+        stream.write(payload)
+        await stream.drain()
+        stream.close()
+    except (BrokenPipeError, ConnectionResetError):
+        pass
+
+
+async def execute_program_async(executable, input_value, timeout=5) -> ExecutionResult:
+    """Asyncio counterpart of execute_program: same verdicts and metrics, but waiting costs no thread.
+
+    On POSIX the child is reaped with wait4 from the event loop, so CPU-time
+    verdicts, CPU time and peak RSS match execute_program; on Windows they come
+    from the process handle.
+    """
+    executable_path = os.path.abspath(executable)
+    if not os.path.isfile(executable_path):
+        return ExecutionResult(f"Error: executable not found: {executable_path}")
+    if os.name == "posix":
+        return await _execute_posix_async(executable_path, input_value, timeout, _RESOURCE_LIMITS)
+    return await _execute_windows_async(executable_path, input_value, timeout)
+
+
+async def _execute_posix_async(executable_path, input_value, timeout, limits) -> ExecutionResult:
+    # The child's pipes and the launcher's report pipe are attached to the loop,
+    # so waiting for the run costs no thread.
+    loop = asyncio.get_running_loop()
+    started = time.perf_counter()
+    try:
+        process, report_fd = _spawn_posix(executable_path, timeout, limits)
+    except Exception as e:
+        log(f"Error running {executable_path}: {str(e)}", "error")
+        return ExecutionResult(f"Error: {str(e)}")
+
+    transports = []
+
+    async def communicate():
+        stdin = await _pipe_writer(loop, process.stdin, transports)
+        stdout = await _pipe_reader(loop, process.stdout, transports)
+        stderr = await _pipe_reader(loop, process.stderr, transports)
+        tasks = [
+            asyncio.ensure_future(_read_bounded(stdout, _OUTPUT_LIMIT_BYTES)),
+            asyncio.ensure_future(_read_bounded(stderr, _OUTPUT_LIMIT_BYTES)),
+            asyncio.ensure_future(_feed_stdin(stdin, _encode_input(input_value))),
+        ]
+        try:
+            stdout_bytes, stderr_bytes, _ = await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+        return stdout_bytes, stderr_bytes
+
+    wall_limit = timeout * WALL_CLOCK_SAFETY_FACTOR if limits else timeout
+    stdout = stderr = b""
+    outcome = None
+    try:
+        try:
+            stdout, stderr = await asyncio.wait_for(communicate(), wall_limit)
+            remaining = max(0, wall_limit - (time.perf_counter() - started))
+            report = await _await_report_async(process, report_fd, remaining)
+        except (asyncio.TimeoutError, subprocess.TimeoutExpired):
+            outcome = "Timeout"
+        except OutputLimitExceeded:
+            outcome = OUTPUT_LIMIT_EXCEEDED
+        wall_time = time.perf_counter() - started
+        if outcome:
+            report = await _kill_and_report_async(process, report_fd)
+    except asyncio.CancelledError:
+        await _kill_and_report_async(process, report_fd)
+        raise
+    finally:
+        for transport in transports:
+            transport.close()
+        if report_fd is not None:
+            os.close(report_fd)
+    cpu_time, peak_rss_kb = rusage_launcher.parse_report(report)
+    metrics = (wall_time, cpu_time, peak_rss_kb, process.returncode)
+    return _execution_verdict(outcome, stdout, stderr, metrics, timeout, limits)
+
+
+async def _await_report_async(process, report_fd, timeout) -> bytes:
+    """Event-loop version of _await_report: the loop watches the report pipe."""
+    loop = asyncio.get_running_loop()
+    if report_fd is None:
+        await loop.run_in_executor(None, process.wait, timeout)
+        return b""
+    ready = loop.create_future()
+    loop.add_reader(report_fd, lambda: ready.done() or ready.set_result(None))
+    try:
+        await asyncio.wait_for(ready, timeout)
+    except asyncio.TimeoutError:
+        raise subprocess.TimeoutExpired(process.args, timeout) from None
+    finally:
+        loop.remove_reader(report_fd)
+    report = _read_report(report_fd)
+    # The launcher exits right after closing the report, so this does not block the loop.
+    process.wait()
+    return report
+
+
+async def _kill_and_report_async(process, report_fd) -> bytes:
+    _stop_posix(process, report_fd)
+    try:
+        return await _await_report_async(process, report_fd, 5)
+    except subprocess.TimeoutExpired:
+        _kill_session(process)
+        process.wait()
+        return b""
+
+
+async def _pipe_reader(loop, pipe, transports) -> asyncio.StreamReader:
+    reader = asyncio.StreamReader(loop=loop)
+    transport, _ = await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader, loop=loop), pipe)
+    transports.append(transport)
+    return reader
+
+
+async def _pipe_writer(loop, pipe, transports) -> asyncio.StreamWriter:
+    transport, protocol = await loop.connect_write_pipe(
+        lambda: asyncio.StreamReaderProtocol(asyncio.StreamReader(loop=loop), loop=loop),
+        pipe,
+    )
+    transports.append(transport)
+    return asyncio.StreamWriter(transport, protocol, None, loop)
+
+
+async def _execute_windows_async(executable_path, input_value, timeout) -> ExecutionResult:
+    started = time.perf_counter()
+    try:
+        process = await asyncio.create_subprocess_exec(
+            executable_path,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            cwd=os.path.dirname(executable_path) or None,
+            **_ACTIVE_TOOLCHAIN.popen_kwargs(),
+        )
+    except Exception as e:
+        log(f"Error running {executable_path}: {str(e)}", "error")
+        return ExecutionResult(f"Error: {str(e)}")
+
+    async def communicate():
+        tasks = [
+            asyncio.ensure_future(_read_bounded(process.stdout, _OUTPUT_LIMIT_BYTES)),
+            asyncio.ensure_future(_read_bounded(process.stderr, _OUTPUT_LIMIT_BYTES)),
+            asyncio.ensure_future(_feed_stdin(process.stdin, _encode_input(input_value))),
+        ]
+        try:
+            stdout, stderr, _ = await asyncio.gather(*tasks)
+        except BaseException:
+            # Stop the other pipe readers so _kill_process can drain the pipes.
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+        await process.wait()
+        return stdout, stderr
+
+    stdout = stderr = b""
+    outcome = None
+    try:
+        stdout, stderr = await asyncio.wait_for(communicate(), timeout)
+    except asyncio.TimeoutError:
+        outcome = "Timeout"
+    except OutputLimitExceeded:
+        outcome = OUTPUT_LIMIT_EXCEEDED
+    except asyncio.CancelledError:
+        await _kill_process(process)
+        raise
+    wall_time = time.perf_counter() - started
+    if outcome:
+        await _kill_process(process)
+    # The transport's Popen keeps the process handle open after the exit.
+    metrics = (wall_time, *_windows_metrics_or_none(process._transport.get_extra_info("subprocess")), process.returncode)
+    return _execution_verdict(outcome, stdout, stderr, metrics, timeout, None)
+
+
+async def _kill_process(process):
+    # Both launch paths give the child its own process group or session.
+    _ACTIVE_TOOLCHAIN.kill(process)
+    try:
+        # Draining (not just waiting) lets the transport see EOF and close its pipes.
+        await asyncio.wait_for(process.communicate(), 1)
+    except (asyncio.TimeoutError, OSError, RuntimeError):
+        pass
 
 
 def get_ground_truth(
@@ -230,35 +1210,104 @@ def get_ground_truth(
     progress_callback: Optional[Callable[[int, int, str], None]] = None,
     cancel_event: Optional[threading.Event] = None
 ) -> list:
+    ground_truth, _ = generate_ground_truth(folder_name, inputs, progress_callback, cancel_event)
+    return ground_truth
+
+
+def generate_ground_truth(
+    folder_name: str,
+    inputs: list,
+    progress_callback: Optional[Callable[[int, int, str], None]] = None,
+    cancel_event: Optional[threading.Event] = None,
+    timeout: float = 5,
+    use_cache: bool = False,
+    workers: Optional["WorkerPools"] = None,
+) -> tuple[list, list]:
+    """Return the reference (input, output) pairs and the reference wall time per input.
+
+    Inputs run in parallel on the shared execution pool (or a private one when
+    `workers` is not given); results keep the order of `inputs`. On cancellation
+    only the leading inputs that finished are returned.
+
+    With `use_cache`, results are reused from the on-disk ground-truth cache when
+    the solution, inputs, compile command, toolchain, timeout and execution
+    limits are unchanged.
+    """
     original_sol = os.path.join(folder_name, "original_sol.c")
+    cache_dir = cache_key = None
+    if use_cache:
+        cache_dir = ground_truth_cache_dir(folder_name)
+        cache_key = ground_truth_cache_key(
+            original_sol,
+            inputs,
+            compile_command("original_sol.c", _ACTIVE_TOOLCHAIN.executable_path("original_sol.c")),
+            toolchain_identity(_ACTIVE_TOOLCHAIN.banner_command()),
+            timeout,
+            resource_limits=_RESOURCE_LIMITS is not None,
+            memory_limit_mb=_RESOURCE_LIMITS.memory_limit_mb if _RESOURCE_LIMITS else 0,
+            max_output_bytes=_OUTPUT_LIMIT_BYTES,
+        )
+        cached = load_ground_truth(cache_dir, cache_key) if cache_key else None
+        if cached:
+            log(f"Reusing cached ground truth for {folder_name} ({cache_key[:12]})", "success")
+            if progress_callback:
+                progress_callback(len(inputs), len(inputs), f"Processing original_sol in {folder_name}")
+            return cached.ground_truth, cached.runtimes
+
     executable, compile_error = compile_file(original_sol)
     if compile_error:
         log(f"Ground truth compilation failed: {compile_error}", "error")
-        return []
+        return [], []
 
-    ground_truth = []
     total_inputs = len(inputs)
     processed_count = 0
     description = f"Processing original_sol in {folder_name}"
-
-    use_tqdm = TQDM_AVAILABLE and progress_callback is None
-    iterator_factory = tqdm if use_tqdm else lambda iterable, **kwargs: iterable
-
-    progress_iterator = iterator_factory(
-        inputs,
+    progress_bar = tqdm(
         total=total_inputs,
-        desc=description if use_tqdm else None,
+        desc=description,
         unit="input",
-        bar_format="\033[94m{l_bar}{bar}{r_bar}\033[0m" if use_tqdm else None
-    )
+        bar_format="\033[94m{l_bar}{bar}{r_bar}\033[0m",
+    ) if TQDM_AVAILABLE and progress_callback is None else None
+
+    def run_reference(input_value):
+        if cancel_event and cancel_event.is_set():
+            return None
+        return execute_program(executable, input_value, timeout=timeout)
 
-    for input_value in progress_iterator:
-        if cancel_event and cancel_event.is_set(): break
-        output = run_executable(executable, input_value, timeout=5)  # Use same timeout as student solutions
-        ground_truth.append((input_value, output))
-        processed_count += 1
-        if progress_callback:
-            progress_callback(processed_count, total_inputs, description)
+    async def run_reference_async(input_value):
+        if cancel_event and cancel_event.is_set():
+            return None
+        return await execute_program_async(executable, input_value, timeout=timeout)
+
+    results = [None] * total_inputs
+    pool = workers.execute if workers else ThreadPoolExecutor(max_workers=os.cpu_count() or 1)
+    run = run_reference_async if workers and workers.engine == "asyncio" else run_reference
+    future_map = {pool.submit(run, input_value): index for index, input_value in enumerate(inputs)}
+    try:
+        for future in as_completed(future_map):
+            results[future_map[future]] = future.result()
+            processed_count += 1
+            if progress_bar:
+                progress_bar.update(1)
+            if progress_callback:
+                progress_callback(processed_count, total_inputs, description)
+            if cancel_event and cancel_event.is_set():
+                break
+    finally:
+        for future in future_map:
+            future.cancel()
+        if not workers:
+            pool.shutdown(wait=True)
+        if progress_bar:
+            progress_bar.close()
+
+    ground_truth = []
+    runtimes = []
+    for input_value, result in zip(inputs, results):
+        if result is None:
+            break
+        ground_truth.append((input_value, result.output))
+        runtimes.append(measured_runtime(result))
 
     if executable and os.path.exists(executable):
         try:
@@ -266,7 +1315,86 @@ def get_ground_truth(
         except Exception as e:
             log(f"Error removing ground truth executable {executable}: {e}", "warning")
 
-    return ground_truth
+    if cache_key and not (cancel_event and cancel_event.is_set()) and is_cacheable(ground_truth, total_inputs):
+        if store_ground_truth(cache_dir, cache_key, ground_truth, runtimes):
+            log(f"Cached ground truth for {folder_name} ({cache_key[:12]})", "info", verbosity=2)
+
+    return ground_truth, runtimes
+
+
+def measure_profile(executable, profile: ComplexityProfile) -> list:
+    """Best-of-`repeats` runtime per profile input; stops with a trailing None at the first unclean run."""
+    times = []
+    for input_value in profile.inputs:
+        best = None
+        for _ in range(profile.repeats):
+            result = execute_program(executable, input_value, timeout=profile.timeout)
+            if run_outcome(result) != "ok":
+                return times + [None]
+            runtime = measured_runtime(result)
+            best = runtime if best is None else min(best, runtime)
+        times.append(best)
+    return times
+
+
+async def measure_profile_async(executable, profile: ComplexityProfile) -> list:
+    times = []
+    for input_value in profile.inputs:
+        best = None
+        for _ in range(profile.repeats):
+            result = await execute_program_async(executable, input_value, timeout=profile.timeout)
+            if run_outcome(result) != "ok":
+                return times + [None]
+            runtime = measured_runtime(result)
+            best = runtime if best is None else min(best, runtime)
+        times.append(best)
+    return times
+
+
+def prepare_complexity_profile(folder_name: str, checker_config: dict | None) -> ComplexityProfile | None:
+    """Load the question's profile inputs and time original_sol on them; None disables profiling."""
+    config = profile_config(checker_config)
+    if config is None:
+        return None
+    errors = complexity_profile_errors(checker_config)
+    if errors:
+        log(f"Complexity profiling disabled for {folder_name}: {' '.join(errors)}", "warning")
+        return None
+    try:
+        sizes, inputs = load_profile_inputs(folder_name, config)
+    except OSError as e:
+        log(f"Complexity profiling disabled for {folder_name}: {e}", "warning")
+        return None
+
+    executable, compile_error = compile_file(os.path.join(folder_name, "original_sol.c"))
+    if compile_error:
+        log(f"Complexity profiling disabled for {folder_name}: original_sol did not compile.", "warning")
+        return None
+    profile = ComplexityProfile(
+        config,
+        sizes,
+        inputs,
+        [],
+        timeout=float(config.get("timeout", DEFAULT_PROFILE_TIMEOUT)),
+        repeats=max(1, int(config.get("repeats", 1))),
+    )
+    try:
+        reference_times = measure_profile(executable, profile)
+    finally:
+        if executable and os.path.exists(executable):
+            try:
+                os.remove(executable)
+            except OSError as e:
+                log(f"Error removing profiling executable {executable}: {e}", "warning")
+    if len(reference_times) != len(sizes) or None in reference_times:
+        log(f"Complexity profiling disabled for {folder_name}: original_sol did not finish every profile input.", "warning")
+        return None
+    log(
+        f"Reference profile for {folder_name}: {', '.join(format_seconds(t) for t in reference_times)}",
+        "info",
+        verbosity=1,
+    )
+    return replace(profile, reference_times=reference_times)
 
 
 def write_discrepancy_details(grade_file, discrepancy):
@@ -316,6 +1444,32 @@ def apply_structural_penalty(grade_value, structural_result: StructuralCheckResu
     return grade_value
 
 
+def apply_complexity_penalty(grade_value, complexity_result: ComplexityCheckResult | None):
+    if complexity_result and complexity_result.checked and not complexity_result.passed and complexity_result.penalty:
+        return max(0, grade_value - complexity_result.penalty)
+    return grade_value
+
+
+def write_complexity_metadata(grade_file, complexity_result: ComplexityCheckResult, before_grade, effective_grade):
+    status = "passed" if complexity_result.passed else "failed"
+    grade_file.write(f"Complexity Check: {status}\n")
+    if complexity_result.fitted_class:
+        grade_file.write(
+            f"Complexity Class: {complexity_result.fitted_class} (reference {complexity_result.reference_class})\n"
+        )
+    if complexity_result.slowdown is not None:
+        grade_file.write(f"Complexity Slowdown: {complexity_result.slowdown:g}x\n")
+    if complexity_result.reason:
+        grade_file.write(f"Complexity Notes: {complexity_result.reason}\n")
+    if not complexity_result.passed and complexity_result.penalty:
+        grade_file.write(f"Complexity Penalty: -{format_grade_value(complexity_result.penalty)}\n")
+        grade_file.write(
+            f"(Complexity check adjusted grade: {format_grade_value(before_grade)}"
+            f" - {format_grade_value(complexity_result.penalty)}"
+            f" = {format_grade_value(effective_grade)}%)\n"
+        )
+
+
 def write_repair_metadata(grade_file, repair_result: CompileRepairResult | None):
     if not repair_result:
         return
@@ -337,6 +1491,10 @@ def write_grade(
     deduction_per_error=0,
     repair_result: CompileRepairResult | None = None,
     structural_result: StructuralCheckResult | None = None,
+    timeout_note: str | None = None,
+    timeout_budget_note: str | None = None,
+    output_limit_count: int = 0,
+    complexity_result: ComplexityCheckResult | None = None,
 ):
     try:
         with open(grade_path, "w", encoding="utf-8") as grade_file:
@@ -355,7 +1513,8 @@ def write_grade(
                         deduction_per_error,
                     )
                     after_repair_grade = apply_repair_penalty(grade_value, repair_result)
-                    effective_grade = apply_structural_penalty(after_repair_grade, structural_result)
+                    after_structural_grade = apply_structural_penalty(after_repair_grade, structural_result)
+                    effective_grade = apply_complexity_penalty(after_structural_grade, complexity_result)
                     grade_file.write(f"Grade: {format_grade_value(effective_grade)}%\n")
                     grade_file.write(f"({calculation_text})\n")
                     if repair_result and repair_result.fixed:
@@ -374,8 +1533,10 @@ def write_grade(
                             grade_file.write(
                                 f"(Structural check adjusted grade: {format_grade_value(after_repair_grade)}"
                                 f" - {format_grade_value(structural_result.penalty)}"
-                                f" = {format_grade_value(effective_grade)}%)\n"
+                                f" = {format_grade_value(after_structural_grade)}%)\n"
                             )
+                    if complexity_result and complexity_result.checked:
+                        write_complexity_metadata(grade_file, complexity_result, after_structural_grade, effective_grade)
                     
                     # Add Wrong Inputs line if there were discrepancies
                     if discrepancies:
@@ -392,6 +1553,12 @@ def write_grade(
                     timeout_inputs = [str(d[0]) for d in discrepancies if d[2] == "Timeout"]
                     if timeout_inputs:
                         grade_file.write(f"Timeout Inputs: {', '.join(timeout_inputs)}\n")
+                if timeout_note:
+                    grade_file.write(f"Timeout Limits: {timeout_note}\n")
+                if timeout_budget_note:
+                    grade_file.write(f"Timeout Budget Skipped: {timeout_budget_note}\n")
+                if output_limit_count:
+                    grade_file.write(f"Output Limit Exceeded: {output_limit_count}/{total}\n")
 
                 write_repair_metadata(grade_file, repair_result)
 
@@ -405,14 +1572,53 @@ def write_grade(
         log(f"Error writing grade file {grade_path}: {str(e)}", "error")
 
 
-def compare_outputs(ground_truth, actual_outputs, question_name=None):
+def prepare_reference_fields(folder_name: str, checker_config: dict, ground_truth: list) -> list | None:
+    """Extract the checker's stdin- and reference-sourced fields once per input.
+
+    They are identical for every student, so comparisons reuse them. They are
+    also written to QN/original_sol_fields.json for auditing.
+    """
+    checker = compile_checker(checker_config)
+    if checker.plan is None:
+        return None
+    reference_fields = [checker.reference_fields(input_value, expected) for input_value, expected in ground_truth]
+    payload = {
+        "checker": checker_config,
+        "cases": [
+            {"input": input_value, **fields.to_json()}
+            for (input_value, _), fields in zip(ground_truth, reference_fields)
+        ],
+    }
+    try:
+        with open(os.path.join(folder_name, REFERENCE_FIELDS_FILENAME), "w", encoding="utf-8") as fields_file:
+            json.dump(payload, fields_file, indent=2)
+    except (OSError, TypeError, ValueError) as e:
+        log(f"Could not write {REFERENCE_FIELDS_FILENAME} for {folder_name}: {e}", "warning")
+    return reference_fields
+
+
+def _unmemoized_compare(checker, input_value, expected_output, actual_output, reference_fields=None):
+    return checker.compare(input_value, expected_output, actual_output, reference_fields)
+
+
+def compare_outputs(ground_truth, actual_outputs, question_name=None, checker_config=None, reference_fields=None):
+    if checker_config is None:
+        checker_config = get_question_checker_config(question_name)
+    checker = compile_checker(checker_config)
+    compare = _ACTIVE_COMPARISON_MEMO.compare if _ACTIVE_COMPARISON_MEMO else _unmemoized_compare
     total = len(ground_truth)
     correct_count = 0
     discrepancies = []
     for i in range(total):
         input_value, expected_output = ground_truth[i]
         _, actual_output = actual_outputs[i]
-        comparison = compare_output(question_name, input_value, expected_output, actual_output)
+        comparison = compare(
+            checker,
+            input_value,
+            expected_output,
+            actual_output,
+            reference_fields[i] if reference_fields else None,
+        )
         if comparison.passed:
             correct_count += 1
         else:
@@ -420,37 +1626,46 @@ def compare_outputs(ground_truth, actual_outputs, question_name=None):
     return correct_count, discrepancies, total
 
 
-def execute_and_grade(
-    file,
-    executable,
-    inputs,
+def write_student_results(
+    student_id,
+    source_path,
+    actual_outputs,
     ground_truth,
     output_folder,
     grade_folder,
     question_name,
     scoring_mode="percentage",
     deduction_per_error=0,
+    repair_result: CompileRepairResult | None = None,
+    timeout_note: str | None = None,
+    timeout_budget_note: str | None = None,
+    complexity_result: ComplexityCheckResult | None = None,
+    checker_config: dict | None = None,
+    reference_fields: list | None = None,
 ):
-    grade_path = os.path.join(grade_folder, file.replace(".c", ".txt"))
-    output_path = os.path.join(output_folder, file.replace(".c", ".txt"))
-
-    actual_outputs, lines_to_write = [], []
+    """Write the output and grade files for one student's reassembled run results.
 
-    timeout_count = 0
-
-    for input_value in inputs:
-        output = run_executable(executable, input_value)
-        if output == "Timeout":
-            timeout_count += 1
-        actual_outputs.append((input_value, output))
-        lines_to_write.append(f"Input: {input_value}\nOutput: {output}\n\n")
+    `checker_config` is the question's config for the whole run; it is looked up when omitted.
+    `reference_fields` are its precomputed reference-side fields per input (see prepare_reference_fields).
+    """
+    grade_path = os.path.join(grade_folder, f"{student_id}.txt")
+    output_path = os.path.join(output_folder, f"{student_id}.txt")
+    os.makedirs(output_folder, exist_ok=True)
 
-    with open(output_path, "w", encoding="utf-8") as sol_file:
-        sol_file.writelines(lines_to_write)
+    timeout_count = sum(1 for _, output in actual_outputs if output == "Timeout")
+    output_limit_count = sum(1 for _, output in actual_outputs if output == OUTPUT_LIMIT_EXCEEDED)
+    write_output_cases(output_path, actual_outputs)
 
-    correct_count, discrepancies, total = compare_outputs(ground_truth, actual_outputs, question_name)
-    source_path = os.path.join(os.path.dirname(executable), file)
-    structural_result = analyze_source_file(source_path, question_name, get_question_checker_config(question_name))
+    if checker_config is None:
+        checker_config = get_question_checker_config(question_name)
+    correct_count, discrepancies, total = compare_outputs(
+        ground_truth,
+        actual_outputs,
+        question_name,
+        checker_config,
+        reference_fields,
+    )
+    structural_result = analyze_source_file(source_path, question_name, checker_config)
     write_grade(
         grade_path,
         correct_count,
@@ -460,60 +1675,449 @@ def execute_and_grade(
         timeout_count,
         scoring_mode,
         deduction_per_error,
-        structural_result=structural_result,
+        repair_result,
+        structural_result,
+        timeout_note,
+        timeout_budget_note,
+        output_limit_count,
+        complexity_result,
     )
 
-    return executable
 
+class WorkerPools:
+    """Compile, execution and repair pools that several pipelines share, so one limit covers every question."""
 
-def execute_repaired_and_grade(
-    student_id,
-    executable,
-    inputs,
-    ground_truth,
-    output_folder,
-    grade_folder,
-    question_name,
-    repair_result,
-    scoring_mode="percentage",
-    deduction_per_error=0,
-):
-    grade_path = os.path.join(grade_folder, f"{student_id}.txt")
-    output_path = os.path.join(output_folder, f"{student_id}.txt")
-    actual_outputs, lines_to_write = [], []
-    timeout_count = 0
+    def __init__(self, max_workers: Optional[int] = None, engine: str = "threads"):
+        if engine not in EXECUTION_ENGINES:
+            raise ValueError(f"Unknown execution engine {engine!r}; expected one of {', '.join(EXECUTION_ENGINES)}")
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.engine = engine
+        self.compile = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="compile")
+        if engine == "asyncio":
+            # Live children are bounded by a semaphore; queued runs hold no thread.
+            self.execute = AsyncExecutionPool(self.max_workers)
+        else:
+            self.execute = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="execute")
+        # LLM repair stays sequential, as it was before pipelining.
+        self.repair = ThreadPoolExecutor(max_workers=1, thread_name_prefix="repair")
+
+    def shutdown(self, cancel_futures=False):
+        for pool in (self.compile, self.repair, self.execute):
+            pool.shutdown(wait=True, cancel_futures=cancel_futures)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown(cancel_futures=True)
+
+
+@dataclass
+class _StudentRun:
+    """One executable being run over every input, and the students that share its results."""
+    file: str
+    executable: str
+    grade_files: list
+    output_folder: str
+    budget: "TimeoutBudget"
+    outputs: list
+    pending: int
+    repair_result: CompileRepairResult | None = None
+    next_index: int = 0
+    complexity_times: list | None = None
+
+
+@dataclass
+class PipelineResult:
+    compiled: dict
+    compile_errors: dict
+    graded_files: list
+    repair_executables: list
+    repaired_count: int = 0
+
+
+class GradingPipeline:
+    """Stream students from compile to execute to grade through one set of bounded worker pools.
+
+    Each successful compile is queued for execution immediately, and failed
+    compiles go to a single repair worker when `repair` is given. Runs are
+    handed to the execution pool round-robin across the students that are
+    ready, so when several are ready at once the order is input-major and a
+    slow or looping student never pins a worker for its whole input list.
+    Each student is graded as soon as its last run finishes, or after its
+    complexity profile when `complexity_profile` is given. A single progress
+    stream counts every compile and every run.
+    """
 
-    os.makedirs(output_folder, exist_ok=True)
-    for input_value in inputs:
-        output = run_executable(executable, input_value)
-        if output == "Timeout":
-            timeout_count += 1
-        actual_outputs.append((input_value, output))
-        lines_to_write.append(f"Input: {input_value}\nOutput: {output}\n\n")
-
-    with open(output_path, "w", encoding="utf-8") as sol_file:
-        sol_file.writelines(lines_to_write)
-
-    correct_count, discrepancies, total = compare_outputs(ground_truth, actual_outputs, question_name)
-    structural_result = analyze_source_file(
-        repair_result.fixed_code_path,
+    def __init__(
+        self,
+        question_name: str,
+        c_files_dir: str,
+        inputs: list,
+        ground_truth: list,
+        output_folder: str,
+        grade_folder: str,
+        scoring_mode: str = "percentage",
+        deduction_per_error: float = 0,
+        progress_callback: Optional[Callable[[int, int, str], None]] = None,
+        cancel_event: Optional[threading.Event] = None,
+        max_workers: Optional[int] = None,
+        timeout_limits: Optional[list] = None,
+        timeout_note: Optional[str] = None,
+        execution_options: Optional[ExecutionOptions] = None,
+        duplicates: Optional[dict] = None,
+        repair: Optional[Callable[[str, str], CompileRepairResult]] = None,
+        repair_output_folder: Optional[str] = None,
+        workers: Optional[WorkerPools] = None,
+        reference_runtimes: Optional[list] = None,
+        metrics_folder: Optional[str] = None,
+        complexity_profile: Optional[ComplexityProfile] = None,
+        checker_config: Optional[dict] = None,
+        reference_fields: Optional[list] = None,
+    ):
+        self.question_name = question_name
+        self.c_files_dir = c_files_dir
+        self.inputs = inputs
+        self.ground_truth = ground_truth
+        self.output_folder = output_folder
+        self.grade_folder = grade_folder
+        self.scoring_mode = scoring_mode
+        self.deduction_per_error = deduction_per_error
+        self.progress_callback = progress_callback
+        self.cancel_event = cancel_event
+        self.workers = workers
+        self.max_workers = workers.max_workers if workers else (max_workers or os.cpu_count() or 1)
+        self.timeout_limits = timeout_limits or [5] * len(inputs)
+        self.timeout_note = timeout_note
+        self.execution_options = execution_options or ExecutionOptions()
+        self.duplicates = duplicates or {}
+        self.repair = repair
+        self.repair_output_folder = repair_output_folder or output_folder
+        self.reference_runtimes = reference_runtimes or []
+        self.metrics_folder = metrics_folder
+        self.complexity_profile = complexity_profile
+        self.checker_config = checker_config
+        self.reference_fields = reference_fields
+        self.description = f"[{question_name}] Compiling and executing"
+
+    def run(self, files_to_compile=(), compiled: Optional[dict] = None) -> PipelineResult:
+        """Compile `files_to_compile` (and run the already compiled executables in `compiled`)."""
+        self._events = queue.Queue()
+        self._outstanding = 0
+        self._runs_in_flight = 0
+        self._ready = deque()
+        self._processed = 0
+        self._total = len(files_to_compile) + len(self.inputs) * (len(files_to_compile) + len(compiled or {}))
+        self._result = PipelineResult({}, {}, [], [])
+        self._progress_bar = tqdm(
+            total=self._total,
+            desc=self.description,
+            unit="task",
+            bar_format="\033[94m{l_bar}{bar}{r_bar}\033[0m",
+        ) if TQDM_AVAILABLE and self.progress_callback is None else None
+
+        workers = self.workers or WorkerPools(self.max_workers, self.execution_options.execution_engine)
+        self._pools = workers
+        self._futures = []
+        try:
+            batch_size = compile_batch_size(len(files_to_compile), self.max_workers)
+            # With repair enabled, a syntax-only pass first sends broken files to the
+            # repair worker so LLM latency overlaps the optimized builds.
+            precheck = self.repair and self.execution_options.syntax_precheck
+            for batch in compile_batches(list(files_to_compile), batch_size):
+                self._submit(
+                    workers.compile,
+                    "precheck" if precheck else "compile",
+                    tuple(batch),
+                    syntax_check_files if precheck else compile_files,
+                    [os.path.join(self.c_files_dir, file) for file in batch],
+                )
+            for file, executable in (compiled or {}).items():
+                self._result.compiled[file] = executable
+                self._queue_student(file, executable, self.output_folder)
+            self._fill_execution_slots()
+
+            while self._outstanding:
+                if self.cancel_event and self.cancel_event.is_set():
+                    break
+                try:
+                    kind, key, future = self._events.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+                self._outstanding -= 1
+                if kind == "compile":
+                    self._on_compiled(key, future)
+                elif kind == "precheck":
+                    self._on_prechecked(key, future)
+                elif kind == "repair":
+                    self._on_repaired(key, future)
+                elif kind == "profile":
+                    self._on_profiled(key, future)
+                else:
+                    self._on_run(key, future)
+                self._fill_execution_slots()
+        finally:
+            if self.workers:
+                # Shared pools outlive this question; only drop our own queued work.
+                for future in self._futures:
+                    future.cancel()
+            else:
+                workers.shutdown(cancel_futures=True)
+            if self._progress_bar:
+                self._progress_bar.close()
+        return self._result
+
+    def _submit(self, pool, kind, key, fn, *args):
+        future = pool.submit(fn, *args)
+        self._futures.append(future)
+        self._outstanding += 1
+        future.add_done_callback(lambda done, kind=kind, key=key: self._events.put((kind, key, done)))
+
+    def _advance(self, count=1):
+        self._processed += count
+        if self._progress_bar:
+            self._progress_bar.update(count)
+        if self.progress_callback:
+            self.progress_callback(self._processed, self._total, self.description)
+
+    def _queue_student(self, file, executable, output_folder, repair_result=None):
+        grade_files = [file, *self.duplicates.get(file, [])]
+        self._ready.append(
+            _StudentRun(
+                file,
+                executable,
+                grade_files,
+                output_folder,
+                self.execution_options.new_timeout_budget(),
+                [None] * len(self.inputs),
+                len(self.inputs),
+                repair_result,
+            )
+        )
+
+    def _fill_execution_slots(self):
+        # Keep the pool's queue short so newly compiled students interleave with earlier ones.
+        while self._ready and self._runs_in_flight < self.max_workers * 2:
+            student = self._ready.popleft()
+            index = student.next_index
+            student.next_index += 1
+            if student.next_index < len(self.inputs):
+                self._ready.append(student)
+            self._runs_in_flight += 1
+            self._submit(
+                self._pools.execute,
+                "run",
+                (student, index),
+                run_with_budget_async if self._pools.engine == "asyncio" else run_with_budget,
+                student.executable,
+                self.inputs[index],
+                self.timeout_limits[index],
+                student.budget,
+            )
+
+    def _on_compiled(self, batch, future):
+        try:
+            results = future.result()
+        except Exception as e:
+            log(f"Error getting compilation result for {', '.join(batch)}: {e}", "error")
+            results = {os.path.join(self.c_files_dir, file): (None, str(e)) for file in batch}
+        for file in batch:
+            self._on_compile_result(file, *results[os.path.join(self.c_files_dir, file)])
+
+    def _on_prechecked(self, batch, future):
+        try:
+            results = future.result()
+        except Exception as e:
+            log(f"Syntax precheck failed for {', '.join(batch)}: {e}", "warning")
+            results = {}
+        passed = []
+        for file in batch:
+            error = results.get(os.path.join(self.c_files_dir, file))
+            if error:
+                log(f"{self.question_name} {file}: syntax precheck failed, queued for repair", "info", verbosity=1)
+                self._on_compile_result(file, None, error)
+            else:
+                passed.append(file)
+        if passed:
+            self._submit(
+                self._pools.compile,
+                "compile",
+                tuple(passed),
+                compile_files,
+                [os.path.join(self.c_files_dir, file) for file in passed],
+            )
+
+    def _on_compile_result(self, file, executable, error):
+        self._advance()
+        if executable:
+            self._result.compiled[file] = executable
+            self._queue_student(file, executable, self.output_folder)
+        else:
+            self._result.compile_errors[file] = error
+            if self.repair:
+                self._submit(self._pools.repair, "repair", (file, error), self.repair, file, error)
+            else:
+                self._write_compile_error(file, error)
+
+    def _on_repaired(self, key, future):
+        file, error = key
+        try:
+            repair_result = future.result()
+        except Exception as e:
+            log(f"Error repairing {file}: {e}", "error")
+            repair_result = None
+        if repair_result and repair_result.fixed:
+            for duplicate_file in self.duplicates.get(file, []):
+                # Lets --rescore find the repair metadata for every graded copy.
+                write_repair_report(
+                    os.path.join(self.question_name, "llm_fixed", os.path.splitext(duplicate_file)[0]),
+                    repair_result,
+                )
+            self._result.repair_executables.append(repair_result.executable_path)
+            self._result.repaired_count += 1 + len(self.duplicates.get(file, []))
+            self._queue_student(
+                file,
+                repair_result.executable_path,
+                self.repair_output_folder,
+                repair_result,
+            )
+        else:
+            self._write_compile_error(file, error, repair_result)
+
+    def _write_compile_error(self, file, error, repair_result=None):
+        for grade_file in [file, *self.duplicates.get(file, [])]:
+            grade_path = os.path.join(self.grade_folder, grade_file.replace(".c", ".txt"))
+            write_grade(grade_path, 0, 0, [], error, 0, self.scoring_mode, self.deduction_per_error, repair_result)
+        self._advance(len(self.inputs))
+
+    def _on_run(self, key, future):
+        student, index = key
+        self._runs_in_flight -= 1
+        try:
+            student.outputs[index] = future.result()
+        except Exception as e:
+            log(f"Error getting execution result for {student.file}: {e}", "error")
+            student.outputs[index] = ExecutionResult(f"Error: {e}")
+        student.pending -= 1
+        if student.pending == 0:
+            if self.complexity_profile:
+                self._runs_in_flight += 1
+                self._submit(
+                    self._pools.execute,
+                    "profile",
+                    student,
+                    measure_profile_async if self._pools.engine == "asyncio" else measure_profile,
+                    student.executable,
+                    self.complexity_profile,
+                )
+            else:
+                self._grade(student)
+        self._advance()
+
+    def _on_profiled(self, student, future):
+        self._runs_in_flight -= 1
+        try:
+            student.complexity_times = future.result()
+        except Exception as e:
+            log(f"Error profiling {student.file}: {e}", "error")
+            student.complexity_times = [None]
+        self._grade(student)
+
+    def _grade(self, student):
+        metrics = None
+        if self.metrics_folder:
+            metrics = build_student_metrics(
+                student.outputs,
+                [measured_runtime(result) for result in student.outputs],
+                self.reference_runtimes,
+            )
+        complexity_result = None
+        if self.complexity_profile and student.complexity_times is not None:
+            profile = self.complexity_profile
+            complexity_result = evaluate_complexity(
+                profile.config,
+                profile.sizes,
+                student.complexity_times,
+                profile.reference_times,
+            )
+            if metrics:
+                metrics["complexity"] = complexity_measurements(
+                    profile.sizes,
+                    student.complexity_times,
+                    profile.reference_times,
+                )
+        for grade_file in student.grade_files:
+            if student.repair_result:
+                source_path = student.repair_result.fixed_code_path
+            else:
+                source_path = os.path.join(self.c_files_dir, grade_file)
+            try:
+                write_student_results(
+                    os.path.splitext(grade_file)[0],
+                    source_path,
+                    [(input_value, result.output) for input_value, result in zip(self.inputs, student.outputs)],
+                    self.ground_truth,
+                    student.output_folder,
+                    self.grade_folder,
+                    self.question_name,
+                    self.scoring_mode,
+                    self.deduction_per_error,
+                    student.repair_result,
+                    self.timeout_note,
+                    student.budget.describe(len(self.inputs)),
+                    complexity_result,
+                    self.checker_config,
+                    self.reference_fields,
+                )
+                if metrics:
+                    write_student_metrics(self.metrics_folder, os.path.splitext(grade_file)[0], metrics)
+                self._result.graded_files.append(grade_file)
+            except Exception as e:
+                log(f"Error grading {grade_file}: {e}", "error")
+
+
+def execute_all_and_grade(
+    compiled: dict,
+    c_files_dir: str,
+    inputs: list,
+    ground_truth: list,
+    output_folder: str,
+    grade_folder: str,
+    question_name: str,
+    scoring_mode: str = "percentage",
+    deduction_per_error: float = 0,
+    progress_callback: Optional[Callable[[int, int, str], None]] = None,
+    cancel_event: Optional[threading.Event] = None,
+    max_workers: Optional[int] = None,
+    timeout_limits: Optional[list] = None,
+    timeout_note: Optional[str] = None,
+    execution_options: Optional[ExecutionOptions] = None,
+    duplicates: Optional[dict] = None,
+) -> list:
+    """Run and grade already compiled executables on the grading pipeline's execution stage.
+
+    `duplicates` maps a compiled file to identical submissions that receive the same results.
+    Returns the student files that were fully graded.
+    """
+    pipeline = GradingPipeline(
         question_name,
-        get_question_checker_config(question_name),
-    )
-    write_grade(
-        grade_path,
-        correct_count,
-        total,
-        discrepancies,
-        None,
-        timeout_count,
+        c_files_dir,
+        inputs,
+        ground_truth,
+        output_folder,
+        grade_folder,
         scoring_mode,
         deduction_per_error,
-        repair_result,
-        structural_result,
+        progress_callback,
+        cancel_event,
+        max_workers,
+        timeout_limits,
+        timeout_note,
+        execution_options,
+        duplicates,
     )
-
-    return executable
+    pipeline.description = f"[{question_name}] Executing"
+    return pipeline.run(compiled=compiled).graded_files
 
 
 def log_compilation_summary(compile_errors):
@@ -530,10 +2134,10 @@ def log_compilation_summary(compile_errors):
                 log(f"  {file} error:\n    {error}", "warning", verbosity=3)
 
 
-def cleanup_folders(base_folder):
+def cleanup_folders(base_folder, keep_student_ids=()):
     log(f"Cleaning folders in: {base_folder}", "info", verbosity=1)
     # Iterate through potential folders to clean (output, grade)
-    for folder_to_clean_name in ["output", "grade"]:
+    for folder_to_clean_name in ["output", "grade", METRICS_FOLDER_NAME]:
         folder_path = os.path.join(base_folder, folder_to_clean_name)
         if os.path.isdir(folder_path):
             log(f"Cleaning contents of: {folder_path}", "info", verbosity=2)
@@ -542,6 +2146,8 @@ def cleanup_folders(base_folder):
                 if item_name == "example_student.txt":
                     log(f"Skipping cleanup of example file: {os.path.join(folder_path, item_name)}", "info", verbosity=2)
                     continue
+                if os.path.splitext(item_name)[0] in keep_student_ids:
+                    continue
                 
                 item_path = os.path.join(folder_path, item_name)
                 try:
@@ -566,29 +2172,6 @@ def cleanup_executables(executables):
             log(f"Error deleting {exe}: {str(e)}", "error")
 
 
-def cleanup_obj_files():
-    log("Cleaning up all *.obj files...", "info")
-    deleted_count = 0
-    for root, _, files in os.walk("."):
-        for file in files:
-            if file.endswith(".obj"):
-                # Skip example object file
-                if file == "example_student.obj":
-                    log(f"Skipping cleanup of example object file: {os.path.join(root, file)}", "info", verbosity=2)
-                    continue
-                try:
-                    file_path = os.path.join(root, file)
-                    os.remove(file_path)
-                    deleted_count += 1
-                    log(f"Deleted obj file: {file_path}", "success", verbosity=3)
-                except Exception as e:
-                    log(f"Error deleting obj file {os.path.join(root, file)}: {str(e)}", "error")
-    if deleted_count > 0:
-        log(f"Deleted {deleted_count} .obj file(s).", "info")
-    else:
-        log("No .obj files found to delete.", "info")
-
-
 def process_folder(
     folder_name: str,
     progress_callback: Optional[Callable[[int, int, str], None]] = None,
@@ -599,7 +2182,15 @@ def process_folder(
     llm_compile_repair_provider=None,
     llm_compile_repair_penalty: float = 10,
     llm_compile_repair_max_attempts: int = 3,
+    execution_options: Optional[ExecutionOptions] = None,
+    workers: Optional[WorkerPools] = None,
+    checker_config: Optional[dict] = None,
 ) -> str:
+    """Grade one question folder.
+
+    `checker_config` pins the question's checker config for the run (read from
+    checker_config.json when omitted).
+    """
     print("\n\n")
     log(f"Processing folder: {folder_name}...", "info")
     # Define stages and weights for progress reporting
@@ -611,7 +2202,14 @@ def process_folder(
 
     # --- Check Cancellation Point 1 --- 
     if cancel_event and cancel_event.is_set(): return "cancelled"
-    cleanup_folders(folder_name)
+    execution_options = execution_options or ExecutionOptions.from_configuration()
+    configure_toolchain(execution_options)
+    configure_compile_cache(execution_options, folder_name)
+    configure_output_limit(execution_options)
+    configure_resource_limits(execution_options)
+    # Incremental runs clean up only after deciding which students to keep.
+    if not execution_options.incremental:
+        cleanup_folders(folder_name)
     output_folder, grade_folder = ensure_output_folder(folder_name)
 
     inputs = read_inputs_from_file(folder_name)
@@ -619,9 +2217,25 @@ def process_folder(
 
     # --- Ground Truth --- 
     log(f"Generating ground truth for {folder_name}...", "info")
-    ground_truth = get_ground_truth(folder_name, inputs, progress_callback, cancel_event)
+    ground_truth, reference_runtimes = generate_ground_truth(
+        folder_name,
+        inputs,
+        progress_callback,
+        cancel_event,
+        timeout=execution_options.timeout_ceiling,
+        use_cache=execution_options.ground_truth_cache,
+        workers=workers,
+    )
     if cancel_event and cancel_event.is_set(): return "cancelled"
     if not ground_truth: return "error"
+    try:
+        # Stored so `--rescore` can regrade without recompiling the reference.
+        write_output_cases(os.path.join(folder_name, REFERENCE_OUTPUT_FILENAME), ground_truth)
+    except OSError as e:
+        log(f"Could not write {REFERENCE_OUTPUT_FILENAME} for {folder_name}: {e}", "warning")
+    timeout_limits = [execution_options.timeout_for(runtime) for runtime in reference_runtimes]
+    timeout_note = execution_options.describe_timeouts(timeout_limits)
+    log(f"Student timeouts for {folder_name}: {timeout_note}", "info", verbosity=1)
 
     # --- Check Cancellation Point 2 --- 
     if cancel_event and cancel_event.is_set(): return "cancelled"
@@ -637,130 +2251,137 @@ def process_folder(
         log(f"No student .c files (excluding examples/originals) to process in {c_files_dir}.", "warning")
         return "warning" # Or success? If only example/original exist, maybe that's ok.
 
-    # --- Compilation --- 
-    log(f"Compiling student files in {folder_name}...", "info")
-    compiled, compile_errors = parallel_compile_files(c_files_dir, c_files_to_process, progress_callback, cancel_event)
-    if cancel_event and cancel_event.is_set(): return "cancelled"
+    if checker_config is None:
+        checker_config = get_question_checker_config(folder_name)
+    reference_fields = prepare_reference_fields(folder_name, checker_config, ground_truth)
+    context = grading_context(
+        inputs,
+        ground_truth,
+        checker_config,
+        {
+            "scoring_mode": scoring_mode,
+            "deduction_per_error": deduction_per_error,
+            "llm_compile_repair_enabled": bool(llm_compile_repair_enabled and llm_compile_repair_provider),
+            "llm_compile_repair_penalty": llm_compile_repair_penalty,
+            "llm_compile_repair_max_attempts": llm_compile_repair_max_attempts,
+            **execution_options.grading_settings(),
+        },
+        folder_name,
+    )
+    fingerprints = {f: student_fingerprint(os.path.join(c_files_dir, f), context) for f in c_files_to_process}
+    unchanged = set()
+    if execution_options.incremental:
+        unchanged = unchanged_students(load_manifest(folder_name), fingerprints, grade_folder)
+        cleanup_folders(folder_name, {os.path.splitext(f)[0] for f in unchanged})
+        log(
+            f"Incremental run for {folder_name}: keeping {len(unchanged)} unchanged student(s), "
+            f"regrading {len(c_files_to_process) - len(unchanged)}.",
+            "info",
+        )
+        c_files_to_process = [f for f in c_files_to_process if f not in unchanged]
 
-    repair_output_folder = os.path.join(folder_name, "llm_fixed_output")
-    repair_executables_to_cleanup = []
-    repaired_count = 0
+    def record_manifest():
+        try:
+            save_manifest(folder_name, {f: fp for f, fp in fingerprints.items() if fp is not None})
+        except OSError as e:
+            log(f"Could not write run manifest for {folder_name}: {e}", "warning")
 
-    # Write grade files for compilation errors, or repair and regrade them when enabled.
-    for file, error in compile_errors.items():
-        grade_path = os.path.join(grade_folder, file.replace(".c", ".txt"))
-        if llm_compile_repair_enabled and llm_compile_repair_provider:
+    if not c_files_to_process:
+        record_manifest()
+        log(f"No changed submissions to grade in {folder_name}.", "success")
+        return "success"
+
+    # --- Deduplication ---
+    files_to_compile = c_files_to_process
+    duplicates = {}
+    if execution_options.deduplicate:
+        groups, source_hashes = group_submissions(c_files_dir, c_files_to_process)
+        files_to_compile = list(groups)
+        duplicates = {file: members[1:] for file, members in groups.items() if len(members) > 1}
+        try:
+            write_duplicate_report(folder_name, groups, source_hashes)
+        except OSError as e:
+            log(f"Could not write duplicate report for {folder_name}: {e}", "warning")
+        if duplicates:
+            log(
+                f"{folder_name}: {sum(len(m) for m in duplicates.values())} duplicate submission(s) in "
+                f"{len(duplicates)} group(s) reuse one compile and run per group.",
+                "info",
+            )
+
+    # --- Compile, repair, execute and grade as one stream ---
+    repair = None
+    if llm_compile_repair_enabled and llm_compile_repair_provider:
+        def repair(file, error):
             student_id = os.path.splitext(file)[0]
-            source_path = os.path.join(c_files_dir, file)
             log(f"{folder_name} {student_id}: attempting LLM compile repair", "info")
-            repair_result = repair_compilation_failure(
-                source_path,
+            return repair_compilation_failure(
+                os.path.join(c_files_dir, file),
                 error,
                 llm_compile_repair_provider,
                 compile_file,
                 max_attempts=llm_compile_repair_max_attempts,
                 repair_penalty=llm_compile_repair_penalty,
                 repair_root=os.path.join(folder_name, "llm_fixed"),
-                progress_callback=lambda message, q=folder_name, sid=student_id: log(
-                    f"{q} {sid}: {message}", "info"
-                ),
+                progress_callback=lambda message: log(f"{folder_name} {student_id}: {message}", "info"),
             )
-            if repair_result.fixed:
-                execute_repaired_and_grade(
-                    student_id,
-                    repair_result.executable_path,
-                    inputs,
-                    ground_truth,
-                    repair_output_folder,
-                    grade_folder,
-                    folder_name,
-                    repair_result,
-                    scoring_mode,
-                    deduction_per_error,
-                )
-                repair_executables_to_cleanup.append(repair_result.executable_path)
-                repaired_count += 1
-                continue
-            write_grade(grade_path, 0, 0, [], error, 0, scoring_mode, deduction_per_error, repair_result)
-        else:
-            write_grade(grade_path, 0, 0, [], error, 0, scoring_mode, deduction_per_error)
-
-    # ... (handle compile errors and write grades for them) ...
-    if len(compiled) == 0 and len(c_files_to_process) > 0:
-        cleanup_executables(repair_executables_to_cleanup)
-        log_compilation_summary(compile_errors)
-        return "warning" if repaired_count else "error"
-    if len(compiled) == 0:
-        cleanup_executables(repair_executables_to_cleanup)
-        return "warning" # No files to even attempt compile?
-
-    time.sleep(0.1)
-
-    # --- Execution --- 
-    log(f"Executing student programs in {folder_name}...", "info")
-    execute_desc = f"[{folder_name}] Executing"
-    executables_to_cleanup = []
-    processed_count = 0
-    total_to_execute = len(compiled)
-    use_tqdm = TQDM_AVAILABLE and progress_callback is None
-    iterator_factory = tqdm if use_tqdm else lambda iterable, **kwargs: iterable
-
-    with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
-        futures = {
-            executor.submit(
-                execute_and_grade,
-                file,
-                exe,
-                inputs,
-                ground_truth,
-                output_folder,
-                grade_folder,
-                folder_name,
-                scoring_mode,
-                deduction_per_error,
-            ): file
-            for file, exe in compiled.items()
-        }
-
-        progress_iterator = iterator_factory(
-            as_completed(futures),
-            total=total_to_execute,
-            desc=execute_desc if use_tqdm else None,
-            unit="file",
-            bar_format="\033[94m{l_bar}{bar}{r_bar}\033[0m" if use_tqdm else None
-        )
 
-        for future in progress_iterator:
-            if cancel_event and cancel_event.is_set(): break
-            try:
-                executable_used = future.result()
-                if executable_used: # Should always return the exe path
-                    executables_to_cleanup.append(executable_used)
-            except Exception as e:
-                file = futures[future]
-                log(f"Error getting execution result for {file}: {e}", "error")
-            finally:
-                processed_count += 1
-                if progress_callback:
-                    progress_callback(processed_count, total_to_execute, execute_desc)
+    complexity_profile = prepare_complexity_profile(folder_name, checker_config)
+    if cancel_event and cancel_event.is_set(): return "cancelled"
+
+    log(f"Compiling and executing student programs in {folder_name}...", "info")
+    pipeline_result = GradingPipeline(
+        folder_name,
+        c_files_dir,
+        inputs,
+        ground_truth,
+        output_folder,
+        grade_folder,
+        scoring_mode,
+        deduction_per_error,
+        progress_callback,
+        cancel_event,
+        timeout_limits=timeout_limits,
+        timeout_note=timeout_note,
+        execution_options=execution_options,
+        duplicates=duplicates,
+        repair=repair,
+        repair_output_folder=os.path.join(folder_name, "llm_fixed_output"),
+        workers=workers,
+        reference_runtimes=reference_runtimes,
+        metrics_folder=os.path.join(folder_name, METRICS_FOLDER_NAME),
+        complexity_profile=complexity_profile,
+        checker_config=checker_config,
+        reference_fields=reference_fields,
+    ).run(files_to_compile)
+    compiled = pipeline_result.compiled
+    compile_errors = {
+        f: error
+        for file, error in pipeline_result.compile_errors.items()
+        for f in [file, *duplicates.get(file, [])]
+    }
 
     # --- Cleanup & Summary --- 
-    # Cleanup only if not cancelled mid-execution?
-    if not (cancel_event and cancel_event.is_set()):
-        cleanup_executables(executables_to_cleanup + repair_executables_to_cleanup)
-        log_compilation_summary(compile_errors)
-
-        total_files = len(c_files_to_process)
-        compiled_count = len(compiled)
-        if compiled_count == total_files and len(compile_errors) == 0:
-            return "success"
-        else:
-            return "warning"
-    else:
+    if cancel_event and cancel_event.is_set():
         # Need to decide what to do with partially created executables if cancelled
         log("Execution was cancelled, skipping final cleanup of executables for this folder.", "info")
         return "cancelled"
 
+    cleanup_executables(list(compiled.values()) + pipeline_result.repair_executables)
+    log_compilation_summary(compile_errors)
+    record_manifest()
+
+    total_files = len(c_files_to_process)
+    compiled_count = sum(1 + len(duplicates.get(file, [])) for file in compiled)
+    if compiled_count == 0:
+        log("No files Compiled successfully!", "error")
+        return "warning" if pipeline_result.repaired_count else "error"
+    if compiled_count == total_files and len(compile_errors) == 0:
+        log(f"All {total_files} files compiled successfully.", "success")
+        return "success"
+    log(f"Compiled {compiled_count}/{total_files} files successfully.", "warning")
+    return "warning"
+
 
 def process_all_questions(
     questions_arr: list,
@@ -772,28 +2393,47 @@ def process_all_questions(
     llm_compile_repair_provider=None,
     llm_compile_repair_penalty: float = 10,
     llm_compile_repair_max_attempts: int = 3,
+    execution_options: Optional[ExecutionOptions] = None,
 ) -> list:
-    results = []
-    for i, question in enumerate(questions_arr):
-        if cancel_event and cancel_event.is_set():
-            log("Processing all questions cancelled.", "warning", verbosity=1)
-            break
-        # Pass the main callback down to sub-stages
-        status = process_folder(
-            question,
-            progress_callback=progress_callback,
-            cancel_event=cancel_event,
-            scoring_mode=scoring_mode,
-            deduction_per_error=deduction_per_error,
-            llm_compile_repair_enabled=llm_compile_repair_enabled,
-            llm_compile_repair_provider=llm_compile_repair_provider,
-            llm_compile_repair_penalty=llm_compile_repair_penalty,
-            llm_compile_repair_max_attempts=llm_compile_repair_max_attempts,
-        )
-        results.append((question, status))
-        # Optionally report overall progress here too, though sub-stages are reporting
-        # if progress_callback:
-        #     progress_callback(i + 1, total_questions, description)
+    # Every question runs concurrently on one set of shared worker pools, so the
+    # tail of one question overlaps the next and a single limit covers all work.
+    # Progress stays per question (descriptions are prefixed with the question name).
+    execution_options = execution_options or ExecutionOptions.from_configuration()
+    configure_toolchain(execution_options)
+    if questions_arr:
+        configure_compile_cache(execution_options, questions_arr[0])
+    configure_output_limit(execution_options)
+    configure_resource_limits(execution_options)
+    # One config version for the whole run, even if checker_config.json is saved meanwhile.
+    checker_snapshot = checker_config_snapshot()
+    statuses = {}
+    with run_build_directory(execution_options), \
+         run_comparison_memo(execution_options) as comparison_memo, \
+         WorkerPools(execution_options.max_workers or None, execution_options.execution_engine) as workers:
+        with ThreadPoolExecutor(max_workers=max(1, len(questions_arr)), thread_name_prefix="question") as coordinators:
+            futures = {
+                coordinators.submit(
+                    process_folder,
+                    question,
+                    progress_callback=progress_callback,
+                    cancel_event=cancel_event,
+                    scoring_mode=scoring_mode,
+                    deduction_per_error=deduction_per_error,
+                    llm_compile_repair_enabled=llm_compile_repair_enabled,
+                    llm_compile_repair_provider=llm_compile_repair_provider,
+                    llm_compile_repair_penalty=llm_compile_repair_penalty,
+                    llm_compile_repair_max_attempts=llm_compile_repair_max_attempts,
+                    execution_options=execution_options,
+                    workers=workers,
+                    checker_config=checker_snapshot.question_config(question),
+                ): question
+                for question in questions_arr
+            }
+            for future in as_completed(futures):
+                statuses[futures[future]] = future.result()
+    results = [(question, statuses[question]) for question in questions_arr]
+    if cancel_event and cancel_event.is_set():
+        log("Processing all questions cancelled.", "warning", verbosity=1)
 
     # ... (summarize results, check for 'cancelled' status) ...
     summary_details = ", ".join(f"{q}({s})" for q, s in results)
@@ -813,6 +2453,18 @@ def process_all_questions(
             final_status = "error"
             msg = "No Questions were processed successfully."
         log(f"Processed Questions: {summary_details}. {msg}", final_status, verbosity=1)
+    if _ACTIVE_COMPILE_CACHE:
+        log(
+            f"Compile cache: {_ACTIVE_COMPILE_CACHE.hits} hit(s), {_ACTIVE_COMPILE_CACHE.misses} miss(es)",
+            "info",
+            verbosity=1,
+        )
+    if comparison_memo:
+        log(
+            f"Comparison memo: {comparison_memo.hits} hit(s), {comparison_memo.misses} miss(es)",
+            "info",
+            verbosity=1,
+        )
 
     return results
 
@@ -828,9 +2480,10 @@ def run_tests(
     llm_compile_repair_penalty: float = 10,
     llm_compile_repair_max_attempts: int = 3,
     vs_path_override: str = None,
+    execution_options: Optional[ExecutionOptions] = None,
 ):
     try:
-        setup_visual_studio_environment(vs_path_override)
+        prepare_toolchain(execution_options or ExecutionOptions.from_configuration(), vs_path_override)
         # Pass callback and event down
         process_all_questions(
             questions,
@@ -842,14 +2495,12 @@ def run_tests(
             llm_compile_repair_provider,
             llm_compile_repair_penalty,
             llm_compile_repair_max_attempts,
+            execution_options,
         )
     finally:
-        # Cleanup only if not cancelled?
+        # Build artifacts live in the run's build directory, which process_all_questions removes.
         if not (cancel_event and cancel_event.is_set()):
             time.sleep(0.1)
             print("\n")
-            cleanup_obj_files()
             log("All temporary files cleaned.", "success", verbosity=1)
-        else:
-            log("Task cancelled, skipping final .obj cleanup.", "warning", verbosity=1)
 
@@ -0,0 +1,205 @@
+"""Regrade stored student outputs without compiling or executing anything."""
+
+from __future__ import annotations
+
+import os
+import re
+import threading
+from typing import Callable, Optional
+
+from .compile_repair import load_repair_report
+from .complexity_analysis import ComplexityCheckResult, evaluate_complexity, profile_config
+from .process import REFERENCE_OUTPUT_FILENAME, prepare_reference_fields, read_inputs_from_file, write_student_results
+from .run_metrics import METRICS_FOLDER_NAME, load_complexity_measurements
+from .semantic_grading import get_question_checker_config
+from .utils import log
+
+
+TIMEOUT_LIMITS_PATTERN = re.compile(r"^Timeout Limits:\s*(.+)$", re.MULTILINE)
+TIMEOUT_BUDGET_PATTERN = re.compile(r"^Timeout Budget Skipped:\s*(.+)$", re.MULTILINE)
+EXAMPLE_STUDENT_ID = "example_student"
+
+
+def parse_output_cases(text: str, inputs: list) -> list | None:
+    """Split an Input:/Output: file back into (input, output) pairs for the expected inputs.
+
+    Returns None when the file does not cover exactly these inputs in order, so a
+    stale output file is never graded against a changed input.txt.
+    """
+    text = text.replace("\r\n", "\n").replace("\r", "\n")
+    cases = []
+    position = 0
+    for index, input_value in enumerate(inputs):
+        header = f"Input: {input_value}\nOutput: "
+        if not text.startswith(header, position):
+            return None
+        start = position + len(header)
+        if index + 1 < len(inputs):
+            end = text.find(f"\n\nInput: {inputs[index + 1]}\nOutput: ", start)
+            if end < 0:
+                return None
+            cases.append((input_value, text[start:end]))
+            position = end + 2
+        else:
+            cases.append((input_value, text[start:].rstrip("\n")))
+    return cases
+
+
+def read_output_cases(path: str, inputs: list) -> list | None:
+    try:
+        with open(path, "r", encoding="utf-8") as output_file:
+            return parse_output_cases(output_file.read(), inputs)
+    except OSError:
+        return None
+
+
+def stored_timeout_notes(grade_path: str) -> tuple[str | None, str | None]:
+    """Return the Timeout Limits and Timeout Budget Skipped notes recorded by the last full run."""
+    try:
+        with open(grade_path, "r", encoding="utf-8") as grade_file:
+            grade_text = grade_file.read()
+    except OSError:
+        return None, None
+    limits_match = TIMEOUT_LIMITS_PATTERN.search(grade_text)
+    budget_match = TIMEOUT_BUDGET_PATTERN.search(grade_text)
+    return (
+        limits_match.group(1).strip() if limits_match else None,
+        budget_match.group(1).strip() if budget_match else None,
+    )
+
+
+def stored_complexity_result(metrics_folder: str, student_id: str, config: dict | None) -> ComplexityCheckResult | None:
+    """Re-evaluate the profile timings of the last full run against the current complexity config.
+
+    Timings measured on different profile sizes are ignored, since they no longer match the config.
+    """
+    if config is None:
+        return None
+    measurements = load_complexity_measurements(metrics_folder, student_id)
+    if measurements is None:
+        return None
+    if measurements["sizes"] != [entry.get("size") for entry in config.get("inputs") or []]:
+        return None
+    return evaluate_complexity(config, measurements["sizes"], measurements["times"], measurements["reference_times"])
+
+
+def stored_student_ids(folder_path: str) -> list:
+    if not os.path.isdir(folder_path):
+        return []
+    return sorted(
+        os.path.splitext(name)[0]
+        for name in os.listdir(folder_path)
+        if name.endswith(".txt") and os.path.splitext(name)[0] != EXAMPLE_STUDENT_ID
+    )
+
+
+def rescore_folder(
+    folder_name: str,
+    progress_callback: Optional[Callable[[int, int, str], None]] = None,
+    cancel_event: Optional[threading.Event] = None,
+    scoring_mode: str = "percentage",
+    deduction_per_error: float = 0,
+) -> str:
+    """Regrade every stored output in one question folder with the current checker and scoring settings.
+
+    Students with only a compilation-error grade file are left untouched; their
+    grade does not depend on the checker.
+    """
+    log(f"Rescoring stored outputs in {folder_name}...", "info")
+    inputs = read_inputs_from_file(folder_name)
+    if not inputs:
+        return "warning"
+
+    reference_path = os.path.join(folder_name, REFERENCE_OUTPUT_FILENAME)
+    ground_truth = read_output_cases(reference_path, inputs)
+    if ground_truth is None:
+        log(
+            f"{reference_path} is missing or does not match input.txt; run a full grading for {folder_name} first.",
+            "error",
+        )
+        return "error"
+
+    output_folder = os.path.join(folder_name, "output")
+    grade_folder = os.path.join(folder_name, "grade")
+    repair_output_folder = os.path.join(folder_name, "llm_fixed_output")
+    metrics_folder = os.path.join(folder_name, METRICS_FOLDER_NAME)
+    checker_config = get_question_checker_config(folder_name)
+    reference_fields = prepare_reference_fields(folder_name, checker_config, ground_truth)
+    complexity_config = profile_config(checker_config)
+    os.makedirs(grade_folder, exist_ok=True)
+
+    plain_ids = stored_student_ids(output_folder)
+    repaired_ids = [student_id for student_id in stored_student_ids(repair_output_folder) if student_id not in plain_ids]
+    total = len(plain_ids) + len(repaired_ids)
+    description = f"[{folder_name}] Rescoring"
+    rescored_count = 0
+    skipped = []
+
+    for index, student_id in enumerate(plain_ids + repaired_ids, start=1):
+        if cancel_event and cancel_event.is_set():
+            return "cancelled"
+        repaired = student_id in repaired_ids
+        output_path = os.path.join(repair_output_folder if repaired else output_folder, f"{student_id}.txt")
+        grade_path = os.path.join(grade_folder, f"{student_id}.txt")
+        actual_outputs = read_output_cases(output_path, inputs)
+        repair_result = None
+        source_path = os.path.join(folder_name, "C", f"{student_id}.c")
+        if repaired:
+            repair_result = load_repair_report(os.path.join(folder_name, "llm_fixed", student_id))
+            if repair_result and repair_result.fixed:
+                source_path = repair_result.fixed_code_path
+            else:
+                actual_outputs = None
+
+        if actual_outputs is None:
+            skipped.append(student_id)
+        else:
+            timeout_note, timeout_budget_note = stored_timeout_notes(grade_path)
+            write_student_results(
+                student_id,
+                source_path,
+                actual_outputs,
+                ground_truth,
+                os.path.dirname(output_path),
+                grade_folder,
+                folder_name,
+                scoring_mode,
+                deduction_per_error,
+                repair_result,
+                timeout_note,
+                timeout_budget_note,
+                stored_complexity_result(metrics_folder, student_id, complexity_config),
+                checker_config,
+                reference_fields,
+            )
+            rescored_count += 1
+        if progress_callback:
+            progress_callback(index, total, description)
+
+    if skipped:
+        log(
+            f"{folder_name}: kept existing grades for {len(skipped)} student(s) whose stored output "
+            f"does not match input.txt: {', '.join(skipped)}",
+            "warning",
+        )
+    log(f"{folder_name}: rescored {rescored_count}/{total} stored output(s).", "success" if not skipped else "warning")
+    return "warning" if skipped or not total else "success"
+
+
+def rescore_all_questions(
+    questions_arr: list,
+    progress_callback: Optional[Callable[[int, int, str], None]] = None,
+    cancel_event: Optional[threading.Event] = None,
+    scoring_mode: str = "percentage",
+    deduction_per_error: float = 0,
+) -> list:
+    results = []
+    for question in questions_arr:
+        if cancel_event and cancel_event.is_set():
+            log("Rescoring cancelled.", "warning", verbosity=1)
+            break
+        results.append(
+            (question, rescore_folder(question, progress_callback, cancel_event, scoring_mode, deduction_per_error))
+        )
+    log(f"Rescored Questions: {', '.join(f'{q}({s})' for q, s in results)}", "info", verbosity=1)
+    return results
@@ -0,0 +1,98 @@
+"""Per-student run manifest used to skip unchanged submissions on incremental regrades."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from typing import Any
+
+from .complexity_analysis import profile_config
+from .verification import stable_fingerprint
+
+
+MANIFEST_FILENAME = "run_manifest.json"
+MANIFEST_VERSION = 1
+
+
+def grading_context(
+    inputs: list,
+    ground_truth: list,
+    checker_config: dict | None,
+    settings: dict[str, Any],
+    folder_name: str | None = None,
+) -> dict:
+    """Hash everything except the source that can change a student's grade in one question.
+
+    With `folder_name`, the complexity profile's `file` inputs (read relative to
+    it) are hashed too, since the checker config only names them.
+    """
+    return {
+        "inputs": stable_fingerprint(list(inputs)),
+        "ground_truth": stable_fingerprint([list(case) for case in ground_truth]),
+        "checker_config": stable_fingerprint(checker_config or {}),
+        "settings": stable_fingerprint(settings),
+        "profile_inputs": _profile_input_files_fingerprint(folder_name, checker_config) if folder_name else "",
+    }
+
+
+def _profile_input_files_fingerprint(folder_name: str, checker_config: dict | None) -> str:
+    config = profile_config(checker_config)
+    entries = config.get("inputs") if config else None
+    digests = []
+    for entry in entries if isinstance(entries, list) else []:
+        if not isinstance(entry, dict) or not isinstance(entry.get("file"), str):
+            continue
+        digest = hashlib.sha256()
+        try:
+            with open(os.path.join(folder_name, entry["file"]), "rb") as input_file:
+                for chunk in iter(lambda: input_file.read(1024 * 1024), b""):
+                    digest.update(chunk)
+        except OSError:
+            digests.append((entry["file"], None))
+            continue
+        digests.append((entry["file"], digest.hexdigest()))
+    return stable_fingerprint(digests)
+
+
+def student_fingerprint(source_path: str, context: dict) -> dict | None:
+    digest = hashlib.sha256()
+    try:
+        with open(source_path, "rb") as source_file:
+            for chunk in iter(lambda: source_file.read(1024 * 1024), b""):
+                digest.update(chunk)
+    except OSError:
+        return None
+    return {"source": digest.hexdigest()[:20], **context}
+
+
+def load_manifest(folder_name: str) -> dict:
+    """Return the recorded fingerprints by student file name, or {} when missing/invalid."""
+    try:
+        with open(os.path.join(folder_name, MANIFEST_FILENAME), "r", encoding="utf-8") as manifest_file:
+            payload = json.load(manifest_file)
+    except (OSError, json.JSONDecodeError):
+        return {}
+    if not isinstance(payload, dict) or payload.get("version") != MANIFEST_VERSION:
+        return {}
+    students = payload.get("students")
+    return students if isinstance(students, dict) else {}
+
+
+def save_manifest(folder_name: str, students: dict) -> None:
+    path = os.path.join(folder_name, MANIFEST_FILENAME)
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as manifest_file:
+        json.dump({"version": MANIFEST_VERSION, "students": students}, manifest_file, indent=2, sort_keys=True)
+    os.replace(temp_path, path)
+
+
+def unchanged_students(manifest: dict, fingerprints: dict, grade_folder: str) -> set:
+    """Return the student files whose fingerprint matches the manifest and whose grade file still exists."""
+    return {
+        file
+        for file, fingerprint in fingerprints.items()
+        if fingerprint is not None
+        and manifest.get(file) == fingerprint
+        and os.path.isfile(os.path.join(grade_folder, file.replace(".c", ".txt")))
+    }
@@ -0,0 +1,107 @@
+"""Per-student run metrics sidecars (QN/metrics/<student>.json) and their summaries."""
+
+from __future__ import annotations
+
+import json
+import os
+import statistics
+
+
+METRICS_FOLDER_NAME = "metrics"
+METRICS_VERSION = 1
+
+
+def run_outcome(result) -> str:
+    output = result.output
+    if result.skipped:
+        return "skipped"
+    if output == "Timeout":
+        return "timeout"
+    if output == "Output limit exceeded":
+        return "output_limit"
+    if output.startswith("Runtime Error:"):
+        return "runtime_error"
+    if output.startswith("Error:"):
+        return "error"
+    return "ok"
+
+
+def median_slowdown(runtimes: list, reference_runtimes: list) -> float | None:
+    """Median of runtime / reference runtime over inputs where both were measured."""
+    ratios = [
+        runtime / reference
+        for runtime, reference in zip(runtimes, reference_runtimes)
+        if runtime is not None and reference
+    ]
+    return round(statistics.median(ratios), 3) if ratios else None
+
+
+def build_student_metrics(results: list, runtimes: list, reference_runtimes: list) -> dict:
+    """`results` are ExecutionResults per input; `runtimes` the time compared against the reference."""
+    runs = []
+    for index, (result, runtime) in enumerate(zip(results, runtimes)):
+        runs.append({
+            "index": index,
+            "outcome": run_outcome(result),
+            "wall_time": round(result.wall_time, 6),
+            "cpu_time": None if result.cpu_time is None else round(result.cpu_time, 6),
+            "peak_rss_kb": result.peak_rss_kb,
+            "exit_status": result.exit_status,
+            "reference_time": round(reference_runtimes[index], 6) if index < len(reference_runtimes) else None,
+        })
+    executed = [runtime for run, runtime in zip(runs, runtimes) if run["outcome"] != "skipped"]
+    peak_values = [run["peak_rss_kb"] for run in runs if run["peak_rss_kb"] is not None]
+    return {
+        "version": METRICS_VERSION,
+        "summary": {
+            "median_slowdown": median_slowdown(
+                [runtime if run["outcome"] != "skipped" else None for run, runtime in zip(runs, runtimes)],
+                reference_runtimes,
+            ),
+            "total_time": round(sum(executed), 6),
+            "peak_rss_kb": max(peak_values) if peak_values else None,
+        },
+        "runs": runs,
+    }
+
+
+def complexity_measurements(sizes: list, times: list, reference_times: list) -> dict:
+    """Profile timings stored in the sidecar so `--rescore` can re-evaluate them under a changed config."""
+    return {
+        "sizes": list(sizes),
+        "times": [None if time_value is None else round(time_value, 6) for time_value in times],
+        "reference_times": [round(time_value, 6) for time_value in reference_times],
+    }
+
+
+def write_student_metrics(metrics_folder: str, student_id: str, metrics: dict) -> None:
+    os.makedirs(metrics_folder, exist_ok=True)
+    with open(os.path.join(metrics_folder, f"{student_id}.json"), "w", encoding="utf-8") as metrics_file:
+        json.dump(metrics, metrics_file, indent=2)
+
+
+def load_student_metrics(metrics_folder: str, student_id: str) -> dict:
+    """Return a student's sidecar, or {} when missing/invalid."""
+    try:
+        with open(os.path.join(metrics_folder, f"{student_id}.json"), "r", encoding="utf-8") as metrics_file:
+            payload = json.load(metrics_file)
+    except (OSError, json.JSONDecodeError):
+        return {}
+    if not isinstance(payload, dict) or payload.get("version") != METRICS_VERSION:
+        return {}
+    return payload
+
+
+def load_metrics_summary(metrics_folder: str, student_id: str) -> dict:
+    """Return the summary block of a student's sidecar, or {} when missing/invalid."""
+    summary = load_student_metrics(metrics_folder, student_id).get("summary")
+    return summary if isinstance(summary, dict) else {}
+
+
+def load_complexity_measurements(metrics_folder: str, student_id: str) -> dict | None:
+    measurements = load_student_metrics(metrics_folder, student_id).get("complexity")
+    if not isinstance(measurements, dict):
+        return None
+    if not all(isinstance(measurements.get(key), list) for key in ("sizes", "times", "reference_times")):
+        return None
+    return measurements
@@ -0,0 +1,187 @@
+"""Tiny C launcher that reports a POSIX child's own CPU time and peak RSS.
+
+The kernel carries the parent's RSS high-water mark over fork and exec, so the
+ru_maxrss wait4 returns for a child of the grader is never below the grader's
+own peak. The launcher is exec'd by the grader, forks the student program from
+its own small address space, and after one blocking wait4 writes the program's
+rusage to a report pipe. It then exits with the program's status, so callers
+see the same return code as if they had started the program themselves.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+
+from .utils import log
+
+
+LAUNCHER_SOURCE = r"""
+#define _GNU_SOURCE
+#include <errno.h>
+#include <signal.h>
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+#include <unistd.h>
+#include <sys/resource.h>
+#include <sys/time.h>
+#include <sys/types.h>
+#include <sys/wait.h>
+
+/* usage: launcher REPORT_FD CPU_SECONDS MEMORY_BYTES PROGRAM [ARGS...]; 0 disables a limit. */
+
+static volatile pid_t child;
+
+static void stop_child(int signo)
+{
+    (void)signo;
+    if (child > 0)
+        kill(-child, SIGKILL);
+}
+
+int main(int argc, char **argv)
+{
+    if (argc < 5)
+        return 126;
+    int report = atoi(argv[1]);
+    rlim_t cpu_seconds = (rlim_t)strtoull(argv[2], NULL, 10);
+    rlim_t memory_bytes = (rlim_t)strtoull(argv[3], NULL, 10);
+
+    /* SIGTERM stays blocked until `child` is set, so a kill never races the fork. */
+    sigset_t term, previous;
+    sigemptyset(&term);
+    sigaddset(&term, SIGTERM);
+    sigprocmask(SIG_BLOCK, &term, &previous);
+
+    pid_t pid = fork();
+    if (pid < 0)
+        return 126;
+    if (pid == 0) {
+        setpgid(0, 0);
+        sigprocmask(SIG_SETMASK, &previous, NULL);
+        close(report);
+        if (cpu_seconds) {
+            struct rlimit limit = {cpu_seconds, cpu_seconds + 1};
+            setrlimit(RLIMIT_CPU, &limit);
+        }
+        if (memory_bytes) {
+            struct rlimit limit = {memory_bytes, memory_bytes};
+            setrlimit(RLIMIT_AS, &limit);
+        }
+        execv(argv[4], argv + 4);
+        perror(argv[4]);
+        _exit(127);
+    }
+    setpgid(pid, pid);
+    child = pid;
+    struct sigaction action;
+    memset(&action, 0, sizeof action);
+    action.sa_handler = stop_child;
+    sigaction(SIGTERM, &action, NULL);
+    sigprocmask(SIG_SETMASK, &previous, NULL);
+    /* The program owns the pipes; holding them here would only delay EOF. */
+    close(0);
+    close(1);
+    close(2);
+
+    int status;
+    struct rusage usage;
+    while (wait4(pid, &status, 0, &usage) < 0) {
+        if (errno != EINTR)
+            return 126;
+    }
+    long long cpu_us = (long long)(usage.ru_utime.tv_sec + usage.ru_stime.tv_sec) * 1000000LL
+        + usage.ru_utime.tv_usec + usage.ru_stime.tv_usec;
+    dprintf(report, "%ld %lld\n", (long)usage.ru_maxrss, cpu_us);
+    close(report);
+
+    if (WIFSIGNALED(status)) {
+        int signo = WTERMSIG(status);
+        struct rlimit no_core = {0, 0};
+        setrlimit(RLIMIT_CORE, &no_core);
+        signal(signo, SIG_DFL);
+        sigset_t only;
+        sigemptyset(&only);
+        sigaddset(&only, signo);
+        sigprocmask(SIG_UNBLOCK, &only, NULL);
+        raise(signo);
+        return 128 + signo;
+    }
+    return WEXITSTATUS(status);
+}
+"""
+
+LAUNCHER_COMPILERS = ("cc", "gcc", "clang")
+
+_launcher_lock = threading.Lock()
+_launcher_path: str | None = None
+_launcher_built = False
+
+
+def launcher_cache_dir() -> str:
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "c_tester")
+
+
+def launcher_path() -> str | None:
+    """Return the launcher executable, building it on first use; None if it cannot be built."""
+    global _launcher_path, _launcher_built
+    with _launcher_lock:
+        if not _launcher_built:
+            _launcher_built = True
+            _launcher_path = _build_launcher()
+            if _launcher_path is None:
+                log("No C compiler for the rusage launcher; CPU time and peak RSS will not be recorded.", "warning", verbosity=1)
+        return _launcher_path
+
+
+def _build_launcher() -> str | None:
+    if os.name != "posix":
+        return None
+    digest = hashlib.sha256(LAUNCHER_SOURCE.encode("utf-8")).hexdigest()[:12]
+    cache_dir = launcher_cache_dir()
+    executable = os.path.join(cache_dir, f"rusage_launcher-{digest}")
+    if os.access(executable, os.X_OK):
+        return executable
+    compiler = next((shutil.which(name) for name in LAUNCHER_COMPILERS if shutil.which(name)), None)
+    if compiler is None:
+        return None
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        with tempfile.TemporaryDirectory() as build_dir:
+            source = os.path.join(build_dir, "launcher.c")
+            with open(source, "w", encoding="utf-8") as source_file:
+                source_file.write(LAUNCHER_SOURCE)
+            # Build next to the final path and rename, so concurrent graders never run a partial file.
+            staged = f"{executable}.{os.getpid()}.tmp"
+            try:
+                # A static launcher skips the dynamic loader, which is most of its start-up cost.
+                subprocess.run([compiler, "-O2", "-static", "-o", staged, source], check=True, capture_output=True)
+            except subprocess.CalledProcessError:
+                subprocess.run([compiler, "-O2", "-o", staged, source], check=True, capture_output=True)
+            os.replace(staged, executable)
+    except (OSError, subprocess.CalledProcessError) as e:
+        log(f"Could not build the rusage launcher: {e}", "warning", verbosity=1)
+        return None
+    return executable
+
+
+def launch_command(launcher: str, report_fd: int, executable_path: str, cpu_seconds: int = 0, memory_bytes: int = 0) -> list:
+    return [launcher, str(report_fd), str(cpu_seconds), str(memory_bytes), executable_path]
+
+
+def parse_report(report: bytes):
+    """Return (cpu_time, peak_rss_kb) from a launcher report; (None, None) if it never arrived."""
+    try:
+        maxrss, cpu_us = (int(field) for field in report.split())
+    except ValueError:
+        return None, None
+    # ru_maxrss is in kilobytes on Linux but in bytes on macOS.
+    peak_rss_kb = maxrss // 1024 if sys.platform == "darwin" else maxrss
+    return cpu_us / 1_000_000, peak_rss_kb
@@ -1,12 +1,25 @@
 """Configurable output comparison helpers."""
 
-from dataclasses import dataclass
+from collections import OrderedDict
+import copy
+from dataclasses import dataclass, replace
+import functools
+import hashlib
 import json
 import os
 import re
+import threading
+import time
 from typing import Any
 
-from .output_contract import ContractConfigError, compile_preset, evaluate_contract, validate_contract
+from .output_contract import (
+    ContractConfigError,
+    ContractPlan,
+    ReferenceFields,
+    compile_contract,
+    compile_preset,
+    validate_contract,
+)
 
 
 @dataclass(frozen=True)
@@ -17,7 +30,108 @@ class ComparisonResult:
     actual_canonical: Any = None
 
 
+@dataclass(frozen=True)
+class CompiledChecker:
+    """A question's checker compiled once; `compare` is the per-case hot path.
+
+    An actual output byte-identical to the reference still gets a full verdict
+    (a contract may reject its own reference); the plan skips re-extracting it,
+    and ComparisonMemo reuses that verdict for the rest of the run.
+    """
+
+    plan: ContractPlan | None
+    error: str = ""
+
+    def reference_fields(self, input_value: str, expected_output: str) -> ReferenceFields | None:
+        """Precompute the fields that do not depend on the student's output, or None without a plan."""
+        return self.plan.extract_reference_fields(input_value, expected_output) if self.plan else None
+
+    def compare(
+        self,
+        input_value: str,
+        expected_output: str,
+        actual_output: str,
+        reference_fields: ReferenceFields | None = None,
+    ) -> ComparisonResult:
+        if self.plan is None:
+            return ComparisonResult(False, self.error, _clean_output(expected_output), _clean_output(actual_output))
+        result = self.plan.evaluate(input_value, expected_output, actual_output, reference_fields)
+        return ComparisonResult(result.passed, result.reason, result.expected_canonical, result.actual_canonical)
+
+
+# Stands in for the output digest when the actual output is the reference itself.
+_IDENTICAL_TO_REFERENCE = b""
+
+
+class ComparisonMemo:
+    """Size-bounded LRU of comparison results for one grading run.
+
+    Many students print byte-identical output for an input, so a result is
+    reused when the compiled checker, input, reference output and a hash of
+    the actual output all match. Outputs identical to the reference skip the
+    hash, so the checker judges the reference against itself once per input and run.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._results: OrderedDict = OrderedDict()
+        # Keeps memoized checkers alive so their ids are not reused by new ones.
+        self._checkers: dict[int, CompiledChecker] = {}
+        self._lock = threading.Lock()
+
+    def compare(
+        self,
+        checker: CompiledChecker,
+        input_value: str,
+        expected_output: str,
+        actual_output: str,
+        reference_fields: ReferenceFields | None = None,
+    ) -> ComparisonResult:
+        digest = _IDENTICAL_TO_REFERENCE if actual_output == expected_output else _output_digest(actual_output)
+        key = (id(checker), input_value, expected_output, digest)
+        with self._lock:
+            result = self._results.get(key)
+            if result is not None:
+                self._results.move_to_end(key)
+                self.hits += 1
+                return result
+            self.misses += 1
+        result = checker.compare(input_value, expected_output, actual_output, reference_fields)
+        with self._lock:
+            self._checkers.setdefault(id(checker), checker)
+            self._results[key] = result
+            while len(self._results) > self.max_entries:
+                self._results.popitem(last=False)
+        return result
+
+
+def _output_digest(output: str) -> bytes:
+    return hashlib.blake2b(str(output).encode("utf-8", "surrogatepass"), digest_size=16).digest()
+
+
+@dataclass(frozen=True)
+class CheckerConfigSnapshot:
+    """One parsed version of a checker config file; `config` is shared and must not be modified."""
+
+    config: dict
+    signature: tuple | None = None
+    raw: bytes = b""
+    loaded_at_ns: int = 0
+
+    def question_config(self, question_name: str) -> dict:
+        """Return an editable copy of one question's checker config."""
+        config = self.config.get("questions", {}).get((question_name or "").upper(), {"checker": "exact", "config": {}})
+        return copy.deepcopy(config)
+
+
 DEFAULT_CHECKER_CONFIG_PATH = "checker_config.json"
+# A file modified this close to when it was read may change again without its
+# mtime moving (coarse filesystem timestamps), so its bytes are compared instead.
+RACY_MTIME_WINDOW_NS = 2_000_000_000
+_CONFIG_SNAPSHOTS: dict[str, CheckerConfigSnapshot] = {}
+_CONFIG_SNAPSHOTS_LOCK = threading.Lock()
 
 CHECKER_TEMPLATES = {
     "exact": {
@@ -105,46 +219,105 @@ def compare_output(question_name: str, input_value: str, expected_output: str, a
 
 def compare_output_with_config(checker_config: dict, input_value: str, expected_output: str, actual_output: str) -> ComparisonResult:
     """Compare one test case output using a saved checker configuration."""
+    return compile_checker(checker_config).compare(input_value, expected_output, actual_output)
+
+
+def compile_checker(checker_config: dict) -> CompiledChecker:
+    """Compile a question's checker config; identical configs share one compiled checker.
+
+    Compile once per student or run and call `compare` per case to skip even the cache lookup.
+    """
     if not isinstance(checker_config, dict):
-        return ComparisonResult(
-            False,
-            "checker configuration must be a JSON object",
-            _clean_output(expected_output),
-            _clean_output(actual_output),
-        )
-    checker_name = (checker_config or {}).get("checker", "exact")
-    config = (checker_config or {}).get("config", {})
+        return CompiledChecker(None, "checker configuration must be a JSON object")
+    checker_name = checker_config.get("checker", "exact")
+    config = checker_config.get("config", {})
+    try:
+        key = json.dumps([checker_name, config], sort_keys=True)
+    except (TypeError, ValueError):
+        return _compile_checker(checker_name, config)
+    return _compile_checker_cached(key)
+
+
+@functools.lru_cache(maxsize=64)
+def _compile_checker_cached(key: str) -> CompiledChecker:
+    # Compiled from the serialized key so later edits to the caller's dict cannot reach the cached plan.
+    checker_name, config = json.loads(key)
+    return _compile_checker(checker_name, config)
+
+
+def _compile_checker(checker_name: str, config: dict) -> CompiledChecker:
     try:
         contract = compile_preset(checker_name, config)
     except ContractConfigError as exc:
-        return ComparisonResult(False, str(exc), _clean_output(expected_output), _clean_output(actual_output))
-    result = evaluate_contract(contract, input_value, expected_output, actual_output)
-    return ComparisonResult(result.passed, result.reason, result.expected_canonical, result.actual_canonical)
+        return CompiledChecker(None, str(exc))
+    return CompiledChecker(compile_contract(contract))
 
 
 def get_question_checker_config(question_name: str, config_path: str = DEFAULT_CHECKER_CONFIG_PATH) -> dict:
-    all_config = load_checker_config(config_path)
-    questions = all_config.get("questions", {})
-    return questions.get((question_name or "").upper(), {"checker": "exact", "config": {}})
+    return checker_config_snapshot(config_path).question_config(question_name)
 
 
 def load_checker_config(config_path: str = DEFAULT_CHECKER_CONFIG_PATH) -> dict:
-    if not os.path.exists(config_path):
-        return DEFAULT_CHECKER_CONFIG.copy()
+    """Return an editable copy of the checker config."""
+    return copy.deepcopy(checker_config_snapshot(config_path).config)
+
+
+def checker_config_snapshot(config_path: str = DEFAULT_CHECKER_CONFIG_PATH) -> CheckerConfigSnapshot:
+    """Return the parsed checker config, re-reading the file only after its mtime or size changed.
+
+    Take one snapshot per grading run so every student is graded against the
+    same version, even if the file is saved mid-run.
+    """
+    key = os.path.abspath(config_path)
     try:
-        with open(config_path, "r", encoding="utf-8") as config_file:
-            loaded = json.load(config_file)
-    except (OSError, json.JSONDecodeError):
-        return DEFAULT_CHECKER_CONFIG.copy()
+        stat = os.stat(config_path)
+        signature = (stat.st_mtime_ns, stat.st_size)
+    except OSError:
+        signature = None
+    with _CONFIG_SNAPSHOTS_LOCK:
+        cached = _CONFIG_SNAPSHOTS.get(key)
+    if cached is not None and cached.signature == signature:
+        if signature is None or signature[0] < cached.loaded_at_ns - RACY_MTIME_WINDOW_NS:
+            return cached
+
+    loaded_at_ns = time.time_ns()
+    raw = b""
+    if signature is not None:
+        try:
+            with open(config_path, "rb") as config_file:
+                raw = config_file.read()
+        except OSError:
+            signature = None
+    if cached is not None and cached.signature == signature and cached.raw == raw:
+        snapshot = replace(cached, loaded_at_ns=loaded_at_ns)
+    else:
+        config = _parse_checker_config(raw) if signature else _default_checker_config()
+        snapshot = CheckerConfigSnapshot(config, signature, raw, loaded_at_ns)
+    with _CONFIG_SNAPSHOTS_LOCK:
+        _CONFIG_SNAPSHOTS[key] = snapshot
+    return snapshot
+
+
+def _parse_checker_config(raw: bytes) -> dict:
+    try:
+        loaded = json.loads(raw.decode("utf-8"))
+    except ValueError:
+        return _default_checker_config()
     if not isinstance(loaded, dict):
-        return DEFAULT_CHECKER_CONFIG.copy()
+        return _default_checker_config()
     loaded.setdefault("questions", {})
     return loaded
 
 
+def _default_checker_config() -> dict:
+    return copy.deepcopy(DEFAULT_CHECKER_CONFIG)
+
+
 def save_checker_config(config: dict, config_path: str = DEFAULT_CHECKER_CONFIG_PATH):
     with open(config_path, "w", encoding="utf-8") as config_file:
         json.dump(config, config_file, indent=2, sort_keys=True)
+    with _CONFIG_SNAPSHOTS_LOCK:
+        _CONFIG_SNAPSHOTS.pop(os.path.abspath(config_path), None)
 
 
 def available_checker_templates() -> dict:
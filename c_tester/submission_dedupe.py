@@ -0,0 +1,141 @@
+"""Group byte-identical or whitespace-only-different submissions so each is compiled and run once."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+
+
+DUPLICATE_REPORT_FILENAME = "duplicate_groups.json"
+
+
+# Punctuators that never merge with a neighbouring character into a longer token,
+# so whitespace next to them carries no meaning outside preprocessor directives.
+SEPARATOR_PUNCTUATORS = set("(){}[];,")
+
+
+def normalize_source(source: str) -> str:
+    """Normalize whitespace that cannot change how a C file compiles.
+
+    Outside string/char literals, comments and preprocessor directives,
+    whitespace runs become one space, or disappear next to (){}[];, so
+    brace and spacing styles do not matter. Line breaks are kept only where
+    they end a directive or a // comment. Literals and comments are kept verbatim.
+    """
+    text = source.replace("\r\n", "\n").replace("\r", "\n")
+    result = []
+    index = 0
+    length = len(text)
+    pending_space = False
+    pending_newline = False
+    in_directive = False
+    after_line_comment = False
+
+    def flush_whitespace(next_char):
+        nonlocal pending_space, pending_newline, in_directive
+        previous = result[-1] if result else ""
+        if not previous:
+            pass
+        elif pending_newline and (in_directive or after_line_comment or next_char == "#" or previous.endswith("\\")):
+            # "\\ <newline>" may or may not be a line continuation depending on the compiler.
+            result.append(" \n" if pending_space and previous.endswith("\\") else "\n")
+            in_directive = in_directive and previous.endswith("\\")
+        elif pending_space or pending_newline:
+            if in_directive or not (previous[-1] in SEPARATOR_PUNCTUATORS or next_char in SEPARATOR_PUNCTUATORS):
+                result.append(" ")
+        pending_space = pending_newline = False
+
+    while index < length:
+        char = text[index]
+        if char == "\n":
+            pending_newline = True
+            index += 1
+            continue
+        if char in " \t\f\v":
+            # Only whitespace before the first line break matters (see flush_whitespace).
+            pending_space = pending_space or not pending_newline
+            index += 1
+            continue
+
+        at_line_start = not result or pending_newline
+        flush_whitespace(char)
+        after_line_comment = False
+        if char in "\"'":
+            end = _literal_end(text, index, char)
+        elif text.startswith("//", index):
+            end = text.find("\n", index)
+            end = length if end < 0 else end
+            after_line_comment = True
+        elif text.startswith("/*", index):
+            end = text.find("*/", index + 2)
+            end = length if end < 0 else end + 2
+        else:
+            end = index + 1
+            if char == "#" and at_line_start:
+                in_directive = True
+        result.append(text[index:end])
+        index = end
+
+    return "".join(result)
+
+
+def _literal_end(text: str, start: int, quote: str) -> int:
+    index = start + 1
+    while index < len(text):
+        char = text[index]
+        if char == "\\":
+            index += 2
+            continue
+        if char == quote:
+            return index + 1
+        if char == "\n":
+            return index
+        index += 1
+    return len(text)
+
+
+def source_hash(path: str) -> str | None:
+    try:
+        with open(path, "r", encoding="utf-8", errors="surrogateescape") as source_file:
+            normalized = normalize_source(source_file.read())
+    except OSError:
+        return None
+    return hashlib.sha256(normalized.encode("utf-8", errors="surrogateescape")).hexdigest()
+
+
+def group_submissions(c_files_dir: str, c_files: list) -> tuple[dict, dict]:
+    """Return ({representative: [members...]}, {file: hash}); the representative is listed first.
+
+    Unreadable files always form their own group.
+    """
+    groups = {}
+    hashes = {}
+    representative_by_hash = {}
+    for file in sorted(c_files):
+        digest = source_hash(os.path.join(c_files_dir, file))
+        hashes[file] = digest
+        representative = representative_by_hash.get(digest) if digest else None
+        if representative is None:
+            groups[file] = [file]
+            if digest:
+                representative_by_hash[digest] = file
+        else:
+            groups[representative].append(file)
+    return groups, hashes
+
+
+def write_duplicate_report(folder_name: str, groups: dict, hashes: dict) -> list:
+    """Write QN/duplicate_groups.json with every group of two or more submissions and return those groups."""
+    duplicate_groups = [
+        {
+            "hash": hashes.get(representative),
+            "representative": representative,
+            "members": members,
+        }
+        for representative, members in groups.items()
+        if len(members) > 1
+    ]
+    with open(os.path.join(folder_name, DUPLICATE_REPORT_FILENAME), "w", encoding="utf-8") as report_file:
+        json.dump({"groups": duplicate_groups}, report_file, indent=2)
+    return duplicate_groups
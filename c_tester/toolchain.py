@@ -0,0 +1,157 @@
+"""Compiler toolchains: how submissions are compiled and named, and how their runs are stopped."""
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+import os
+import shutil
+import signal
+import subprocess
+import time
+
+
+TOOLCHAINS = ("msvc", "gcc", "clang")
+
+
+class Toolchain(ABC):
+    """Base toolchain; process-group handling follows the host OS rather than the compiler.
+
+    Runs start in their own process group (Windows) or session (POSIX) so a
+    timed-out program is stopped together with anything it spawned.
+    """
+
+    name = ""
+    compiler = ""
+    display_name = ""
+    executable_suffix = ".exe"
+    object_suffix = ".o"
+    uses_visual_studio = False
+    # Whether several sources share one compiler run (see compile_files).
+    batches_compiles = False
+
+    def executable_path(self, c_file: str) -> str:
+        return os.path.splitext(c_file)[0] + self.executable_suffix
+
+    @abstractmethod
+    def compile_command(self, c_file: str, executable: str) -> str:
+        """Shell command that compiles and links `c_file` into `executable`."""
+
+    def batch_compile_command(self, source_names: list, object_dir: str) -> str:
+        """Compile (without linking) several sources; only toolchains with `batches_compiles` implement it.
+
+        Each source `x.c` produces `x` + `object_suffix` in `object_dir`.
+        """
+        raise NotImplementedError(f"{self.name} compiles one source per invocation")
+
+    def link_command(self, object_file: str, executable: str) -> str:
+        """Shell command that links one object file into `executable`; linkers emit one executable per run."""
+        raise NotImplementedError(f"{self.name} compiles one source per invocation")
+
+    @abstractmethod
+    def syntax_check_command(self, source_names: list) -> str:
+        """Parse and type-check sources without generating code, run from their directory."""
+
+    @abstractmethod
+    def banner_command(self) -> str:
+        """Shell command whose first output line identifies the compiler version."""
+
+    def is_available(self) -> bool:
+        return shutil.which(self.compiler) is not None
+
+    def popen_kwargs(self) -> dict:
+        if os.name == "nt":
+            return {"creationflags": getattr(subprocess, "CREATE_NEW_PROCESS_GROUP", 0)}
+        return {"start_new_session": True}
+
+    def terminate(self, process) -> None:
+        """Stop a timed-out run politely, then forcefully."""
+        try:
+            if os.name == "nt":
+                process.send_signal(signal.CTRL_BREAK_EVENT)
+            else:
+                os.killpg(process.pid, signal.SIGTERM)
+            time.sleep(0.1)  # Give it a moment to handle the signal
+            if process.poll() is None:
+                process.terminate()
+                time.sleep(0.1)
+        except OSError:
+            pass
+        if process.poll() is None:
+            self.kill(process)
+
+    def kill(self, process) -> None:
+        if os.name != "nt":
+            try:
+                os.killpg(process.pid, signal.SIGKILL)
+            except OSError:
+                pass
+        try:
+            process.kill()
+        except OSError:
+            pass
+
+
+class MsvcToolchain(Toolchain):
+    name = "msvc"
+    compiler = "cl"
+    display_name = "the Visual Studio compiler"
+    object_suffix = ".obj"
+    uses_visual_studio = True
+    # cl's start-up is paid once per batch; /MP also compiles the batch in parallel.
+    batches_compiles = True
+
+    def compile_command(self, c_file: str, executable: str) -> str:
+        # A per-file /Fo keeps concurrent compiles of same-named files (e.g. one
+        # student ID in several questions) from sharing an .obj in the working directory.
+        object_file = os.path.splitext(executable)[0] + ".obj"
+        return f'cl /TC /EHsc /O2 /Fo"{object_file}" /Fe"{executable}" "{c_file}"'
+
+    def batch_compile_command(self, source_names: list, object_dir: str) -> str:
+        # /MP compiles the listed sources in parallel inside one cl process. A /Fo
+        # ending in a backslash names the directory every object goes to; it is
+        # doubled so it does not escape the closing quote.
+        sources = " ".join(f'"{name}"' for name in source_names)
+        return f'cl /nologo /c /TC /EHsc /MP /O2 /Fo"{object_dir}\\\\" {sources}'
+
+    def link_command(self, object_file: str, executable: str) -> str:
+        return f'cl /nologo /Fe"{executable}" "{object_file}"'
+
+    def syntax_check_command(self, source_names: list) -> str:
+        sources = " ".join(f'"{name}"' for name in source_names)
+        return f"cl /nologo /Zs /TC {sources}"
+
+    def banner_command(self) -> str:
+        # cl prints its version banner to stderr when run without arguments.
+        return "cl"
+
+
+class GccToolchain(Toolchain):
+    """gcc or clang; both take the same flags. Executables keep the `.exe` suffix so cleanup stays uniform.
+
+    Each source gets its own compile-and-link run: the driver starts quickly,
+    so batching compiles saved nothing measurable while still paying one link per source.
+    """
+
+    def __init__(self, compiler: str = "gcc"):
+        self.name = compiler
+        self.compiler = compiler
+        self.display_name = compiler
+
+    def compile_command(self, c_file: str, executable: str) -> str:
+        # Compiling and linking in one step leaves no object file behind.
+        return f'{self.compiler} -x c -O2 -o "{executable}" "{c_file}" -lm'
+
+    def syntax_check_command(self, source_names: list) -> str:
+        sources = " ".join(f'"{name}"' for name in source_names)
+        return f"{self.compiler} -x c -fsyntax-only {sources}"
+
+    def banner_command(self) -> str:
+        return f"{self.compiler} --version"
+
+
+def get_toolchain(name: str) -> Toolchain:
+    if name == "msvc":
+        return MsvcToolchain()
+    if name in ("gcc", "clang"):
+        return GccToolchain(name)
+    raise ValueError(f"unknown toolchain '{name}'; expected one of: {', '.join(TOOLCHAINS)}")
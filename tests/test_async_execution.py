@@ -0,0 +1,151 @@
+import asyncio
+import os
+import stat
+import sys
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+
+from c_tester.async_execution import AsyncExecutionPool
+from c_tester.process import (
+    OUTPUT_LIMIT_EXCEEDED,
+    ExecutionOptions,
+    ExecutionResult,
+    GradingPipeline,
+    WorkerPools,
+    configure_resource_limits,
+    execute_program,
+    execute_program_async,
+)
+
+
+class TestAsyncExecutionPool(unittest.TestCase):
+    def test_live_runs_are_bounded_by_the_semaphore(self):
+        live = 0
+        peak = 0
+        lock = threading.Lock()
+
+        async def fake_run(value):
+            nonlocal live, peak
+            with lock:
+                live += 1
+                peak = max(peak, live)
+            await asyncio.sleep(0.02)
+            with lock:
+                live -= 1
+            return value * 2
+
+        pool = AsyncExecutionPool(2)
+        try:
+            futures = [pool.submit(fake_run, value) for value in range(8)]
+            self.assertEqual([future.result(timeout=5) for future in futures], [value * 2 for value in range(8)])
+        finally:
+            pool.shutdown()
+
+        self.assertEqual(peak, 2)
+
+    def test_shutdown_cancels_queued_runs(self):
+        release = threading.Event()
+
+        async def blocked():
+            while not release.is_set():
+                await asyncio.sleep(0.01)
+
+        pool = AsyncExecutionPool(1)
+        running = pool.submit(blocked)
+        queued = pool.submit(blocked)
+        pool.shutdown(cancel_futures=True)
+
+        self.assertTrue(running.cancelled() or running.done())
+        self.assertTrue(queued.cancelled())
+        with self.assertRaises(RuntimeError):
+            pool.submit(blocked)
+
+    def test_unknown_engine_is_rejected(self):
+        with self.assertRaises(ValueError):
+            WorkerPools(1, "processes")
+
+
+@unittest.skipUnless(os.name == "posix", "uses a shebang script as the student executable")
+class TestExecuteProgramAsync(unittest.TestCase):
+    def _script(self, directory, body):
+        path = os.path.join(directory, "student.exe")
+        with open(path, "w", encoding="utf-8") as script_file:
+            script_file.write(f"#!{sys.executable}\nimport sys\n{body}\n")
+        os.chmod(path, os.stat(path).st_mode | stat.S_IXUSR)
+        return path
+
+    def test_matches_thread_engine_results(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            echo = self._script(temp_dir, "print('got', sys.stdin.readline().strip())")
+            self.assertEqual(asyncio.run(execute_program_async(echo, "7")).output, "got 7")
+
+            failing = self._script(temp_dir, "sys.stderr.write('boom\\n'); sys.exit(3)")
+            self.assertEqual(asyncio.run(execute_program_async(failing, "7")).output, "Runtime Error: boom")
+
+            slow = self._script(temp_dir, "import time; time.sleep(5)")
+            result = asyncio.run(execute_program_async(slow, "7", timeout=0.2))
+            self.assertEqual(result.output, "Timeout")
+            self.assertLess(result.wall_time, 2)
+
+            flood = self._script(temp_dir, "while True:\n    sys.stdout.write('x' * 4096)")
+            with patch("c_tester.process._OUTPUT_LIMIT_BYTES", 64 * 1024):
+                result = asyncio.run(execute_program_async(flood, "7", timeout=10))
+            self.assertEqual(result.output, OUTPUT_LIMIT_EXCEEDED)
+            self.assertLess(result.wall_time, 5)
+
+            missing = asyncio.run(execute_program_async(os.path.join(temp_dir, "missing.exe"), "7"))
+            self.assertTrue(missing.output.startswith("Error: executable not found"))
+
+    def test_reports_the_same_metrics_and_cpu_verdicts_as_the_thread_engine(self):
+        self.addCleanup(configure_resource_limits, ExecutionOptions())
+        with tempfile.TemporaryDirectory() as temp_dir:
+            # Finishes well within the wall-clock safety net but uses more CPU than the limit.
+            busy = self._script(
+                temp_dir,
+                "import time\nend = time.process_time() + 0.5\nwhile time.process_time() < end:\n    pass\nprint('done')",
+            )
+
+            for resource_limits in (False, True):
+                configure_resource_limits(ExecutionOptions(resource_limits=resource_limits))
+                threaded = execute_program(busy, "7", timeout=0.3 if resource_limits else 5)
+                asynchronous = asyncio.run(execute_program_async(busy, "7", timeout=0.3 if resource_limits else 5))
+
+                self.assertEqual(asynchronous.output, threaded.output)
+                self.assertEqual(asynchronous.output, "Timeout" if resource_limits else "done")
+                self.assertEqual(asynchronous.exit_status, threaded.exit_status)
+                self.assertGreater(asynchronous.cpu_time, 0.4)
+                if sys.platform.startswith("linux"):
+                    self.assertGreater(asynchronous.peak_rss_kb, 0)
+
+
+class TestAsyncPipeline(unittest.TestCase):
+    def test_pipeline_runs_students_on_the_asyncio_engine(self):
+        async def fake_execute(executable, input_value, timeout=5):
+            await asyncio.sleep(0)
+            return ExecutionResult(input_value, 0.01)
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            with patch("c_tester.process.compile_file", side_effect=lambda path: (path.replace(".c", ".exe"), None)), \
+                 patch("c_tester.process.execute_program", side_effect=AssertionError("thread engine used")), \
+                 patch("c_tester.process.execute_program_async", side_effect=fake_execute):
+                result = GradingPipeline(
+                    "Q9",
+                    temp_dir,
+                    ["1", "2"],
+                    [("1", "1"), ("2", "2")],
+                    os.path.join(temp_dir, "output"),
+                    temp_dir,
+                    progress_callback=lambda *_args: None,
+                    max_workers=2,
+                    execution_options=ExecutionOptions(execution_engine="asyncio"),
+                ).run(["a.c", "b.c"])
+
+            self.assertEqual(sorted(result.graded_files), ["a.c", "b.c"])
+            with open(os.path.join(temp_dir, "a.txt"), encoding="utf-8") as grade_file:
+                self.assertIn("Grade: 100%", grade_file.read())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,132 @@
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from c_tester import process
+from c_tester.compile_cache import CompileCache
+from c_tester.process import ExecutionOptions, compile_file, configure_compile_cache, execute_program
+from c_tester.toolchain import GccToolchain
+
+
+class TestCompileCache(unittest.TestCase):
+    def test_store_restore_and_key_components(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache = CompileCache(os.path.join(temp_dir, "cache"))
+            source = os.path.join(temp_dir, "a.c")
+            executable = os.path.join(temp_dir, "a.exe")
+            with open(source, "w", encoding="utf-8") as source_file:
+                source_file.write("int main(){return 0;}\n")
+            with open(executable, "wb") as exe_file:
+                exe_file.write(b"MZ-binary")
+
+            key = cache.key(source, "cl /O2", "cl 19.40")
+            self.assertNotEqual(key, cache.key(source, "cl /O1", "cl 19.40"))
+            self.assertNotEqual(key, cache.key(source, "cl /O2", "cl 19.41"))
+            self.assertFalse(cache.restore(key, os.path.join(temp_dir, "b.exe")))
+
+            cache.store(key, executable)
+            self.assertTrue(cache.restore(key, os.path.join(temp_dir, "b.exe")))
+            with open(os.path.join(temp_dir, "b.exe"), "rb") as restored:
+                self.assertEqual(restored.read(), b"MZ-binary")
+            self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_least_recently_used_entries_are_evicted(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache = CompileCache(os.path.join(temp_dir, "cache"), max_bytes=25)
+            for index, key in enumerate(("old", "used", "new")):
+                executable = os.path.join(temp_dir, f"{key}.exe")
+                with open(executable, "wb") as exe_file:
+                    exe_file.write(b"x" * 10)
+                cache.store(key, executable)
+                stamp = time.time() - 100 + index
+                os.utime(os.path.join(cache.cache_dir, f"{key}.bin"), (stamp, stamp))
+                if key == "used":
+                    self.assertTrue(cache.restore("old", os.path.join(temp_dir, "copy.exe")))
+
+            self.assertEqual(sorted(os.listdir(cache.cache_dir)), ["new.bin", "old.bin"])
+
+    def test_size_is_tracked_without_rescanning_until_eviction(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache = CompileCache(os.path.join(temp_dir, "cache"), max_bytes=45)
+            executable = os.path.join(temp_dir, "a.exe")
+            with open(executable, "wb") as exe_file:
+                exe_file.write(b"x" * 10)
+
+            with patch("c_tester.compile_cache.os.listdir", wraps=os.listdir) as listdir:
+                for key in ("a", "b", "c", "c", "d"):
+                    cache.store(key, executable)
+                self.assertEqual(listdir.call_count, 1)
+                cache.store("e", executable)
+                self.assertEqual(listdir.call_count, 2)
+
+            # Trimmed below the cap, so the next stores do not rescan straight away.
+            self.assertEqual(len(os.listdir(cache.cache_dir)), 4)
+
+    def test_default_location_follows_the_question_folders_not_the_cwd(self):
+        original_cache = process._ACTIVE_COMPILE_CACHE
+        with tempfile.TemporaryDirectory() as temp_dir:
+            try:
+                cache = configure_compile_cache(ExecutionOptions(), os.path.join(temp_dir, "Q1"))
+            finally:
+                process._ACTIVE_COMPILE_CACHE = original_cache
+
+        self.assertEqual(cache.cache_dir, os.path.join(os.path.abspath(temp_dir), ".c_tester_cache", "executables"))
+
+    def test_compile_file_reuses_cached_executable(self):
+        original_cwd = os.getcwd()
+        original_cache = process._ACTIVE_COMPILE_CACHE
+        with tempfile.TemporaryDirectory() as temp_dir:
+            try:
+                os.chdir(temp_dir)
+                configure_compile_cache(ExecutionOptions(), "Q1")
+                with open("a.c", "w", encoding="utf-8") as source_file:
+                    source_file.write("int main(){return 0;}\n")
+
+                def fake_cl(command, **_kwargs):
+                    with open("a.exe", "wb") as exe_file:
+                        exe_file.write(b"MZ")
+                    return SimpleNamespace(returncode=0, stdout="", stderr="")
+
+                with patch("c_tester.process.toolchain_identity", return_value="cl 19.40"), \
+                     patch("c_tester.process.subprocess.run", side_effect=fake_cl) as run_mock:
+                    self.assertEqual(compile_file("a.c"), ("a.exe", None))
+                    os.remove("a.exe")
+                    self.assertEqual(compile_file("a.c"), ("a.exe", None))
+                    self.assertTrue(os.path.isfile("a.exe"))
+                    self.assertEqual(run_mock.call_count, 1)
+
+                    configure_compile_cache(ExecutionOptions(compile_cache=False), "Q1")
+                    compile_file("a.c")
+                    self.assertEqual(run_mock.call_count, 2)
+            finally:
+                process._ACTIVE_COMPILE_CACHE = original_cache
+                os.chdir(original_cwd)
+
+    @unittest.skipUnless(os.name == "posix" and shutil.which("gcc"), "needs gcc on a POSIX system")
+    def test_cache_hits_stay_runnable(self):
+        original_cache = process._ACTIVE_COMPILE_CACHE
+        with tempfile.TemporaryDirectory() as temp_dir, \
+             patch.object(process, "_ACTIVE_TOOLCHAIN", GccToolchain("gcc")):
+            try:
+                process._ACTIVE_COMPILE_CACHE = CompileCache(os.path.join(temp_dir, "cache"))
+                source = os.path.join(temp_dir, "hello.c")
+                with open(source, "w", encoding="utf-8") as source_file:
+                    source_file.write("#include <stdio.h>\nint main(void) { puts(\"hi\"); return 0; }\n")
+
+                executable, error = compile_file(source)
+                self.assertIsNone(error)
+                os.remove(executable)
+                self.assertEqual(compile_file(source), (executable, None))
+
+                self.assertEqual(process._ACTIVE_COMPILE_CACHE.hits, 1)
+                self.assertEqual(execute_program(executable, "").output, "hi")
+            finally:
+                process._ACTIVE_COMPILE_CACHE = original_cache
+
+
+if __name__ == "__main__":
+    unittest.main()
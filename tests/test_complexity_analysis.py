@@ -0,0 +1,171 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from c_tester.complexity_analysis import (
+    complexity_profile_errors,
+    evaluate_complexity,
+    fit_growth_class,
+    load_profile_inputs,
+)
+from c_tester.process import ExecutionResult, process_folder
+from c_tester.rescore import rescore_folder
+
+
+SIZES = [1000, 2000, 4000, 8000, 16000]
+
+
+def linear_times(sizes, startup=0.01):
+    return [startup + 2e-6 * size for size in sizes]
+
+
+def quadratic_times(sizes, startup=0.01):
+    return [startup + 1e-9 * size * size for size in sizes]
+
+
+class TestFitGrowthClass(unittest.TestCase):
+    def test_start_up_cost_does_not_hide_the_growth_class(self):
+        self.assertEqual(fit_growth_class(SIZES, linear_times(SIZES, startup=0.05)), "O(n)")
+        self.assertEqual(fit_growth_class(SIZES, quadratic_times(SIZES, startup=0.05)), "O(n^2)")
+        self.assertEqual(fit_growth_class(SIZES, [0.02] * len(SIZES)), "O(1)")
+
+    def test_noise_prefers_the_simpler_class(self):
+        noisy = [time_value * factor for time_value, factor in zip(linear_times(SIZES), [1.02, 0.98, 1.01, 0.99, 1.0])]
+
+        self.assertEqual(fit_growth_class(SIZES, noisy), "O(n)")
+
+
+class TestEvaluateComplexity(unittest.TestCase):
+    def test_quadratic_student_against_linear_reference_is_penalized(self):
+        result = evaluate_complexity({"deduction": 15}, SIZES, quadratic_times(SIZES), linear_times(SIZES))
+
+        self.assertFalse(result.passed)
+        self.assertEqual(result.penalty, 15)
+        self.assertEqual((result.fitted_class, result.reference_class), ("O(n^2)", "O(n)"))
+        self.assertIn("grows like O(n^2)", result.reason)
+
+    def test_max_class_and_slowdown_limits(self):
+        slower_linear = [3 * time_value for time_value in linear_times(SIZES)]
+
+        allowed = evaluate_complexity(
+            {"deduction": 10, "max_class": "O(n^2)"},
+            SIZES,
+            quadratic_times(SIZES),
+            linear_times(SIZES),
+        )
+        too_slow = evaluate_complexity({"deduction": 10, "max_slowdown": 2}, SIZES, slower_linear, linear_times(SIZES))
+
+        self.assertTrue(allowed.passed)
+        self.assertEqual(allowed.penalty, 0)
+        self.assertFalse(too_slow.passed)
+        self.assertEqual(too_slow.slowdown, 3)
+        self.assertIn("3x slower", too_slow.reason)
+
+    def test_unfinished_profile_run_fails(self):
+        result = evaluate_complexity({"deduction": 5}, SIZES, linear_times(SIZES[:2]) + [None], linear_times(SIZES))
+
+        self.assertFalse(result.passed)
+        self.assertIn("n=4000", result.reason)
+
+
+class TestComplexityProfileConfig(unittest.TestCase):
+    def test_enabled_profile_requires_deduction_and_growing_sizes(self):
+        config = {"complexity_profile": {"enabled": True, "inputs": [{"size": 2, "input": "2"}, {"size": 1, "input": "1"}]}}
+
+        errors = complexity_profile_errors(config)
+
+        self.assertEqual(len(errors), 2)
+        self.assertIn("at least three", errors[0])
+        self.assertIn("deduction", errors[1])
+        self.assertEqual(complexity_profile_errors({"complexity_profile": {"enabled": False}}), [])
+
+    def test_file_inputs_are_read_from_the_question_folder(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            with open(os.path.join(temp_dir, "big.txt"), "w", encoding="utf-8") as input_file:
+                input_file.write("3 1 2\n")
+            sizes, inputs = load_profile_inputs(
+                temp_dir,
+                {"inputs": [{"size": 1, "input": "1"}, {"size": 3, "file": "big.txt"}]},
+            )
+
+        self.assertEqual(sizes, [1, 3])
+        self.assertEqual(inputs, ["1", "3 1 2\n"])
+
+
+class TestComplexityProfileGrading(unittest.TestCase):
+    def test_profile_penalizes_slow_growth_and_rescore_reuses_measurements(self):
+        original_cwd = os.getcwd()
+        with tempfile.TemporaryDirectory() as temp_dir:
+            try:
+                os.chdir(temp_dir)
+                self._create_question(deduction=20)
+
+                def fake_execute(executable, input_value, timeout=5):
+                    size = int(input_value)
+                    if "slow" in executable:
+                        return ExecutionResult(input_value, quadratic_times([size])[0])
+                    return ExecutionResult(input_value, linear_times([size])[0])
+
+                with patch("c_tester.process.compile_file", side_effect=lambda path: (path.replace(".c", ".exe"), None)), \
+                     patch("c_tester.process.execute_program", side_effect=fake_execute):
+                    process_folder("Q9")
+
+                fast_grade = self._read(os.path.join("Q9", "grade", "fast.txt"))
+                slow_grade = self._read(os.path.join("Q9", "grade", "slow.txt"))
+                self.assertIn("Grade: 100%", fast_grade)
+                self.assertIn("Complexity Check: passed", fast_grade)
+                self.assertIn("Complexity Class: O(n) (reference O(n))", fast_grade)
+                self.assertIn("Grade: 80%", slow_grade)
+                self.assertIn("Complexity Class: O(n^2) (reference O(n))", slow_grade)
+                self.assertIn("Complexity Penalty: -20", slow_grade)
+                with open(os.path.join("Q9", "metrics", "slow.json"), encoding="utf-8") as metrics_file:
+                    self.assertEqual(json.load(metrics_file)["complexity"]["sizes"], SIZES)
+
+                self._write_checker_config(deduction=35)
+                with patch("c_tester.process.compile_file", side_effect=AssertionError("compiled")), \
+                     patch("c_tester.process.execute_program", side_effect=AssertionError("executed")):
+                    self.assertEqual(rescore_folder("Q9"), "success")
+
+                slow_grade = self._read(os.path.join("Q9", "grade", "slow.txt"))
+                self.assertIn("Grade: 65%", slow_grade)
+                self.assertIn("Complexity Penalty: -35", slow_grade)
+            finally:
+                os.chdir(original_cwd)
+
+    def _create_question(self, deduction):
+        os.makedirs(os.path.join("Q9", "C"))
+        with open(os.path.join("Q9", "input.txt"), "w", encoding="utf-8") as input_file:
+            input_file.write("1\n2\n")
+        for name in ("original_sol", "fast", "slow"):
+            with open(os.path.join("Q9", "C", f"{name}.c"), "w", encoding="utf-8") as source_file:
+                source_file.write(f"int main(void) {{ return 0; }} /* {name} */\n")
+        self._write_checker_config(deduction)
+
+    def _write_checker_config(self, deduction):
+        with open("checker_config.json", "w", encoding="utf-8") as config_file:
+            json.dump(
+                {
+                    "questions": {
+                        "Q9": {
+                            "checker": "exact",
+                            "config": {},
+                            "complexity_profile": {
+                                "enabled": True,
+                                "inputs": [{"size": size, "input": str(size)} for size in SIZES],
+                                "deduction": deduction,
+                            },
+                        }
+                    }
+                },
+                config_file,
+            )
+
+    def _read(self, path):
+        with open(path, encoding="utf-8") as text_file:
+            return text_file.read()
+
+
+if __name__ == "__main__":
+    unittest.main()
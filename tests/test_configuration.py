@@ -1,8 +1,10 @@
 import os
 import tempfile
 import unittest
+from unittest.mock import patch
 
 from c_tester.configuration import (
+    _saved_choice,
     detect_question_folders,
     distribute_even_weights,
     load_gui_config,
@@ -63,6 +65,18 @@ class TestConfigurationDefaults(unittest.TestCase):
 
             self.assertEqual(load_gui_config(config_path), config)
 
+    def test_saved_toolchain_must_be_a_known_backend(self):
+        with patch("c_tester.configuration.log") as log_mock:
+            self.assertEqual(_saved_choice({"toolchain": "gcc"}, "toolchain", "msvc", ("msvc", "gcc", "clang")), "gcc")
+            self.assertEqual(_saved_choice({}, "toolchain", "msvc", ("msvc", "gcc", "clang")), "msvc")
+            log_mock.assert_not_called()
+
+            self.assertEqual(_saved_choice({"toolchain": "tcc"}, "toolchain", "msvc", ("msvc", "gcc", "clang")), "msvc")
+            self.assertEqual(_saved_choice({"toolchain": ["gcc"]}, "toolchain", "msvc", ("msvc", "gcc", "clang")), "msvc")
+
+        self.assertEqual(log_mock.call_count, 2)
+        self.assertIn("'tcc'", log_mock.call_args_list[0].args[0])
+
     def _create_question(self, root_path, question_name):
         question_path = os.path.join(root_path, question_name)
         os.mkdir(question_path)
@@ -13,8 +13,13 @@ from c_tester.create_excel import (
     extract_compilation_repair_note,
     extract_compilation_repair_penalty,
     extract_compilation_repair_status,
+    extract_complexity_check_status,
+    extract_complexity_class,
+    extract_complexity_penalty,
     extract_grade_calculation,
     extract_original_compilation_error,
+    extract_output_limit_exceeded,
+    extract_timeout_budget_skipped,
     parse_submit_errors,
 )
 
@@ -56,6 +61,36 @@ class TestCreateExcelParsing(unittest.TestCase):
         self.assertEqual(extract_compilation_repair_penalty(text), 10)
         self.assertEqual(extract_compilation_repair_note(text), "added missing semicolon.")
 
+    def test_extract_timeout_budget_skipped(self):
+        text = (
+            "Grade: 10%\n"
+            "\nTimeouts: 9/10\n"
+            "Timeout Inputs: 2, 3, 4, 5, 6, 7, 8, 9, 10\n"
+            "Timeout Budget Skipped: 6/10 (after 3 consecutive timeouts)\n"
+        )
+
+        self.assertEqual(extract_timeout_budget_skipped(text), 6)
+        self.assertEqual(extract_timeout_budget_skipped("Grade: 100%\n"), 0)
+
+    def test_extract_output_limit_exceeded(self):
+        text = "Grade: 50%\nTimeout Limits: 0.5s\nOutput Limit Exceeded: 2/4\n"
+
+        self.assertEqual(extract_output_limit_exceeded(text), 2)
+        self.assertEqual(extract_output_limit_exceeded("Grade: 100%\n"), 0)
+
+    def test_extract_complexity_fields(self):
+        text = (
+            "Grade: 80%\n"
+            "Complexity Check: failed\n"
+            "Complexity Class: O(n^2) (reference O(n))\n"
+            "Complexity Penalty: -20\n"
+        )
+
+        self.assertEqual(extract_complexity_check_status(text), "failed")
+        self.assertEqual(extract_complexity_class(text), "O(n^2) (reference O(n))")
+        self.assertEqual(extract_complexity_penalty(text), 20)
+        self.assertEqual(extract_complexity_penalty("Grade: 100%\n"), 0)
+
     def test_extract_grade_calculation(self):
         text = (
             "Grade: 96%\n"
@@ -315,6 +350,9 @@ class TestCreateExcelParsing(unittest.TestCase):
                 os.makedirs(os.path.join("Q1", "grade"))
                 with open(os.path.join("Q1", "grade", "123456789.txt"), "w", encoding="utf-8") as grade_file:
                     grade_file.write("Grade: 100%\nWrong Inputs:\nTimeouts: 0/1\n")
+                os.makedirs(os.path.join("Q1", "metrics"))
+                with open(os.path.join("Q1", "metrics", "123456789.json"), "w", encoding="utf-8") as metrics_file:
+                    json.dump({"version": 1, "summary": {"median_slowdown": 2.5, "peak_rss_kb": 1200}, "runs": []}, metrics_file)
 
                 create_excels(["Q1"], {"Q1": 100}, penalty=0, slim=True)
 
@@ -331,6 +369,9 @@ class TestCreateExcelParsing(unittest.TestCase):
                 self.assertIn("Grade_Q1_100%", details.columns)
                 self.assertIn("Wrong_Inputs_Q1", details.columns)
                 self.assertIn("Compilation_Error_Q1", details.columns)
+                self.assertEqual(details.loc[0, "Median_Slowdown_Q1"], 2.5)
+                self.assertEqual(details.loc[0, "Peak_RSS_KB_Q1"], 1200)
+                self.assertTrue(summary.eq("Median slowdown vs original_sol").any().any())
                 self.assertTrue(summary.eq("Overall Metrics").any().any())
                 self.assertTrue(summary.eq("Per-Question Metrics").any().any())
                 self.assertTrue(summary.eq("Top Wrong Inputs").any().any())
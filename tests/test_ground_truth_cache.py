@@ -0,0 +1,93 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from c_tester.ground_truth_cache import (
+    ground_truth_cache_dir,
+    ground_truth_cache_key,
+    is_cacheable,
+    load_ground_truth,
+    store_ground_truth,
+)
+from c_tester.process import ExecutionResult, generate_ground_truth
+
+
+class TestGroundTruthCache(unittest.TestCase):
+    def test_key_changes_with_each_component(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            source_path = os.path.join(temp_dir, "original_sol.c")
+            with open(source_path, "w", encoding="utf-8") as source_file:
+                source_file.write("int main(void) { return 0; }\n")
+
+            base = ground_truth_cache_key(source_path, ["1", "2"], "cl a.c", "cl 19.40", 5)
+            self.assertEqual(base, ground_truth_cache_key(source_path, ["1", "2"], "cl a.c", "cl 19.40", 5))
+            self.assertNotEqual(base, ground_truth_cache_key(source_path, ["1", "3"], "cl a.c", "cl 19.40", 5))
+            self.assertNotEqual(base, ground_truth_cache_key(source_path, ["1", "2"], "cl /O1 a.c", "cl 19.40", 5))
+            self.assertNotEqual(base, ground_truth_cache_key(source_path, ["1", "2"], "cl a.c", "cl 19.41", 5))
+            self.assertNotEqual(base, ground_truth_cache_key(source_path, ["1", "2"], "cl a.c", "cl 19.40", 2))
+            limited = ground_truth_cache_key(source_path, ["1", "2"], "cl a.c", "cl 19.40", 5, resource_limits=True)
+            self.assertNotEqual(base, limited)
+            self.assertNotEqual(
+                limited,
+                ground_truth_cache_key(source_path, ["1", "2"], "cl a.c", "cl 19.40", 5, resource_limits=True, memory_limit_mb=256),
+            )
+            self.assertNotEqual(base, ground_truth_cache_key(source_path, ["1", "2"], "cl a.c", "cl 19.40", 5, max_output_bytes=1024))
+
+            with open(source_path, "a", encoding="utf-8") as source_file:
+                source_file.write("/* edited */\n")
+            self.assertNotEqual(base, ground_truth_cache_key(source_path, ["1", "2"], "cl a.c", "cl 19.40", 5))
+            self.assertIsNone(ground_truth_cache_key(os.path.join(temp_dir, "missing.c"), [], "", "", 5))
+
+    def test_store_and_load_round_trip(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache_dir = ground_truth_cache_dir(os.path.join(temp_dir, "Q1"))
+            self.assertTrue(store_ground_truth(cache_dir, "abc", [("1", "one"), ("2", "two")], [0.01, 0.02]))
+
+            entry = load_ground_truth(cache_dir, "abc")
+
+            self.assertEqual(entry.ground_truth, [("1", "one"), ("2", "two")])
+            self.assertEqual(entry.runtimes, [0.01, 0.02])
+            self.assertIsNone(load_ground_truth(cache_dir, "other"))
+            self.assertEqual(os.listdir(cache_dir), ["abc.json"])
+
+    def test_incomplete_or_failed_runs_are_not_cacheable(self):
+        self.assertTrue(is_cacheable([("1", "ok")], 1))
+        self.assertFalse(is_cacheable([("1", "ok")], 2))
+        self.assertFalse(is_cacheable([("1", "Timeout")], 1))
+        self.assertFalse(is_cacheable([("1", "Error: executable not found: x")], 1))
+
+    def test_generate_ground_truth_reuses_cache_until_solution_changes(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            question_folder = os.path.join(temp_dir, "Q1")
+            os.makedirs(question_folder)
+            source_path = os.path.join(question_folder, "original_sol.c")
+            with open(source_path, "w", encoding="utf-8") as source_file:
+                source_file.write("int main(void) { return 0; }\n")
+
+            with patch("c_tester.process.toolchain_identity", return_value="cl 19.40"), \
+                 patch("c_tester.process.compile_file", return_value=("original_sol.exe", None)) as compile_mock, \
+                 patch("c_tester.process.execute_program", side_effect=lambda exe, value, timeout=5: ExecutionResult(f"out {value}", 0.02)):
+                first = generate_ground_truth(question_folder, ["1", "2"], lambda *_args: None, use_cache=True)
+                second = generate_ground_truth(question_folder, ["1", "2"], lambda *_args: None, use_cache=True)
+                self.assertEqual(compile_mock.call_count, 1)
+
+                with open(source_path, "a", encoding="utf-8") as source_file:
+                    source_file.write("/* edited */\n")
+                generate_ground_truth(question_folder, ["1", "2"], lambda *_args: None, use_cache=True)
+                self.assertEqual(compile_mock.call_count, 2)
+
+                generate_ground_truth(question_folder, ["1", "2"], lambda *_args: None)
+                self.assertEqual(compile_mock.call_count, 3)
+
+                # A different output cap can cut the reference off, so it is not a hit.
+                with patch("c_tester.process._OUTPUT_LIMIT_BYTES", 1024):
+                    generate_ground_truth(question_folder, ["1", "2"], lambda *_args: None, use_cache=True)
+                self.assertEqual(compile_mock.call_count, 4)
+
+        self.assertEqual(first, ([("1", "out 1"), ("2", "out 2")], [0.02, 0.02]))
+        self.assertEqual(second, first)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,8 +1,15 @@
+from dataclasses import replace
 import unittest
 
-from c_tester.output_contract import compile_preset, evaluate_contract, validate_contract
+from c_tester.output_contract import (
+    ReferenceFields,
+    compile_contract,
+    compile_preset,
+    evaluate_contract,
+    validate_contract,
+)
 from c_tester.checker_assistant import run_checker_tests
-from c_tester.semantic_grading import compare_output_with_config
+from c_tester.semantic_grading import compare_output_with_config, compile_checker
 from c_tester.semantic_grading import checker_config_errors
 
 
@@ -182,6 +189,65 @@ class OutputContractTests(unittest.TestCase):
         self.assertTrue(result.passed, result.reason)
         self.assertEqual(validate_contract(compile_preset("exact")), [])
 
+    def test_compiled_plan_is_reusable_across_cases(self):
+        plan = compile_contract(trace_contract())
+        wrong_boolean = HARMLESS_VARIANT.replace("Right-angled: Yes", "Right-angled: No")
+
+        for actual in (HARMLESS_VARIANT, wrong_boolean, HARMLESS_VARIANT):
+            self.assertEqual(
+                plan.evaluate("0 0 3 0 0 4", REFERENCE, actual),
+                evaluate_contract(trace_contract(), "0 0 3 0 0 4", REFERENCE, actual),
+            )
+        self.assertTrue(plan.evaluate("0 0 3 0 0 4", REFERENCE, HARMLESS_VARIANT).passed)
+
+    def test_precomputed_reference_fields_give_identical_results(self):
+        plan = compile_contract(trace_contract())
+        broken_reference = REFERENCE.replace("Perimeter", "Outline")
+        wrong_boolean = HARMLESS_VARIANT.replace("Right-angled: Yes", "Right-angled: No")
+
+        for reference in (REFERENCE, broken_reference):
+            reference_fields = plan.extract_reference_fields("0 0 3 0 0 4", reference)
+            for actual in (HARMLESS_VARIANT, wrong_boolean, "Perimeter = 12"):
+                self.assertEqual(
+                    plan.evaluate("0 0 3 0 0 4", reference, actual, reference_fields),
+                    plan.evaluate("0 0 3 0 0 4", reference, actual),
+                )
+        self.assertTrue(plan.extract_reference_fields("0 0 3 0 0 4", broken_reference).errors)
+
+    def test_precomputed_reference_fields_are_not_extracted_again(self):
+        plan = compile_contract(compile_preset("last_integer"))
+
+        result = plan.evaluate("5", "Result: 120", "The answer is 7", ReferenceFields({"expected": 7}, {}))
+
+        self.assertTrue(result.passed, result.reason)
+
+    def test_invalid_contract_compiles_to_a_failing_plan(self):
+        contract = trace_contract()
+        contract["checks"][0]["op"] = "python_eval"
+
+        result = compile_contract(contract).evaluate("", REFERENCE, REFERENCE)
+
+        self.assertFalse(result.passed)
+        self.assertIn("invalid checker contract", result.reason)
+
+    def test_compiled_checkers_are_shared_and_isolated_from_later_edits(self):
+        checker_config = {"checker": "normalized_text", "config": {"ignore_case": True}}
+        checker = compile_checker(checker_config)
+
+        self.assertIs(compile_checker({"config": {"ignore_case": True}, "checker": "normalized_text"}), checker)
+        checker_config["config"]["ignore_case"] = False
+        self.assertTrue(checker.compare("", "Hello", "hello").passed)
+        self.assertFalse(compile_checker(checker_config).compare("", "Hello", "hello").passed)
+
+    def test_output_limit_kill_never_passes(self):
+        result = compare_output_with_config(
+            {"checker": "exact", "config": {}},
+            "5",
+            "Output limit exceeded",
+            "Output limit exceeded",
+        )
+        self.assertFalse(result.passed)
+
     def test_normalized_text_collapses_spaces_created_by_punctuation(self):
         result = compare_output_with_config(
             {"checker": "normalized_text", "config": {}},
@@ -446,5 +512,98 @@ class OutputContractTests(unittest.TestCase):
         self.assertTrue(all(row["test_passed"] for row in rows), rows)
 
 
+
+def _without_fast_path(plan):
+    return replace(plan, fields=tuple(replace(field, mirror=None) for field in plan.fields))
+
+
+def _failing_actual_extractors(plan):
+    def fail(_text):
+        raise AssertionError("actual field was extracted")
+
+    return replace(
+        plan,
+        fields=tuple(replace(field, extract_normalized=fail) if field.mirror else field for field in plan.fields),
+    )
+
+
+DIFFERENTIAL_CASES = [
+    ("exact", {}, "5", "Result:  120\nDone."),
+    ("normalized_text", {}, "5", "Hello, World!  Result: 120"),
+    ("normalized_text", {"ignore_case": False, "ignore_punctuation": False}, "5", "Hello, World!"),
+    ("last_integer", {}, "5", "Enter n: Result: 120"),
+    ("integer_list", {"order_matters": False}, "6", "Divisors: 1 2 3 6"),
+    ("divisors", {}, "6", "Divisors of 6 are: 1 2 3 6"),
+    ("divisors", {}, "0", "No divisors for 0"),
+    ("reverse_integer", {}, "1200", "Reverse of the number is: 21"),
+]
+
+
+def _variants(reference):
+    return [
+        reference,
+        "  " + reference.replace(" ", "\t") + "\r\n",
+        reference.upper(),
+        reference.replace(":", ""),
+        reference + " 7",
+        reference.replace("1", "9"),
+        "",
+        "Timeout",
+        "Runtime Error: exit code 3",
+        "x" * 70000 + reference,
+        reference + "x" * 70000,
+    ]
+
+
+class ExactMatchFastPathTests(unittest.TestCase):
+    """The fast path must return exactly what full extraction returns."""
+
+    def test_presets_match_full_evaluation(self):
+        for checker, config, input_value, reference in DIFFERENTIAL_CASES:
+            plan = compile_contract(compile_preset(checker, config))
+            slow = _without_fast_path(plan)
+            reference_fields = plan.extract_reference_fields(input_value, reference)
+            for actual in _variants(reference):
+                with self.subTest(checker=checker, actual=actual[:40]):
+                    expected = slow.evaluate(input_value, reference, actual)
+                    self.assertEqual(plan.evaluate(input_value, reference, actual), expected)
+                    self.assertEqual(plan.evaluate(input_value, reference, actual, reference_fields), expected)
+
+    def test_contracts_match_full_evaluation(self):
+        broken_reference = REFERENCE.replace("Perimeter", "Outline")
+        for contract in (trace_contract(), compile_preset("exact")):
+            plan = compile_contract(contract)
+            slow = _without_fast_path(plan)
+            for reference in (REFERENCE, broken_reference):
+                reference_fields = plan.extract_reference_fields("0 0 3 0 0 4", reference)
+                for actual in _variants(reference) + [HARMLESS_VARIANT, REFERENCE, broken_reference]:
+                    with self.subTest(actual=actual[:40]):
+                        expected = slow.evaluate("0 0 3 0 0 4", reference, actual)
+                        self.assertEqual(plan.evaluate("0 0 3 0 0 4", reference, actual), expected)
+                        self.assertEqual(plan.evaluate("0 0 3 0 0 4", reference, actual, reference_fields), expected)
+
+    def test_identical_and_normalized_equal_outputs_skip_extraction(self):
+        trace = _failing_actual_extractors(compile_contract(trace_contract()))
+        normalized = _failing_actual_extractors(compile_contract(compile_preset("normalized_text")))
+
+        self.assertTrue(trace.evaluate("0 0 3 0 0 4", REFERENCE, REFERENCE).passed)
+        reference_fields = normalized.extract_reference_fields("", "Hello, World!")
+        self.assertTrue(normalized.evaluate("", "Hello, World!", "hello   world", reference_fields).passed)
+        with self.assertRaises(AssertionError):
+            normalized.evaluate("", "Hello, World!", "goodbye world", reference_fields)
+
+    def test_only_fields_with_an_identical_reference_spec_are_mirrored(self):
+        plan = compile_contract(trace_contract())
+        mirrors = {field.id: field.mirror for field in plan.fields if field.mirror}
+
+        self.assertEqual(
+            mirrors,
+            {
+                "actual_perimeter": "reference_perimeter",
+                "actual_area": "reference_area",
+                "actual_right": "reference_right",
+            },
+        )
+
 if __name__ == "__main__":
     unittest.main()
@@ -7,7 +7,7 @@ import pandas as pd
 
 from c_tester.checker_assistant import FakeLLMProvider
 from c_tester.create_excel import create_excels
-from c_tester.process import process_folder
+from c_tester.process import ExecutionResult, process_folder
 
 
 class TestProcessCompileRepair(unittest.TestCase):
@@ -29,7 +29,7 @@ class TestProcessCompileRepair(unittest.TestCase):
                             return path.replace(".c", ".exe"), None
                     return None, "missing semicolon"
 
-                with patch("c_tester.process.compile_file", side_effect=fake_compile), patch("c_tester.process.run_executable", return_value="1"):
+                with patch("c_tester.process.compile_file", side_effect=fake_compile), patch("c_tester.process.execute_program", return_value=ExecutionResult("1", 0.01)):
                     status = process_folder(
                         "Q1",
                         llm_compile_repair_enabled=True,
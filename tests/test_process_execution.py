@@ -0,0 +1,620 @@
+import json
+import os
+import shutil
+import stat
+import tempfile
+import threading
+import time
+import unittest
+import subprocess
+import sys
+from unittest.mock import patch
+
+from c_tester import process
+from c_tester.semantic_grading import ComparisonMemo
+from c_tester.process import (
+    ExecutionOptions,
+    ExecutionResult,
+    GradingPipeline,
+    OUTPUT_LIMIT_EXCEEDED,
+    OutputLimitExceeded,
+    TimeoutBudget,
+    _BoundedCapture,
+    WorkerPools,
+    compile_command,
+    configure_resource_limits,
+    execute_program,
+    measured_runtime,
+    execute_all_and_grade,
+    generate_ground_truth,
+    process_all_questions,
+    write_student_results,
+)
+
+
+class TestFlattenedExecution(unittest.TestCase):
+    def test_runs_are_queued_per_input_and_reassembled_per_student(self):
+        calls = []
+        lock = threading.Lock()
+
+        def fake_run(executable, input_value, *args, **kwargs):
+            with lock:
+                calls.append((os.path.basename(executable), input_value))
+            return ExecutionResult(f"{os.path.basename(executable)}:{input_value}", 0.01)
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            output_folder = os.path.join(temp_dir, "output")
+            grade_folder = os.path.join(temp_dir, "grade")
+            os.makedirs(grade_folder)
+            compiled = {"a.c": os.path.join(temp_dir, "a.exe"), "b.c": os.path.join(temp_dir, "b.exe")}
+            inputs = ["1", "2", "3"]
+            ground_truth = [(value, f"a.exe:{value}") for value in inputs]
+
+            with patch("c_tester.process.execute_program", side_effect=fake_run):
+                graded = execute_all_and_grade(
+                    compiled,
+                    temp_dir,
+                    inputs,
+                    ground_truth,
+                    output_folder,
+                    grade_folder,
+                    "Q9",
+                    progress_callback=lambda *_args: None,
+                    max_workers=1,
+                )
+
+            self.assertEqual(sorted(graded), ["a.c", "b.c"])
+            self.assertEqual(
+                calls,
+                [("a.exe", "1"), ("b.exe", "1"), ("a.exe", "2"), ("b.exe", "2"), ("a.exe", "3"), ("b.exe", "3")],
+            )
+            with open(os.path.join(output_folder, "b.txt"), encoding="utf-8") as output_file:
+                self.assertEqual(
+                    output_file.read(),
+                    "Input: 1\nOutput: b.exe:1\n\nInput: 2\nOutput: b.exe:2\n\nInput: 3\nOutput: b.exe:3\n\n",
+                )
+            with open(os.path.join(grade_folder, "a.txt"), encoding="utf-8") as grade_file:
+                self.assertIn("Grade: 100%", grade_file.read())
+            with open(os.path.join(grade_folder, "b.txt"), encoding="utf-8") as grade_file:
+                self.assertIn("Grade: 0%", grade_file.read())
+
+    def test_progress_is_reported_per_run(self):
+        progress = []
+        with tempfile.TemporaryDirectory() as temp_dir:
+            with patch("c_tester.process.execute_program", return_value=ExecutionResult("1", 0.01)):
+                execute_all_and_grade(
+                    {"a.c": os.path.join(temp_dir, "a.exe")},
+                    temp_dir,
+                    ["1", "2"],
+                    [("1", "1"), ("2", "1")],
+                    os.path.join(temp_dir, "output"),
+                    temp_dir,
+                    "Q1",
+                    progress_callback=lambda current, total, _desc: progress.append((current, total)),
+                )
+
+        self.assertEqual(progress, [(1, 2), (2, 2)])
+
+
+class TestGradingPipeline(unittest.TestCase):
+    def test_students_execute_while_others_are_still_compiling(self):
+        fast_executed = threading.Event()
+        progress = []
+
+        def fake_compile(path):
+            if path.endswith("slow.c"):
+                # Only finishes once the fast student has already been run.
+                self.assertTrue(fast_executed.wait(timeout=5))
+            if path.endswith("broken.c"):
+                return None, "syntax error"
+            return path.replace(".c", ".exe"), None
+
+        def fake_execute(executable, input_value, timeout=5):
+            if executable.endswith("fast.exe"):
+                fast_executed.set()
+            return ExecutionResult(input_value, 0.01)
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            with patch("c_tester.process.compile_file", side_effect=fake_compile), \
+                 patch("c_tester.process.execute_program", side_effect=fake_execute):
+                result = GradingPipeline(
+                    "Q9",
+                    temp_dir,
+                    ["1", "2"],
+                    [("1", "1"), ("2", "2")],
+                    os.path.join(temp_dir, "output"),
+                    temp_dir,
+                    progress_callback=lambda current, total, description: progress.append((current, total, description)),
+                    max_workers=2,
+                ).run(["slow.c", "fast.c", "broken.c"])
+
+            self.assertEqual(sorted(result.graded_files), ["fast.c", "slow.c"])
+            self.assertEqual(result.compile_errors, {"broken.c": "syntax error"})
+            with open(os.path.join(temp_dir, "broken.txt"), encoding="utf-8") as grade_file:
+                self.assertIn("Compilation error: syntax error", grade_file.read())
+
+        counts = [current for current, _, _ in progress]
+        self.assertEqual(counts, sorted(set(counts)))
+        self.assertEqual(counts[-1], 9)
+        self.assertEqual({(total, description) for _, total, description in progress}, {(9, "[Q9] Compiling and executing")})
+
+
+    def test_syntax_precheck_sends_broken_files_to_repair_before_optimized_builds_finish(self):
+        repair_started = threading.Event()
+        compiled = []
+
+        def fake_precheck(paths):
+            return {path: "broken.c(1): error C2143: syntax error" if path.endswith("broken.c") else None for path in paths}
+
+        def fake_compile(path):
+            # The optimized build only finishes once the broken file is already being repaired.
+            self.assertTrue(repair_started.wait(timeout=5))
+            compiled.append(os.path.basename(path))
+            return path.replace(".c", ".exe"), None
+
+        def fake_repair(file, error):
+            repair_started.set()
+            self.assertEqual((file, error), ("broken.c", "broken.c(1): error C2143: syntax error"))
+            return None
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            with patch("c_tester.process.syntax_check_files", side_effect=fake_precheck), \
+                 patch("c_tester.process.compile_file", side_effect=fake_compile), \
+                 patch("c_tester.process.execute_program", side_effect=lambda exe, value, timeout=5: ExecutionResult(value, 0.01)):
+                result = GradingPipeline(
+                    "Q9",
+                    temp_dir,
+                    ["1"],
+                    [("1", "1")],
+                    os.path.join(temp_dir, "output"),
+                    temp_dir,
+                    progress_callback=lambda *_args: None,
+                    max_workers=2,
+                    repair=fake_repair,
+                ).run(["good.c", "broken.c"])
+
+        self.assertEqual(compiled, ["good.c"])
+        self.assertEqual(result.graded_files, ["good.c"])
+        self.assertIn("broken.c", result.compile_errors)
+
+
+class TestOutputLimit(unittest.TestCase):
+    FLOOD = "import sys\nwhile True:\n    sys.stdout.write('x' * 4096)\n"
+
+    def _popen(self, code):
+        return subprocess.Popen(
+            [sys.executable, "-c", code],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+
+    def test_capture_stops_reading_once_the_cap_is_exceeded(self):
+        process = self._popen(self.FLOOD)
+        capture = _BoundedCapture(process, b"1\n", 64 * 1024)
+        try:
+            with self.assertRaises(OutputLimitExceeded):
+                capture.wait(10)
+            self.assertLessEqual(len(capture.stdout), 64 * 1024)
+        finally:
+            process.kill()
+            process.wait()
+            capture.close()
+
+    def test_capture_returns_output_under_the_cap(self):
+        process = self._popen("import sys\nprint(sys.stdin.readline().strip() * 2)")
+        capture = _BoundedCapture(process, b"ab\n", 64 * 1024)
+        try:
+            stdout, _ = capture.wait(10)
+        finally:
+            capture.close()
+
+        self.assertEqual(stdout.strip(), b"abab")
+        self.assertEqual(process.returncode, 0)
+
+    def test_grade_file_counts_output_limit_kills(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            source_path = os.path.join(temp_dir, "a.c")
+            with open(source_path, "w", encoding="utf-8") as source_file:
+                source_file.write("int main(){return 0;}\n")
+            write_student_results(
+                "a",
+                source_path,
+                [("1", "1"), ("2", OUTPUT_LIMIT_EXCEEDED)],
+                [("1", "1"), ("2", "2")],
+                os.path.join(temp_dir, "output"),
+                temp_dir,
+                "Q9",
+            )
+            with open(os.path.join(temp_dir, "a.txt"), encoding="utf-8") as grade_file:
+                grade_text = grade_file.read()
+
+        self.assertIn("Grade: 50%", grade_text)
+        self.assertIn("Output Limit Exceeded: 1/2", grade_text)
+
+
+@unittest.skipUnless(os.name == "posix", "resource limits are POSIX only")
+class TestResourceLimits(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.addCleanup(configure_resource_limits, ExecutionOptions())
+
+    def _script(self, name, body):
+        path = os.path.join(self.temp_dir.name, name)
+        with open(path, "w", encoding="utf-8") as script_file:
+            script_file.write(f"#!{sys.executable}\nimport sys\n{body}\n")
+        os.chmod(path, os.stat(path).st_mode | stat.S_IXUSR)
+        return path
+
+    def test_timeouts_are_judged_on_cpu_time(self):
+        configure_resource_limits(ExecutionOptions(resource_limits=True))
+
+        result = execute_program(self._script("echo.exe", "print(sys.stdin.readline().strip())"), "7", timeout=2)
+        self.assertEqual(result.output, "7")
+        self.assertIsNotNone(result.cpu_time)
+        self.assertEqual(measured_runtime(result), result.cpu_time)
+
+        busy = execute_program(self._script("busy.exe", "while True:\n    pass"), "7", timeout=0.3)
+        self.assertEqual(busy.output, "Timeout")
+        self.assertGreater(busy.cpu_time, 0.3)
+
+        # Sleeping uses no CPU, so only the wall-clock safety net stops it.
+        stalled = execute_program(self._script("sleep.exe", "import time\ntime.sleep(30)"), "7", timeout=0.2)
+        self.assertEqual(stalled.output, "Timeout")
+        self.assertLess(stalled.wall_time, 5)
+
+    def test_address_space_limit_turns_huge_allocations_into_runtime_errors(self):
+        configure_resource_limits(ExecutionOptions(resource_limits=True, memory_limit_mb=256))
+
+        result = execute_program(self._script("hog.exe", "data = bytearray(1024 ** 3)"), "7", timeout=5)
+
+        self.assertTrue(result.output.startswith("Runtime Error:"), result.output)
+        self.assertIn("MemoryError", result.output)
+
+
+class TestRunMetrics(unittest.TestCase):
+    @unittest.skipUnless(os.name == "posix", "uses a shebang script as the student executable")
+    def test_execute_program_reports_cpu_time_peak_rss_and_exit_status(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "student.exe")
+            with open(path, "w", encoding="utf-8") as script_file:
+                script_file.write(f"#!{sys.executable}\nimport sys\nprint('ok')\nsys.exit(int(sys.stdin.readline()))\n")
+            os.chmod(path, os.stat(path).st_mode | stat.S_IXUSR)
+
+            passed = execute_program(path, "0")
+            failed = execute_program(path, "3")
+
+        self.assertEqual(passed.output, "ok")
+        self.assertEqual(passed.exit_status, 0)
+        self.assertGreater(passed.cpu_time, 0)
+        self.assertGreater(passed.peak_rss_kb, 0)
+        self.assertEqual(failed.exit_status, 3)
+        self.assertTrue(failed.output.startswith("Runtime Error"))
+
+    @unittest.skipUnless(os.name == "posix" and shutil.which("gcc"), "needs gcc")
+    def test_peak_rss_is_the_childs_own_not_the_graders(self):
+        grader_memory = b"x" * (256 * 1024 * 1024)
+        programs = {
+            "tiny": "#include <stdio.h>\nint main(void) { puts(\"ok\"); return 0; }\n",
+            "megabyte": (
+                "#include <stdio.h>\n#include <string.h>\nstatic char data[1 << 20];\n"
+                "int main(void) { memset(data, 1, sizeof data); printf(\"%d\\n\", data[12345]); return 0; }\n"
+            ),
+            "spin": "int main(void) { for (;;) { } }\n",
+            "flood": "#include <stdio.h>\nint main(void) { for (;;) fputs(\"xxxxxxxx\", stdout); }\n",
+        }
+        with tempfile.TemporaryDirectory() as temp_dir:
+            executables = {}
+            for name, code in programs.items():
+                source = os.path.join(temp_dir, f"{name}.c")
+                with open(source, "w", encoding="utf-8") as source_file:
+                    source_file.write(code)
+                executables[name] = os.path.join(temp_dir, f"{name}.exe")
+                subprocess.run(["gcc", "-o", executables[name], source], check=True)
+
+            self.addCleanup(configure_resource_limits, ExecutionOptions())
+            for resource_limits in (False, True):
+                configure_resource_limits(ExecutionOptions(resource_limits=resource_limits))
+                tiny = execute_program(executables["tiny"], "")
+                megabyte = execute_program(executables["megabyte"], "")
+                # Killed runs keep their metrics.
+                spin = execute_program(executables["spin"], "", timeout=0.3)
+                with patch("c_tester.process._OUTPUT_LIMIT_BYTES", 64 * 1024):
+                    flood = execute_program(executables["flood"], "", timeout=5)
+
+                self.assertEqual((tiny.output, megabyte.output), ("ok", "1"))
+                self.assertEqual((spin.output, flood.output), ("Timeout", OUTPUT_LIMIT_EXCEEDED))
+                for result in (tiny, megabyte, spin, flood):
+                    self.assertIsNotNone(result.peak_rss_kb)
+                    self.assertIsNotNone(result.cpu_time)
+                    self.assertLess(result.peak_rss_kb, 32 * 1024)
+                self.assertGreater(megabyte.peak_rss_kb, tiny.peak_rss_kb + 512)
+                self.assertGreater(spin.cpu_time, 0.1)
+        del grader_memory
+
+    def test_pipeline_writes_metrics_sidecar_with_slowdown(self):
+        def fake_execute(executable, input_value, timeout=5):
+            return ExecutionResult(input_value, 0.04, 0.03, 900 + int(input_value), 0)
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            metrics_folder = os.path.join(temp_dir, "metrics")
+            with patch("c_tester.process.compile_file", side_effect=lambda path: (path.replace(".c", ".exe"), None)), \
+                 patch("c_tester.process.execute_program", side_effect=fake_execute):
+                GradingPipeline(
+                    "Q9",
+                    temp_dir,
+                    ["1", "2", "3"],
+                    [("1", "1"), ("2", "2"), ("3", "3")],
+                    os.path.join(temp_dir, "output"),
+                    temp_dir,
+                    progress_callback=lambda *_args: None,
+                    duplicates={"a.c": ["b.c"]},
+                    reference_runtimes=[0.01, 0.02, 0.04],
+                    metrics_folder=metrics_folder,
+                ).run(["a.c"])
+
+            for student_id in ("a", "b"):
+                with open(os.path.join(metrics_folder, f"{student_id}.json"), encoding="utf-8") as metrics_file:
+                    metrics = json.load(metrics_file)
+                self.assertEqual(metrics["summary"]["median_slowdown"], 2)
+                self.assertEqual(metrics["summary"]["peak_rss_kb"], 903)
+                self.assertEqual(
+                    metrics["runs"][0],
+                    {
+                        "index": 0,
+                        "outcome": "ok",
+                        "wall_time": 0.04,
+                        "cpu_time": 0.03,
+                        "peak_rss_kb": 901,
+                        "exit_status": 0,
+                        "reference_time": 0.01,
+                    },
+                )
+
+
+class TestParallelGroundTruth(unittest.TestCase):
+    def test_reference_inputs_run_in_parallel_and_keep_input_order(self):
+        both_running = threading.Barrier(2, timeout=5)
+        progress = []
+
+        def fake_execute(executable, input_value, timeout=5):
+            if input_value in ("1", "2"):
+                # Deadlocks unless the first two inputs run at the same time.
+                both_running.wait()
+            if input_value == "1":
+                time.sleep(0.05)
+            return ExecutionResult(f"out {input_value}", float(input_value))
+
+        with tempfile.TemporaryDirectory() as temp_dir, WorkerPools(2) as workers:
+            with patch("c_tester.process.compile_file", return_value=("original_sol.exe", None)), \
+                 patch("c_tester.process.execute_program", side_effect=fake_execute):
+                ground_truth, runtimes = generate_ground_truth(
+                    temp_dir,
+                    ["1", "2", "3"],
+                    lambda current, total, description: progress.append((current, total)),
+                    workers=workers,
+                )
+
+        self.assertEqual(ground_truth, [("1", "out 1"), ("2", "out 2"), ("3", "out 3")])
+        self.assertEqual(runtimes, [1.0, 2.0, 3.0])
+        self.assertEqual(progress, [(1, 3), (2, 3), (3, 3)])
+
+    def test_cancellation_returns_only_the_finished_prefix(self):
+        cancel_event = threading.Event()
+
+        def fake_execute(executable, input_value, timeout=5):
+            if input_value == "2":
+                cancel_event.set()
+            return ExecutionResult(f"out {input_value}", 0.01)
+
+        with tempfile.TemporaryDirectory() as temp_dir, WorkerPools(1) as workers:
+            with patch("c_tester.process.compile_file", return_value=("original_sol.exe", None)), \
+                 patch("c_tester.process.execute_program", side_effect=fake_execute):
+                ground_truth, _ = generate_ground_truth(
+                    temp_dir, ["1", "2", "3", "4"], lambda *_args: None, cancel_event, workers=workers
+                )
+
+        self.assertEqual(ground_truth, [("1", "out 1"), ("2", "out 2")])
+
+
+class TestCrossQuestionScheduling(unittest.TestCase):
+    def test_questions_share_workers_and_overlap(self):
+        other_question_ran = threading.Event()
+
+        def fake_compile(path):
+            if path.endswith(os.path.join("Q1", "C", "slow.c")):
+                # Q1 only finishes compiling once Q2 has already executed a student.
+                self.assertTrue(other_question_ran.wait(timeout=5))
+            return path.replace(".c", ".exe"), None
+
+        def fake_execute(executable, input_value, timeout=5):
+            if executable.endswith(os.path.join("Q2", "C", "b.exe")):
+                other_question_ran.set()
+            return ExecutionResult(input_value, 0.01)
+
+        original_cwd = os.getcwd()
+        with tempfile.TemporaryDirectory() as temp_dir:
+            try:
+                os.chdir(temp_dir)
+                for question, student in (("Q1", "slow"), ("Q2", "b")):
+                    os.makedirs(os.path.join(question, "C"))
+                    with open(os.path.join(question, "input.txt"), "w", encoding="utf-8") as input_file:
+                        input_file.write("1\n")
+                    for path in (os.path.join(question, "original_sol.c"), os.path.join(question, "C", f"{student}.c")):
+                        with open(path, "w", encoding="utf-8") as source_file:
+                            source_file.write(f"int main(){{return 0;}} /* {student} */\n")
+
+                with patch("c_tester.process.compile_file", side_effect=fake_compile), \
+                     patch("c_tester.process.execute_program", side_effect=fake_execute):
+                    results = process_all_questions(
+                        ["Q1", "Q2"],
+                        progress_callback=lambda *_args: None,
+                        execution_options=ExecutionOptions(ground_truth_cache=False, compile_cache=False, max_workers=2),
+                    )
+
+                self.assertEqual(results, [("Q1", "success"), ("Q2", "success")])
+                self.assertTrue(os.path.isfile(os.path.join("Q1", "grade", "slow.txt")))
+            finally:
+                os.chdir(original_cwd)
+
+    def test_compile_command_keeps_object_file_next_to_executable(self):
+        command = compile_command(os.path.join("Q1", "C", "a.c"), os.path.join("Q1", "C", "a.exe"))
+
+        self.assertIn(f'/Fo"{os.path.join("Q1", "C", "a.obj")}"', command)
+
+
+class TestComparisonMemoPerRun(unittest.TestCase):
+    def test_identical_student_outputs_are_compared_once_per_run(self):
+        memos = []
+
+        def new_memo(max_entries):
+            memos.append(ComparisonMemo(max_entries))
+            return memos[-1]
+
+        original_cwd = os.getcwd()
+        with tempfile.TemporaryDirectory() as temp_dir:
+            try:
+                os.chdir(temp_dir)
+                os.makedirs(os.path.join("Q1", "C"))
+                with open(os.path.join("Q1", "input.txt"), "w", encoding="utf-8") as input_file:
+                    input_file.write("1\n2\n")
+                for name in ("original_sol", "a", "b", "c"):
+                    path = os.path.join("Q1", "original_sol.c" if name == "original_sol" else os.path.join("C", f"{name}.c"))
+                    with open(path, "w", encoding="utf-8") as source_file:
+                        source_file.write(f"int main(){{return 0;}} /* {name} */\n")
+
+                with patch("c_tester.process.compile_file", side_effect=lambda path: (path.replace(".c", ".exe"), None)), \
+                     patch("c_tester.process.execute_program", side_effect=lambda exe, value, timeout=5: ExecutionResult(value, 0.01)), \
+                     patch("c_tester.process.ComparisonMemo", side_effect=new_memo):
+                    for _ in range(2):
+                        results = process_all_questions(
+                            ["Q1"],
+                            progress_callback=lambda *_args: None,
+                            execution_options=ExecutionOptions(ground_truth_cache=False, compile_cache=False, max_workers=2),
+                        )
+                        self.assertEqual(results, [("Q1", "success")])
+                        self.assertIsNone(process._ACTIVE_COMPARISON_MEMO)
+
+                # Each run starts empty; three students print the same output, so each input is judged once.
+                self.assertEqual([(memo.hits, memo.misses) for memo in memos], [(4, 2), (4, 2)])
+                with open(os.path.join("Q1", "grade", "c.txt"), encoding="utf-8") as grade_file:
+                    self.assertIn("Grade: 100%", grade_file.read())
+            finally:
+                os.chdir(original_cwd)
+
+
+class TestAdaptiveTimeouts(unittest.TestCase):
+    def test_timeout_is_reference_multiple_clamped_to_floor_and_ceiling(self):
+        options = ExecutionOptions(timeout_multiplier=10, timeout_floor=0.5, timeout_ceiling=5)
+
+        self.assertEqual(options.timeout_for(0.01), 0.5)
+        self.assertEqual(options.timeout_for(0.2), 2)
+        self.assertEqual(options.timeout_for(4.9), 5)
+        self.assertEqual(
+            options.describe_timeouts([0.5, 2]),
+            "0.5s-2s (10x reference runtime, min 0.5s, max 5s)",
+        )
+
+    def test_student_runs_use_per_input_limits_and_report_them(self):
+        seen_timeouts = []
+
+        def fake_run(executable, input_value, timeout=5):
+            seen_timeouts.append((input_value, timeout))
+            return ExecutionResult("Timeout" if input_value == "2" else "1", timeout)
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            with patch("c_tester.process.execute_program", side_effect=fake_run):
+                execute_all_and_grade(
+                    {"a.c": os.path.join(temp_dir, "a.exe")},
+                    temp_dir,
+                    ["1", "2"],
+                    [("1", "1"), ("2", "1")],
+                    os.path.join(temp_dir, "output"),
+                    temp_dir,
+                    "Q9",
+                    progress_callback=lambda *_args: None,
+                    timeout_limits=[0.5, 1.25],
+                    timeout_note="0.5s-1.25s (10x reference runtime, min 0.5s, max 5s)",
+                )
+
+            with open(os.path.join(temp_dir, "a.txt"), encoding="utf-8") as grade_file:
+                grade_text = grade_file.read()
+
+        self.assertEqual(sorted(seen_timeouts), [("1", 0.5), ("2", 1.25)])
+        self.assertIn("Timeouts: 1/2", grade_text)
+        self.assertIn("Timeout Limits: 0.5s-1.25s (10x reference runtime, min 0.5s, max 5s)", grade_text)
+
+
+class TestTimeoutBudget(unittest.TestCase):
+    def test_consecutive_timeouts_skip_remaining_inputs(self):
+        executed = []
+
+        def fake_execute(executable, input_value, timeout=5):
+            executed.append(input_value)
+            return ExecutionResult("Timeout" if input_value != "1" else "ok", 0.5)
+
+        inputs = ["1", "2", "3", "4", "5"]
+        with tempfile.TemporaryDirectory() as temp_dir:
+            with patch("c_tester.process.execute_program", side_effect=fake_execute):
+                result = GradingPipeline(
+                    "Q9",
+                    temp_dir,
+                    inputs,
+                    [(value, "ok") for value in inputs],
+                    os.path.join(temp_dir, "output"),
+                    temp_dir,
+                    progress_callback=lambda *_args: None,
+                    max_workers=1,
+                    execution_options=ExecutionOptions(max_consecutive_timeouts=2),
+                ).run([], compiled={"a.c": os.path.join(temp_dir, "a.exe")})
+
+            with open(os.path.join(temp_dir, "a.txt"), encoding="utf-8") as grade_file:
+                grade_text = grade_file.read()
+
+        self.assertEqual(result.graded_files, ["a.c"])
+        self.assertEqual(executed, ["1", "2", "3"])
+        self.assertIn("Timeouts: 4/5", grade_text)
+        self.assertIn("Timeout Budget Skipped: 2/5 (after 2 consecutive timeouts)", grade_text)
+
+    def test_total_seconds_budget_and_disabled_budget(self):
+        budget = TimeoutBudget(max_seconds=1)
+        budget.record(ExecutionResult("ok", 0.6))
+        self.assertFalse(budget.exhausted())
+        budget.record(ExecutionResult("ok", 0.6))
+        self.assertTrue(budget.exhausted())
+
+        disabled = TimeoutBudget()
+        for _ in range(10):
+            disabled.record(ExecutionResult("Timeout", 5))
+        self.assertFalse(disabled.exhausted())
+        self.assertIsNone(disabled.describe(10))
+
+    def test_budget_hit_is_written_to_grade_file(self):
+        def fake_execute(executable, input_value, timeout=5):
+            return ExecutionResult("Timeout", timeout)
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            with patch("c_tester.process.execute_program", side_effect=fake_execute):
+                execute_all_and_grade(
+                    {"a.c": os.path.join(temp_dir, "a.exe")},
+                    temp_dir,
+                    ["1", "2", "3", "4"],
+                    [(value, value) for value in ["1", "2", "3", "4"]],
+                    os.path.join(temp_dir, "output"),
+                    temp_dir,
+                    "Q9",
+                    progress_callback=lambda *_args: None,
+                    max_workers=1,
+                    execution_options=ExecutionOptions(max_consecutive_timeouts=1),
+                )
+
+            with open(os.path.join(temp_dir, "a.txt"), encoding="utf-8") as grade_file:
+                grade_text = grade_file.read()
+
+        self.assertIn("Timeouts: 4/4", grade_text)
+        self.assertIn("Timeout Budget Skipped: 3/4 (after 1 consecutive timeouts)", grade_text)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from c_tester.checker_assistant import FakeLLMProvider
+from c_tester.process import ExecutionResult, process_folder
+from c_tester.rescore import parse_output_cases, rescore_folder
+
+
+class TestParseOutputCases(unittest.TestCase):
+    def test_round_trips_multiline_and_empty_outputs(self):
+        text = "Input: 1\nOutput: a\n\nb\n\nInput: 2\nOutput: \n\nInput: 3\nOutput: last\n\n"
+
+        self.assertEqual(
+            parse_output_cases(text, ["1", "2", "3"]),
+            [("1", "a\n\nb"), ("2", ""), ("3", "last")],
+        )
+
+    def test_rejects_outputs_for_different_inputs(self):
+        text = "Input: 1\nOutput: a\n\nInput: 2\nOutput: b\n\n"
+
+        self.assertIsNone(parse_output_cases(text, ["1", "3"]))
+        self.assertIsNone(parse_output_cases(text, ["1", "2", "3"]))
+
+
+class TestRescoreFolder(unittest.TestCase):
+    def test_rescore_regrades_stored_outputs_without_compiling(self):
+        original_cwd = os.getcwd()
+        with tempfile.TemporaryDirectory() as temp_dir:
+            try:
+                os.chdir(temp_dir)
+                self._create_question()
+
+                def fake_compile(path):
+                    normalized = path.replace("\\", "/")
+                    if "/llm_fixed/" in normalized or not normalized.endswith("bad.c"):
+                        return path.replace(".c", ".exe"), None
+                    return None, "missing semicolon"
+
+                def fake_execute(executable, input_value, timeout=5):
+                    if "wrong" in executable:
+                        return ExecutionResult("0", 0.01)
+                    return ExecutionResult(input_value, 0.01)
+
+                with patch("c_tester.process.compile_file", side_effect=fake_compile), \
+                     patch("c_tester.process.execute_program", side_effect=fake_execute):
+                    process_folder(
+                        "Q9",
+                        llm_compile_repair_enabled=True,
+                        llm_compile_repair_provider=FakeLLMProvider(),
+                        llm_compile_repair_penalty=10,
+                        execution_options=None,
+                    )
+                self.assertTrue(os.path.isfile(os.path.join("Q9", "original_sol_output.txt")))
+                with open(os.path.join("Q9", "original_sol_fields.json"), encoding="utf-8") as fields_file:
+                    reference_fields = json.load(fields_file)
+                self.assertEqual(
+                    [(case["input"], case["fields"]["expected"]) for case in reference_fields["cases"]],
+                    [("1", "1"), ("2", "2")],
+                )
+                with open(os.path.join("Q9", "grade", "wrong.txt"), encoding="utf-8") as grade_file:
+                    self.assertIn("Grade: 0%", grade_file.read())
+
+                with patch("c_tester.process.compile_file", side_effect=AssertionError("compiled")), \
+                     patch("c_tester.process.execute_program", side_effect=AssertionError("executed")):
+                    status = rescore_folder("Q9", scoring_mode="per_error_deduction", deduction_per_error=30)
+
+                self.assertEqual(status, "success")
+                with open(os.path.join("Q9", "grade", "wrong.txt"), encoding="utf-8") as grade_file:
+                    wrong_grade = grade_file.read()
+                with open(os.path.join("Q9", "grade", "bad.txt"), encoding="utf-8") as grade_file:
+                    repaired_grade = grade_file.read()
+                self.assertIn("Grade: 40%", wrong_grade)
+                self.assertIn("Timeout Limits: 0.5s", wrong_grade)
+                self.assertIn("Grade: 90%", repaired_grade)
+                self.assertIn("Compilation Repair: fixed", repaired_grade)
+            finally:
+                os.chdir(original_cwd)
+
+    def test_missing_reference_output_is_an_error(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            question = os.path.join(temp_dir, "Q9")
+            os.makedirs(question)
+            with open(os.path.join(question, "input.txt"), "w", encoding="utf-8") as input_file:
+                input_file.write("1\n")
+
+            self.assertEqual(rescore_folder(question), "error")
+
+    def _create_question(self):
+        os.makedirs(os.path.join("Q9", "C"))
+        with open(os.path.join("Q9", "input.txt"), "w", encoding="utf-8") as input_file:
+            input_file.write("1\n2\n")
+        with open(os.path.join("Q9", "original_sol.c"), "w", encoding="utf-8") as sol_file:
+            sol_file.write("int main(){return 0;}\n")
+        for student_id, code in (
+            ("good", "int main(){return 0;}\n"),
+            ("wrong", "int main(){return 1;}\n"),
+            ("bad", "int main(){\nreturn 0\n}\n"),
+        ):
+            with open(os.path.join("Q9", "C", f"{student_id}.c"), "w", encoding="utf-8") as source_file:
+                source_file.write(code)
+
+
+if __name__ == "__main__":
+    unittest.main()
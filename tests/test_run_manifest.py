@@ -0,0 +1,112 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from c_tester.process import ExecutionOptions, ExecutionResult, process_folder
+from c_tester.run_manifest import grading_context, load_manifest, student_fingerprint, unchanged_students
+
+
+class TestRunManifest(unittest.TestCase):
+    def test_fingerprint_tracks_source_and_context(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            source_path = os.path.join(temp_dir, "a.c")
+            with open(source_path, "w", encoding="utf-8") as source_file:
+                source_file.write("int main(){return 0;}\n")
+            context = grading_context(["1"], [("1", "1")], {"checker": "exact"}, {"scoring_mode": "percentage"})
+
+            fingerprint = student_fingerprint(source_path, context)
+
+            self.assertEqual(fingerprint, student_fingerprint(source_path, context))
+            self.assertNotEqual(
+                fingerprint,
+                student_fingerprint(source_path, grading_context(["1"], [("1", "2")], {"checker": "exact"}, {})),
+            )
+            self.assertIsNone(student_fingerprint(os.path.join(temp_dir, "missing.c"), context))
+
+            grade_folder = os.path.join(temp_dir, "grade")
+            os.makedirs(grade_folder)
+            self.assertEqual(unchanged_students({"a.c": fingerprint}, {"a.c": fingerprint}, grade_folder), set())
+            with open(os.path.join(grade_folder, "a.txt"), "w", encoding="utf-8") as grade_file:
+                grade_file.write("Grade: 100%\n")
+            self.assertEqual(unchanged_students({"a.c": fingerprint}, {"a.c": fingerprint}, grade_folder), {"a.c"})
+
+    def test_context_tracks_complexity_profile_input_files(self):
+        checker_config = {
+            "checker": "exact",
+            "complexity_profile": {
+                "enabled": True,
+                "inputs": [{"size": 10, "input": "10"}, {"size": 1000, "file": "big.txt"}],
+            },
+        }
+        with tempfile.TemporaryDirectory() as temp_dir:
+            profile_input = os.path.join(temp_dir, "big.txt")
+            with open(profile_input, "w", encoding="utf-8") as input_file:
+                input_file.write("1000\n")
+            before = grading_context(["1"], [("1", "1")], checker_config, {}, temp_dir)
+            self.assertEqual(before, grading_context(["1"], [("1", "1")], checker_config, {}, temp_dir))
+
+            with open(profile_input, "w", encoding="utf-8") as input_file:
+                input_file.write("1000 regenerated\n")
+            after = grading_context(["1"], [("1", "1")], checker_config, {}, temp_dir)
+            os.remove(profile_input)
+            missing = grading_context(["1"], [("1", "1")], checker_config, {}, temp_dir)
+
+        self.assertNotEqual(before["profile_inputs"], after["profile_inputs"])
+        self.assertNotEqual(after["profile_inputs"], missing["profile_inputs"])
+        self.assertEqual({key: value for key, value in before.items() if key != "profile_inputs"},
+                         {key: value for key, value in after.items() if key != "profile_inputs"})
+
+    def test_incremental_run_only_regrades_changed_submissions(self):
+        original_cwd = os.getcwd()
+        with tempfile.TemporaryDirectory() as temp_dir:
+            try:
+                os.chdir(temp_dir)
+                self._create_question()
+                compiled_files = []
+
+                def fake_compile(path):
+                    compiled_files.append(os.path.basename(path))
+                    return path.replace(".c", ".exe"), None
+
+                def run(options):
+                    compiled_files.clear()
+                    with patch("c_tester.process.compile_file", side_effect=fake_compile), \
+                         patch("c_tester.process.execute_program", return_value=ExecutionResult("1", 0.01)):
+                        return process_folder("Q9", execution_options=options)
+
+                incremental = ExecutionOptions(incremental=True, ground_truth_cache=False)
+                self.assertEqual(run(ExecutionOptions(ground_truth_cache=False)), "success")
+                self.assertEqual(set(load_manifest("Q9")), {"a.c", "b.c"})
+
+                self.assertEqual(run(incremental), "success")
+                self.assertEqual(compiled_files, ["original_sol.c"])
+                self.assertTrue(os.path.isfile(os.path.join("Q9", "grade", "a.txt")))
+                self.assertTrue(os.path.isfile(os.path.join("Q9", "output", "b.txt")))
+
+                with open(os.path.join("Q9", "C", "b.c"), "a", encoding="utf-8") as source_file:
+                    source_file.write("/* resubmitted */\n")
+                os.remove(os.path.join("Q9", "C", "a.c"))
+                self.assertEqual(run(incremental), "success")
+                self.assertEqual(compiled_files, ["original_sol.c", "b.c"])
+                self.assertFalse(os.path.exists(os.path.join("Q9", "grade", "a.txt")))
+                self.assertEqual(set(load_manifest("Q9")), {"b.c"})
+
+                self.assertEqual(run(ExecutionOptions(incremental=True, ground_truth_cache=False, timeout_floor=1)), "success")
+                self.assertEqual(compiled_files, ["original_sol.c", "b.c"])
+            finally:
+                os.chdir(original_cwd)
+
+    def _create_question(self):
+        os.makedirs(os.path.join("Q9", "C"))
+        with open(os.path.join("Q9", "input.txt"), "w", encoding="utf-8") as input_file:
+            input_file.write("1\n")
+        with open(os.path.join("Q9", "original_sol.c"), "w", encoding="utf-8") as sol_file:
+            sol_file.write("int main(){return 0;}\n")
+        for student_id in ("a", "b"):
+            with open(os.path.join("Q9", "C", f"{student_id}.c"), "w", encoding="utf-8") as source_file:
+                source_file.write(f"int main(){{return 0;}} /* {student_id} */\n")
+
+
+if __name__ == "__main__":
+    unittest.main()
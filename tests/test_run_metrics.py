@@ -0,0 +1,29 @@
+import unittest
+
+from c_tester.process import ExecutionResult
+from c_tester.run_metrics import build_student_metrics, median_slowdown, run_outcome
+
+
+class TestRunMetrics(unittest.TestCase):
+    def test_outcomes_distinguish_budget_skips_from_timeouts(self):
+        self.assertEqual(run_outcome(ExecutionResult("Timeout", skipped=True)), "skipped")
+        self.assertEqual(run_outcome(ExecutionResult("Timeout", 1.0, exit_status=-9)), "timeout")
+        self.assertEqual(run_outcome(ExecutionResult("Output limit exceeded", 0.2)), "output_limit")
+        self.assertEqual(run_outcome(ExecutionResult("Runtime Error: boom", 0.1, exit_status=1)), "runtime_error")
+        self.assertEqual(run_outcome(ExecutionResult("42", 0.1, exit_status=0)), "ok")
+
+    def test_median_slowdown_ignores_unmeasured_inputs(self):
+        self.assertEqual(median_slowdown([0.2, None, 0.9], [0.1, 0.1, 0.3]), 2.5)
+        self.assertEqual(median_slowdown([0.2], [0]), None)
+
+    def test_skipped_runs_do_not_count_towards_time_or_slowdown(self):
+        results = [ExecutionResult("1", 0.3, 0.2, 800, 0), ExecutionResult("Timeout", skipped=True)]
+
+        metrics = build_student_metrics(results, [0.3, 0.0], [0.1, 0.1])
+
+        self.assertEqual(metrics["summary"], {"median_slowdown": 3.0, "total_time": 0.3, "peak_rss_kb": 800})
+        self.assertEqual([run["outcome"] for run in metrics["runs"]], ["ok", "skipped"])
+
+
+if __name__ == "__main__":
+    unittest.main()
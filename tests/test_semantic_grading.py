@@ -1,6 +1,21 @@
+import json
+import os
+import tempfile
+import time
 import unittest
+from unittest.mock import patch
 
-from c_tester.semantic_grading import compare_output, compare_output_with_config
+from c_tester.output_contract import ContractPlan
+from c_tester.semantic_grading import (
+    ComparisonMemo,
+    checker_config_snapshot,
+    compare_output,
+    compare_output_with_config,
+    compile_checker,
+    get_question_checker_config,
+    load_checker_config,
+    save_checker_config,
+)
 
 
 class TestSemanticGrading(unittest.TestCase):
@@ -107,5 +122,167 @@ class TestSemanticGrading(unittest.TestCase):
         self.assertFalse(result.passed)
 
 
+
+class TestComparisonMemo(unittest.TestCase):
+    def test_identical_outputs_are_judged_once(self):
+        memo = ComparisonMemo(max_entries=8)
+        checker = compile_checker({"checker": "last_integer", "config": {}})
+
+        with patch.object(ContractPlan, "evaluate", autospec=True, side_effect=ContractPlan.evaluate) as evaluate:
+            results = [memo.compare(checker, "5", "Result: 120", actual) for actual in ("120", "120", "7", "120")]
+
+        self.assertEqual([result.passed for result in results], [True, True, False, True])
+        self.assertIs(results[0], results[1])
+        self.assertEqual(evaluate.call_count, 2)
+        self.assertEqual((memo.hits, memo.misses), (2, 2))
+
+    def test_key_covers_checker_input_and_reference(self):
+        memo = ComparisonMemo(max_entries=8)
+        last_integer = compile_checker({"checker": "last_integer", "config": {}})
+        exact = compile_checker({"checker": "exact", "config": {}})
+
+        self.assertTrue(memo.compare(last_integer, "5", "Result: 120", "answer 120").passed)
+        self.assertFalse(memo.compare(exact, "5", "Result: 120", "answer 120").passed)
+        self.assertFalse(memo.compare(last_integer, "5", "Result: 121", "answer 120").passed)
+        self.assertEqual(memo.hits, 0)
+
+    def test_least_recently_used_entries_are_evicted(self):
+        memo = ComparisonMemo(max_entries=2)
+        checker = compile_checker({"checker": "exact", "config": {}})
+
+        for actual in ("a", "b", "a", "c", "b"):
+            memo.compare(checker, "", "a", actual)
+
+        self.assertEqual((memo.hits, memo.misses), (1, 4))
+
+
+SWAP_CONTRACT = {
+    "version": 1,
+    "fields": [
+        {"id": "stdin_pair", "source": "stdin", "extract": "floats", "select": {"slice": [0, 2]}},
+        {"id": "reference_total", "source": "reference", "extract": "labeled_number", "label": "Total"},
+        {"id": "actual_total", "source": "actual", "extract": "labeled_number", "label": "Total"},
+        {"id": "before", "source": "actual", "extract": "floats", "anchor": "Before", "select": {"slice": [0, 2]}},
+        {"id": "after", "source": "actual", "extract": "floats", "anchor": "After", "select": {"slice": [0, 2]}},
+    ],
+    "checks": [
+        {"id": "total", "op": "approx", "left": {"field": "actual_total"}, "right": {"field": "reference_total"}, "tolerance": 0.01},
+        {"id": "before", "op": "approx", "left": {"field": "before"}, "right": {"field": "stdin_pair"}, "tolerance": 0.0001},
+        {"id": "swap", "op": "exchanged", "left": {"field": "before"}, "right": {"field": "after"}, "tolerance": 0.0001},
+    ],
+}
+
+EXACT_MATCH_CASES = [
+    ({"checker": "exact", "config": {}}, "5", "Result:  120\nDone."),
+    ({"checker": "normalized_text", "config": {}}, "5", "Hello, World!"),
+    ({"checker": "last_integer", "config": {}}, "5", "Enter n: Result: 120"),
+    ({"checker": "integer_list", "config": {"order_matters": False}}, "6", "Divisors: 6 3 2 1"),
+    ({"checker": "divisors", "config": {}}, "6", "Divisors of 6 are: 1 2 3 6"),
+    ({"checker": "divisors", "config": {}}, "0", "No divisors for 0"),
+    ({"checker": "reverse_integer", "config": {}}, "1200", "Reverse of the number is: 21"),
+    ({"checker": "output_contract", "config": {"contract": SWAP_CONTRACT}}, "1 2", "Before: 1 2\nAfter: 2 1\nTotal: 3.00"),
+    # The reference fails its own stdin check, so identical output must fail too.
+    ({"checker": "output_contract", "config": {"contract": SWAP_CONTRACT}}, "5 6", "Before: 1 2\nAfter: 2 1\nTotal: 3.00"),
+    # The reference lacks a field the contract needs.
+    ({"checker": "output_contract", "config": {"contract": SWAP_CONTRACT}}, "1 2", "Before: 1 2\nAfter: 2 1"),
+]
+
+
+class TestExactMatchPrepass(unittest.TestCase):
+    def _full_path(self, checker, input_value, reference, reference_fields=None):
+        result = checker.plan.evaluate(input_value, reference, reference, reference_fields)
+        return (result.passed, result.reason, result.expected_canonical, result.actual_canonical)
+
+    def test_identical_output_gets_the_full_evaluation_verdict(self):
+        for config, input_value, reference in EXACT_MATCH_CASES:
+            checker = compile_checker(config)
+            reference_fields = checker.reference_fields(input_value, reference)
+            with self.subTest(checker=config["checker"], input=input_value):
+                for fields in (None, reference_fields, None):
+                    fast = checker.compare(input_value, reference, reference, fields)
+                    self.assertEqual(
+                        (fast.passed, fast.reason, fast.expected_canonical, fast.actual_canonical),
+                        self._full_path(checker, input_value, reference, fields),
+                    )
+                    self.assertEqual(compare_output_with_config(config, input_value, reference, reference), fast)
+
+        swap = compile_checker({"checker": "output_contract", "config": {"contract": SWAP_CONTRACT}})
+        self.assertTrue(swap.compare("1 2", EXACT_MATCH_CASES[7][2], EXACT_MATCH_CASES[7][2]).passed)
+        self.assertFalse(swap.compare("5 6", EXACT_MATCH_CASES[8][2], EXACT_MATCH_CASES[8][2]).passed)
+
+    def test_identical_output_is_evaluated_once_per_input_and_run(self):
+        checker = compile_checker({"checker": "output_contract", "config": {"contract": SWAP_CONTRACT}})
+        reference = "Before: 3 4\nAfter: 4 3\nTotal: 7.00"
+
+        with patch.object(ContractPlan, "evaluate", autospec=True, side_effect=ContractPlan.evaluate) as evaluate:
+            memo = ComparisonMemo(64)
+            verdicts = [memo.compare(checker, "3 4", reference, actual).passed for actual in (reference, reference, reference + "\n", reference)]
+            memo.compare(checker, "4 3", reference, reference)
+            # One self-match for "3 4", the non-identical output, and one self-match for "4 3".
+            self.assertEqual(evaluate.call_count, 3)
+
+            # Nothing outlives the run: a new memo, or no memo, evaluates again.
+            ComparisonMemo(64).compare(checker, "3 4", reference, reference)
+            checker.compare("3 4", reference, reference)
+            self.assertEqual(evaluate.call_count, 5)
+
+        self.assertEqual(verdicts, [True, True, True, True])
+
+
+class TestCheckerConfigCache(unittest.TestCase):
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.path = os.path.join(temp_dir.name, "checker_config.json")
+
+    def _write(self, checker, age_seconds):
+        with open(self.path, "w", encoding="utf-8") as config_file:
+            json.dump({"questions": {"Q1": {"checker": checker, "config": {}}}}, config_file)
+        stamp = time.time() - age_seconds
+        os.utime(self.path, (stamp, stamp))
+
+    def test_unchanged_file_is_parsed_once(self):
+        self._write("exact", age_seconds=60)
+
+        with patch("c_tester.semantic_grading.json.loads", wraps=json.loads) as loads:
+            first = checker_config_snapshot(self.path)
+            for _ in range(5):
+                self.assertEqual(get_question_checker_config("q1", self.path)["checker"], "exact")
+
+        self.assertEqual(loads.call_count, 1)
+        self.assertIs(checker_config_snapshot(self.path), first)
+
+    def test_question_configs_are_copies_of_the_pinned_version(self):
+        self._write("exact", age_seconds=60)
+        snapshot = checker_config_snapshot(self.path)
+
+        get_question_checker_config("Q1", self.path)["checker"] = "maxim"
+        snapshot.question_config("Q1")["config"]["ignore_case"] = False
+
+        self.assertEqual(get_question_checker_config("Q1", self.path), {"checker": "exact", "config": {}})
+        self.assertEqual(snapshot.config["questions"]["Q1"], {"checker": "exact", "config": {}})
+
+    def test_edits_are_picked_up_even_within_one_timestamp_tick(self):
+        self._write("exact", age_seconds=0)
+        before = checker_config_snapshot(self.path)
+        mtime = os.stat(self.path).st_mtime_ns
+        self._write("maxim", age_seconds=0)
+        os.utime(self.path, ns=(mtime, mtime))
+
+        after = checker_config_snapshot(self.path)
+
+        self.assertEqual(before.question_config("Q1")["checker"], "exact")
+        self.assertEqual(after.question_config("Q1")["checker"], "maxim")
+
+    def test_loaded_copies_do_not_leak_into_the_cache(self):
+        self._write("exact", age_seconds=60)
+        config = load_checker_config(self.path)
+        config["questions"]["Q1"]["checker"] = "last_integer"
+
+        self.assertEqual(get_question_checker_config("Q1", self.path)["checker"], "exact")
+        save_checker_config(config, self.path)
+        self.assertEqual(get_question_checker_config("Q1", self.path)["checker"], "last_integer")
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,98 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from c_tester.process import ExecutionOptions, ExecutionResult, process_folder
+from c_tester.submission_dedupe import group_submissions, normalize_source
+
+
+class TestNormalizeSource(unittest.TestCase):
+    def test_whitespace_outside_literals_is_collapsed(self):
+        self.assertEqual(
+            normalize_source("int  main()\r\n{\n\n\treturn 0;   \n}\n"),
+            normalize_source("int main()\n{\n  return 0;\n}"),
+        )
+        self.assertEqual(normalize_source("if (x) {\n  y();\n}"), normalize_source("if(x){y();}"))
+
+    def test_literals_comments_and_token_boundaries_are_preserved(self):
+        self.assertNotEqual(normalize_source('printf("a  b");'), normalize_source('printf("a b");'))
+        self.assertNotEqual(normalize_source("char c = ' ';"), normalize_source("char c = '';"))
+        self.assertNotEqual(normalize_source("/* a  b */ x"), normalize_source("/* a b */ x"))
+        self.assertNotEqual(normalize_source("a - -b"), normalize_source("a--b"))
+        self.assertNotEqual(normalize_source("#define X 1\nint y;"), normalize_source("#define X 1 int y;"))
+        self.assertNotEqual(normalize_source("#define F(x) x\n"), normalize_source("#define F (x) x\n"))
+        self.assertNotEqual(normalize_source("int x; // c\ny();"), normalize_source("int x; // c y();"))
+        self.assertEqual(normalize_source("// it's  fine\nx  =  1;"), "// it's  fine\nx = 1;")
+
+
+class TestSubmissionDedupe(unittest.TestCase):
+    def test_groups_identical_sources_with_sorted_representative(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            for name, code in (("c.c", "int main(){ return 0; }"), ("a.c", "int  main(){\n return 0; }"), ("b.c", "int main(){return 1;}")):
+                with open(os.path.join(temp_dir, name), "w", encoding="utf-8") as source_file:
+                    source_file.write(code)
+
+            groups, hashes = group_submissions(temp_dir, ["c.c", "b.c", "a.c"])
+
+        self.assertEqual(groups, {"a.c": ["a.c", "c.c"], "b.c": ["b.c"]})
+        self.assertEqual(hashes["a.c"], hashes["c.c"])
+
+    def test_process_folder_compiles_and_runs_each_group_once(self):
+        original_cwd = os.getcwd()
+        with tempfile.TemporaryDirectory() as temp_dir:
+            try:
+                os.chdir(temp_dir)
+                os.makedirs(os.path.join("Q9", "C"))
+                with open(os.path.join("Q9", "input.txt"), "w", encoding="utf-8") as input_file:
+                    input_file.write("1\n2\n")
+                with open(os.path.join("Q9", "original_sol.c"), "w", encoding="utf-8") as sol_file:
+                    sol_file.write("int main(){return 0;}\n")
+                for name, code in (
+                    ("a.c", "int main(){return 0;}\n"),
+                    ("b.c", "int main() {return 0;}\n"),
+                    ("copy1.c", "int main(){\n  return 0\n}\n"),
+                    ("copy2.c", "int main(){\n\treturn 0\n}\n"),
+                ):
+                    with open(os.path.join("Q9", "C", name), "w", encoding="utf-8") as source_file:
+                        source_file.write(code)
+                compiled_files = []
+                executed = []
+
+                def fake_compile(path):
+                    compiled_files.append(os.path.basename(path))
+                    if path.endswith("copy1.c"):
+                        return None, "missing semicolon"
+                    return path.replace(".c", ".exe"), None
+
+                def fake_execute(executable, input_value, timeout=5):
+                    executed.append(os.path.basename(executable))
+                    return ExecutionResult(input_value, 0.01)
+
+                with patch("c_tester.process.compile_file", side_effect=fake_compile), \
+                     patch("c_tester.process.execute_program", side_effect=fake_execute):
+                    status = process_folder("Q9", execution_options=ExecutionOptions(ground_truth_cache=False))
+
+                self.assertEqual(status, "warning")
+                self.assertEqual(sorted(compiled_files), ["a.c", "copy1.c", "original_sol.c"])
+                self.assertEqual(executed.count("a.exe"), 2)
+                self.assertNotIn("b.exe", executed)
+                for student_id in ("a", "b"):
+                    with open(os.path.join("Q9", "grade", f"{student_id}.txt"), encoding="utf-8") as grade_file:
+                        self.assertIn("Grade: 100%", grade_file.read())
+                    self.assertTrue(os.path.isfile(os.path.join("Q9", "output", f"{student_id}.txt")))
+                with open(os.path.join("Q9", "grade", "copy2.txt"), encoding="utf-8") as grade_file:
+                    self.assertIn("Compilation error: missing semicolon", grade_file.read())
+                with open(os.path.join("Q9", "duplicate_groups.json"), encoding="utf-8") as report_file:
+                    report = json.load(report_file)
+                self.assertEqual(
+                    [(group["representative"], group["members"]) for group in report["groups"]],
+                    [("a.c", ["a.c", "b.c"]), ("copy1.c", ["copy1.c", "copy2.c"])],
+                )
+            finally:
+                os.chdir(original_cwd)
+
+
+if __name__ == "__main__":
+    unittest.main()
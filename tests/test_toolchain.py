@@ -0,0 +1,289 @@
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+from c_tester import process
+from c_tester.process import (
+    ExecutionOptions,
+    compile_batch_size,
+    compile_batches,
+    compile_file,
+    compile_files,
+    configure_toolchain,
+    execute_program,
+    run_build_directory,
+    split_diagnostics,
+    syntax_check_files,
+)
+from c_tester.toolchain import GccToolchain, MsvcToolchain, Toolchain, get_toolchain
+
+
+class TestToolchainSelection(unittest.TestCase):
+    def test_backends_build_their_own_commands(self):
+        msvc = get_toolchain("msvc")
+        clang = get_toolchain("clang")
+
+        self.assertIsInstance(msvc, MsvcToolchain)
+        self.assertTrue(msvc.uses_visual_studio)
+        self.assertIn('/Fe"a.exe"', msvc.compile_command("a.c", "a.exe"))
+        self.assertIsInstance(clang, GccToolchain)
+        self.assertEqual(clang.compile_command("a.c", "a.exe"), 'clang -x c -O2 -o "a.exe" "a.c" -lm')
+        self.assertEqual(clang.banner_command(), "clang --version")
+        self.assertEqual(clang.executable_path(os.path.join("Q1.c", "C", "x.c")), os.path.join("Q1.c", "C", "x.exe"))
+        self.assertTrue(msvc.batches_compiles)
+        self.assertFalse(clang.batches_compiles)
+
+    def test_unknown_toolchain_is_rejected(self):
+        with self.assertRaises(ValueError):
+            get_toolchain("tcc")
+
+    def test_incomplete_toolchain_cannot_be_created(self):
+        class CompileOnly(Toolchain):
+            def compile_command(self, c_file, executable):
+                return f"tcc -o {executable} {c_file}"
+
+        with self.assertRaises(TypeError):
+            CompileOnly()
+
+    def test_configure_toolchain_switches_compile_command(self):
+        with patch.object(process, "_ACTIVE_TOOLCHAIN", MsvcToolchain()):
+            configure_toolchain(ExecutionOptions(toolchain="gcc"))
+
+            self.assertTrue(process.compile_command("a.c", "a.exe").startswith("gcc "))
+
+
+class TestCompileBatches(unittest.TestCase):
+    def test_batches_spread_over_workers_and_stay_within_one_directory(self):
+        files = [os.path.join("Q1", "C", f"s{i}.c") for i in range(10)] + [os.path.join("Q2", "C", "t.c")]
+
+        self.assertEqual(compile_batch_size(3, 1), 1)
+        self.assertEqual(compile_batch_size(200, 4), 16)
+        self.assertEqual(compile_batch_size(40, 8), 5)
+        batches = compile_batches(files, 4)
+        self.assertEqual([len(batch) for batch in batches], [4, 4, 2, 1])
+        self.assertEqual(batches[-1], [os.path.join("Q2", "C", "t.c")])
+
+    def test_cl_diagnostics_are_split_back_to_each_source(self):
+        output = (
+            "a.c\n"
+            "b.c\n"
+            "a.c(3): error C2143: syntax error: missing ';' before '}'\n"
+            "b.c(7): warning C4996: 'scanf': This function or variable may be unsafe.\n"
+            "b.c(9): error C2065: 'x': undeclared identifier\n"
+        )
+
+        per_source, shared = split_diagnostics(output, ["a.c", "b.c", "c.c"])
+
+        self.assertEqual(per_source["a.c"], ["a.c(3): error C2143: syntax error: missing ';' before '}'"])
+        self.assertEqual(len(per_source["b.c"]), 2)
+        self.assertEqual(per_source["c.c"], [])
+        self.assertEqual(shared, [])
+
+
+class BatchingGcc(GccToolchain):
+    """gcc driven like cl: one compile-only run per batch, then one link per source."""
+
+    batches_compiles = True
+
+    def batch_compile_command(self, source_names, object_dir):
+        sources = " ".join(f'"{name}"' for name in source_names)
+        objects = " ".join(f'"{os.path.splitext(os.path.basename(name))[0]}.o"' for name in source_names)
+        # gcc writes objects to the working directory; move them where cl's /Fo puts them.
+        return f'{self.compiler} -x c -O2 -c {sources}; mv -f {objects} "{object_dir}" 2>/dev/null'
+
+    def link_command(self, object_file, executable):
+        return f'{self.compiler} -o "{executable}" "{object_file}" -lm'
+
+
+@unittest.skipUnless(os.name == "posix" and shutil.which("gcc"), "needs gcc on a POSIX system")
+class TestGccToolchain(unittest.TestCase):
+    def setUp(self):
+        patcher = patch.object(process, "_ACTIVE_TOOLCHAIN", GccToolchain("gcc"))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        cache_patcher = patch.object(process, "_ACTIVE_COMPILE_CACHE", None)
+        cache_patcher.start()
+        self.addCleanup(cache_patcher.stop)
+
+    def _compile(self, directory, source):
+        path = os.path.join(directory, "student.c")
+        with open(path, "w", encoding="utf-8") as source_file:
+            source_file.write(source)
+        return compile_file(path)
+
+    def test_compiles_and_runs_a_submission(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            executable, error = self._compile(
+                temp_dir,
+                "#include <stdio.h>\n#include <math.h>\n"
+                "int main(void) { int n; scanf(\"%d\", &n); printf(\"%d %.0f\\n\", n * 2, sqrt(n)); return 0; }\n",
+            )
+
+            self.assertIsNone(error)
+            self.assertEqual(executable, os.path.join(temp_dir, "student.exe"))
+            self.assertEqual(execute_program(executable, "16").output, "32 4")
+
+    def test_compile_errors_are_reported(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            executable, error = self._compile(temp_dir, "int main(void) { return 0 }\n")
+
+        self.assertIsNone(executable)
+        self.assertIn("error", error)
+
+    def _write_sources(self, directory, sources):
+        paths = []
+        for name, source in sources.items():
+            paths.append(os.path.join(directory, name))
+            os.makedirs(os.path.dirname(paths[-1]), exist_ok=True)
+            with open(paths[-1], "w", encoding="utf-8") as source_file:
+                source_file.write(source)
+        return paths
+
+    def test_gcc_compiles_each_source_in_its_own_run(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            paths = self._write_sources(temp_dir, {
+                f"s{index}.c": f"#include <stdio.h>\nint main(void) {{ puts(\"{index}\"); return 0; }}\n"
+                for index in range(3)
+            })
+
+            with patch("c_tester.process.subprocess.run", wraps=process.subprocess.run) as run:
+                results = compile_files(paths)
+
+            self.assertEqual([call for call in run.call_args_list if " -c " in call.args[0]], [])
+            self.assertEqual(execute_program(results[paths[2]][0], "").output, "2")
+
+    def test_batched_compile_reports_errors_per_student(self):
+        sources = {
+            "ok1.c": "#include <stdio.h>\nint main(void) { puts(\"one\"); return 0; }\n",
+            "ok2.c": "#include <stdio.h>\nint main(void) { puts(\"two\"); return 0; }\n",
+            "syntax.c": "int main(void) { return 0 }\n",
+            "nomain.c": "int helper(void) { return 1; }\n",
+        }
+        with tempfile.TemporaryDirectory() as temp_dir:
+            paths = self._write_sources(temp_dir, sources)
+
+            with patch.object(process, "_ACTIVE_TOOLCHAIN", BatchingGcc("gcc")), \
+                 patch("c_tester.process.subprocess.run", wraps=process.subprocess.run) as run:
+                results = compile_files(paths)
+            compiler_invocations = [call for call in run.call_args_list if " -c " in call.args[0]]
+
+            self.assertEqual(len(compiler_invocations), 1)
+            self.assertEqual(execute_program(results[paths[0]][0], "").output, "one")
+            self.assertEqual(execute_program(results[paths[1]][0], "").output, "two")
+            self.assertIsNone(results[paths[2]][0])
+            self.assertIn("syntax.c:1", results[paths[2]][1])
+            self.assertNotIn("syntax.c", results[paths[3]][1] or "")
+            self.assertIsNone(results[paths[3]][0])
+            self.assertIn("main", results[paths[3]][1])
+            self.assertEqual([name for name in os.listdir(temp_dir) if name.endswith(".o")], [])
+
+    def test_batched_diagnostics_match_single_file_compiles(self):
+        sources = {
+            os.path.join("Q1", "C", "444.c"): "int main(void) {\n    int x = 1\n    return x;\n}\n",
+            os.path.join("Q1", "C", "445.c"): "int main(void) { return y; }\n",
+            os.path.join("Q1", "C", "446.c"): "int main(void) { return 0; }\n",
+        }
+        original_cwd = os.getcwd()
+        with tempfile.TemporaryDirectory() as temp_dir:
+            try:
+                os.chdir(temp_dir)
+                paths = self._write_sources("", sources)
+                single = {path: compile_file(path) for path in paths}
+                with patch.object(process, "_ACTIVE_TOOLCHAIN", BatchingGcc("gcc")):
+                    batched = compile_files(paths)
+            finally:
+                os.chdir(original_cwd)
+
+        for path in paths[:2]:
+            self.assertIn(f"{path}:", single[path][1])
+            self.assertEqual(batched[path][1], single[path][1])
+        self.assertIsNone(batched[paths[2]][1])
+
+    def test_run_build_directory_keeps_sources_clean_and_is_removed(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            paths = []
+            for question in ("Q1", "Q2"):
+                for index in range(2):
+                    os.makedirs(os.path.join(temp_dir, question, "C"), exist_ok=True)
+                    paths.append(os.path.join(temp_dir, question, "C", f"s{index}.c"))
+                    with open(paths[-1], "w", encoding="utf-8") as source_file:
+                        source_file.write(f"#include <stdio.h>\nint main(void) {{ puts(\"{question}\"); return 0; }}\n")
+
+            with run_build_directory(ExecutionOptions(build_root=os.path.join(temp_dir, "scratch"))) as build_dir:
+                single = compile_file(paths[0])
+                batched = compile_files(paths[2:])
+                executables = [single[0]] + [batched[path][0] for path in paths[2:]]
+
+                self.assertTrue(all(executable.startswith(build_dir) for executable in executables))
+                self.assertNotEqual(os.path.dirname(single[0]), os.path.dirname(executables[1]))
+                self.assertEqual(execute_program(single[0], "").output, "Q1")
+                self.assertEqual(execute_program(executables[1], "").output, "Q2")
+
+            self.assertFalse(os.path.exists(build_dir))
+            self.assertIsNone(process._ACTIVE_BUILD_DIR)
+            for question in ("Q1", "Q2"):
+                self.assertEqual(sorted(os.listdir(os.path.join(temp_dir, question, "C"))), ["s0.c", "s1.c"])
+
+    def test_syntax_precheck_flags_only_broken_sources(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            paths = []
+            for name, source in {
+                "ok.c": "int main(void) { return 0; }\n",
+                "warn.c": "int main(void) { int unused; return 0; }\n",
+                "broken.c": "int main(void) { return 0 }\n",
+            }.items():
+                paths.append(os.path.join(temp_dir, name))
+                with open(paths[-1], "w", encoding="utf-8") as source_file:
+                    source_file.write(source)
+
+            results = syntax_check_files(paths)
+
+        self.assertIsNone(results[paths[0]])
+        self.assertIsNone(results[paths[1]])
+        self.assertIn("broken.c:1", results[paths[2]])
+
+    def test_timeout_stops_forked_children_too(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            pid_file = os.path.join(temp_dir, "child.pid")
+            executable, error = self._compile(
+                temp_dir,
+                "#include <stdio.h>\n#include <unistd.h>\n"
+                "int main(void) {\n"
+                "  pid_t child = fork();\n"
+                f"  if (child > 0) {{ FILE *f = fopen(\"{pid_file}\", \"w\"); fprintf(f, \"%d\", child); fclose(f); }}\n"
+                "  for (;;) sleep(1);\n"
+                "}\n",
+            )
+            self.assertIsNone(error)
+
+            result = execute_program(executable, "", timeout=0.5)
+            with open(pid_file, encoding="utf-8") as pid_handle:
+                child_pid = int(pid_handle.read())
+
+        self.assertEqual(result.output, "Timeout")
+        deadline = time.monotonic() + 2
+        while time.monotonic() < deadline and _process_alive(child_pid):
+            time.sleep(0.05)
+        self.assertFalse(_process_alive(child_pid))
+
+
+def _process_alive(pid):
+    try:
+        with open(f"/proc/{pid}/stat", encoding="utf-8") as stat_file:
+            # Zombies are dead; they are only waiting for init to reap them.
+            return stat_file.read().split()[2] != "Z"
+    except FileNotFoundError:
+        return False
+    except OSError:
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        return True
+
+
+if __name__ == "__main__":
+    unittest.main()